@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import ClassVar
+
+from datashare_python.objects import ArtifactType, DocArtifact, ManifestEntry, TaskArgs
+from datashare_python.utils import (
+    async_write_artifact,
+    write_artifact,
+    write_artifacts,
+)
+
+
+class _BenchArgs(TaskArgs):
+    value: str = "bench"
+
+
+class _BenchManifestEntry(ManifestEntry): ...
+
+
+class _BenchArtifact(DocArtifact):
+    filename: ClassVar[str] = "bench"
+    type: ClassVar[ArtifactType] = ArtifactType.STRUCTURE
+
+
+def _make_artifacts(n_artifacts: int, n_docs: int) -> list[_BenchArtifact]:
+    entry = _BenchManifestEntry.complete(_BenchArgs())
+    return [
+        _BenchArtifact(
+            project="bench",
+            doc_id=f"doc-{i % n_docs:06d}",
+            artifact=b"x" * 1024,
+            manifest_entry=entry,
+        )
+        for i in range(n_artifacts)
+    ]
+
+
+def _bench_threads(root: Path, artifacts: list[_BenchArtifact], writers: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(lambda a: write_artifact(root, a), artifacts))
+    return time.perf_counter() - start
+
+
+async def _bench_async(
+    root: Path, artifacts: list[_BenchArtifact], writers: int
+) -> float:
+    sem = asyncio.Semaphore(writers)
+
+    async def _write(artifact: _BenchArtifact) -> None:
+        async with sem:
+            await async_write_artifact(root, artifact)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_write(a) for a in artifacts))
+    return time.perf_counter() - start
+
+
+def _bench_bulk(root: Path, artifacts: list[_BenchArtifact], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(artifacts), batch_size):
+        write_artifacts(root, artifacts[i : i + batch_size])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="artifact write throughput")
+    parser.add_argument("--artifacts", type=int, default=2000)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    artifacts = _make_artifacts(args.artifacts, args.docs)
+    for writers in args.writers:
+        with tempfile.TemporaryDirectory() as root:
+            elapsed = _bench_threads(Path(root), artifacts, writers)
+        print(f"threads writers={writers}: {len(artifacts) / elapsed:.0f} artifacts/s")  # noqa: T201
+        with tempfile.TemporaryDirectory() as root:
+            elapsed = asyncio.run(_bench_async(Path(root), artifacts, writers))
+        print(f"async   writers={writers}: {len(artifacts) / elapsed:.0f} artifacts/s")  # noqa: T201
+    with tempfile.TemporaryDirectory() as root:
+        elapsed = _bench_bulk(Path(root), artifacts, args.batch_size)
+    rate = len(artifacts) / elapsed
+    print(f"bulk    batch_size={args.batch_size}: {rate:.0f} artifacts/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
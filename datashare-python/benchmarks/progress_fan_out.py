@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import time
+import uuid
+import warnings
+from datetime import timedelta
+from typing import Any
+
+from datashare_python.interceptors import (
+    ProgressBatcher,
+    ProgressInterceptor,
+    ProgressReporter,
+    TemporalProgressHandler,
+)
+from datashare_python.types_ import AsyncProgressRateHandler
+from datashare_python.utils import (
+    PYDANTIC_DATA_CONVERTER,
+    ActivityWithProgress,
+    ProgressSignal,
+    WorkflowWithProgress,
+    activity_defn,
+)
+from temporalio import workflow
+from temporalio.api.enums.v1 import EventType
+from temporalio.client import WorkflowHandle
+from temporalio.common import SearchAttributeKey
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import UnsandboxedWorkflowRunner, Worker
+
+_TASK_QUEUE = "bench.progress"
+_TIMEOUT = timedelta(minutes=10)
+_SEARCH_ATTRIBUTES = [
+    SearchAttributeKey.for_float("Progress"),
+    SearchAttributeKey.for_float("MaxProgress"),
+]
+
+
+class _FanOutAct(ActivityWithProgress):
+    @activity_defn(name="fan-out-step")
+    async def step(
+        self,
+        n_steps: int,
+        step_s: float,
+        *,
+        progress: AsyncProgressRateHandler | None = None,
+    ) -> None:
+        for i in range(n_steps):
+            await asyncio.sleep(step_s)
+            if progress is not None:
+                await progress((i + 1) / n_steps)
+
+
+@workflow.defn(name="fan-out")
+class _FanOutWorkflow(WorkflowWithProgress):
+    @workflow.run
+    async def run(self, n_activities: int, n_steps: int, step_s: float) -> None:
+        await asyncio.gather(
+            *(
+                workflow.execute_activity(
+                    _FanOutAct.step,
+                    args=[n_steps, step_s],
+                    task_queue=_TASK_QUEUE,
+                    start_to_close_timeout=_TIMEOUT,
+                )
+                for _ in range(n_activities)
+            )
+        )
+
+
+class _UnbatchedProgress(ProgressBatcher):
+    # Signals each report on its own, throttled per activity, as done before
+    # progress was batched
+    def __init__(self, min_progress_interval_s: float):
+        super().__init__(min_progress_interval_s)
+        self._min_progress_interval_s = min_progress_interval_s
+        self._handlers: dict[str, TemporalProgressHandler] = dict()
+        self._sent: list[asyncio.Future] = []
+
+    def report(
+        self, handle: WorkflowHandle, signal: ProgressSignal, *, force: bool = False
+    ) -> None:
+        handler = self._handlers.get(signal.activity_id)
+        if handler is None:
+            with warnings.catch_warnings(category=DeprecationWarning, action="ignore"):
+                handler = TemporalProgressHandler(
+                    handle,
+                    signal.activity_id,
+                    run_id=signal.run_id,
+                    min_progress_interval_s=self._min_progress_interval_s,
+                    weight=signal.weight,
+                )
+            self._handlers[signal.activity_id] = handler
+        sent = handler.progress(signal.progress, force=force)
+        self._sent.append(asyncio.ensure_future(sent))
+
+    async def flushed(self) -> None:
+        sent, self._sent = self._sent, []
+        await asyncio.gather(*sent)
+
+
+async def _bench(
+    env: WorkflowEnvironment, args: argparse.Namespace, *, batched: bool
+) -> None:
+    interceptor = ProgressInterceptor(min_progress_interval_s=args.progress_interval_s)
+    if not batched:
+        interceptor._batcher = _UnbatchedProgress(args.progress_interval_s)  # noqa: SLF001
+    act = _FanOutAct(env.client)
+    worker = Worker(
+        env.client,
+        task_queue=_TASK_QUEUE,
+        workflows=[_FanOutWorkflow],
+        activities=[act.step],
+        interceptors=[interceptor],
+        max_concurrent_activities=args.concurrency,
+        workflow_runner=UnsandboxedWorkflowRunner(),
+    )
+    wf_id = f"bench-fan-out-{uuid.uuid4()}"
+    async with worker:
+        start = time.perf_counter()
+        handle = await env.client.start_workflow(
+            _FanOutWorkflow.run,
+            args=[args.activities, args.steps, args.step_s],
+            id=wf_id,
+            task_queue=_TASK_QUEUE,
+        )
+        await handle.result()
+        elapsed = time.perf_counter() - start
+    history = await handle.fetch_history()
+    n_signals = sum(
+        e.event_type == EventType.EVENT_TYPE_WORKFLOW_EXECUTION_SIGNALED
+        for e in history.events
+    )
+    size_kb = sum(e.ByteSize() for e in history.events) / 1024
+    mode = "batched" if batched else "per activity"
+    print(  # noqa: T201
+        f"{mode}: {n_signals} signals, {len(history.events)} events, "
+        f"{size_kb:.0f}KB history, {elapsed:.1f}s"
+    )
+
+
+class _SimulatedHandle:
+    # Records the signals sent to the workflow, without a Temporal server
+    def __init__(self, latency_s: float) -> None:
+        self.id = "bench-fan-out"
+        self.run_id = "run-id"
+        self._latency_s = latency_s
+        self.n_signals = 0
+        self.n_bytes = 0
+
+    async def signal(self, signal: str, arg: Any) -> None:  # noqa: ARG002
+        await asyncio.sleep(self._latency_s)
+        payload = PYDANTIC_DATA_CONVERTER.payload_converter.to_payloads([arg])[0]
+        self.n_signals += 1
+        self.n_bytes += payload.ByteSize()
+
+
+async def _bench_offline(args: argparse.Namespace, *, batched: bool) -> None:
+    handle = _SimulatedHandle(args.signal_latency_s)
+    batcher = ProgressBatcher(args.progress_interval_s)
+    if not batched:
+        batcher = _UnbatchedProgress(args.progress_interval_s)
+    slots = asyncio.Semaphore(args.concurrency)
+
+    # Reports progress the way the ProgressInterceptor does
+    async def act(activity_id: str) -> None:
+        reporter = ProgressReporter(batcher, handle, activity_id, run_id="run-id")
+        async with slots, batcher:
+            reporter.report(0.0, force=True)
+            for i in range(args.steps):
+                await asyncio.sleep(args.step_s)
+                await reporter.progress((i + 1) / args.steps)
+            reporter.report(1.0, force=True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(act(str(i)) for i in range(args.activities)))
+    elapsed = time.perf_counter() - start
+    mode = "batched" if batched else "per activity"
+    print(  # noqa: T201
+        f"{mode}: {handle.n_signals} signals, "
+        f"{handle.n_bytes / 1024:.0f}KB signal payloads, {elapsed:.1f}s"
+    )
+
+
+async def _run(args: argparse.Namespace) -> None:
+    if args.offline:
+        await _bench_offline(args, batched=False)
+        await _bench_offline(args, batched=True)
+        return
+    env = await WorkflowEnvironment.start_local(
+        data_converter=PYDANTIC_DATA_CONVERTER, search_attributes=_SEARCH_ATTRIBUTES
+    )
+    async with env:
+        await _bench(env, args, batched=False)
+        await _bench(env, args, batched=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="progress signals and workflow history size on an activity fan-out"
+    )
+    parser.add_argument("--activities", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--step-s", type=float, default=0.05)
+    parser.add_argument("--progress-interval-s", type=float, default=0.1)
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="simulate the workflow handle instead of starting a Temporal server",
+    )
+    parser.add_argument("--signal-latency-s", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+from datashare_python.interceptors import (
+    ActivityMetadata,
+    _convert_args,
+    _parse_progress_weight,
+    _without_progress,
+    activities_metadata,
+    supports_progress,
+)
+from datashare_python.objects import DatashareModel
+from datashare_python.types_ import AsyncProgressRateHandler
+from datashare_python.utils import PYDANTIC_DATA_CONVERTER, activity_defn
+from temporalio.activity import _Definition
+
+
+class _BenchInferenceConfig(DatashareModel):
+    model_path: Path = Path("model.onnx")
+    batch_size: int = 16
+    confidence_threshold: float = 0.5
+    country_codes: list[str] = ["FRA", "GBR", "USA"]
+
+
+class _BenchArgs(DatashareModel):
+    project: str = "bench"
+    inference: _BenchInferenceConfig = _BenchInferenceConfig()
+    paths: list[Path] = []
+
+
+@activity_defn(name="bench-act")
+async def _bench_act(
+    args: _BenchArgs,
+    batch: Path,
+    *,
+    progress: AsyncProgressRateHandler | None = None,  # noqa: ARG001
+) -> None: ...
+
+
+async def _round_trip(act_args: list[Any]) -> list[Any]:
+    # The conversion done before the fast path was introduced
+    act_definition = _Definition.must_from_callable(_bench_act)
+    arg_types = _without_progress(act_definition.arg_types)[: len(act_args)]
+    encoded = await PYDANTIC_DATA_CONVERTER.encode(act_args)
+    return await PYDANTIC_DATA_CONVERTER.decode(encoded, type_hints=arg_types)
+
+
+_BENCH_ACT_METADATA = ActivityMetadata.from_activity(_bench_act)
+
+
+def _fast_path(act_args: list[Any]) -> list[Any]:
+    return _convert_args(act_args, _BENCH_ACT_METADATA.arg_types)
+
+
+def _introspect() -> None:
+    # The reflection done on each dispatch before the registry was introduced
+    if supports_progress(_bench_act):
+        _parse_progress_weight(_bench_act)
+        _Definition.must_from_callable(_bench_act)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    bench_args = _BenchArgs(paths=[Path(f"doc_{i}.pdf") for i in range(args.paths)])
+    # Temporal hands progress activities their args as plain JSON values
+    act_args = [bench_args.model_dump(mode="json"), "batch.json"]
+    assert await _round_trip(act_args) == _fast_path(act_args)  # noqa: S101
+    start = time.perf_counter()
+    for _ in range(args.n):
+        await _round_trip(act_args)
+    round_trip_us = (time.perf_counter() - start) / args.n * 1e6
+    start = time.perf_counter()
+    for _ in range(args.n):
+        _fast_path(act_args)
+    fast_path_us = (time.perf_counter() - start) / args.n * 1e6
+    print(f"round trip: {round_trip_us:.1f}us/dispatch")  # noqa: T201
+    print(f"fast path: {fast_path_us:.1f}us/dispatch")  # noqa: T201
+    start = time.perf_counter()
+    for _ in range(args.n):
+        _introspect()
+    introspection_us = (time.perf_counter() - start) / args.n * 1e6
+    registry = activities_metadata([_bench_act])
+    start = time.perf_counter()
+    for _ in range(args.n):
+        registry.get("bench-act")
+    registry_us = (time.perf_counter() - start) / args.n * 1e6
+    print(f"introspection: {introspection_us:.1f}us/dispatch")  # noqa: T201
+    print(f"registry: {registry_us:.2f}us/dispatch")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="progress interceptor overhead per activity dispatch"
+    )
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--paths", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
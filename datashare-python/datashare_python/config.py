@@ -9,6 +9,7 @@ from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
 
 import datashare_python
 
+from .indexing import BulkIndexer, RefreshPolicy
 from .objects import BaseModel, WorkerPaths
 from .task_client import DatashareTaskClient
 from .types_ import TemporalClient
@@ -23,6 +24,23 @@ DS_WORKER_SETTINGS_CONFIG = SettingsConfigDict(
 )
 
 
+class BulkIndexingConfig(BaseModel):
+    refresh: RefreshPolicy = RefreshPolicy.END
+    max_bulk_bytes: int = 10 * 1024**2
+    max_bulk_actions: int = 1000
+    # Defaults to the ES client max concurrency
+    max_in_flight: int | None = None
+
+    def to_bulk_indexer(self, es_client: ESClient) -> BulkIndexer:
+        return BulkIndexer(
+            es_client,
+            refresh=self.refresh,
+            max_bulk_bytes=self.max_bulk_bytes,
+            max_bulk_actions=self.max_bulk_actions,
+            max_in_flight=self.max_in_flight or es_client.max_concurrency,
+        )
+
+
 class ESClientConfig(BaseModel):
     address: str = "http://localhost:9200"
     default_page_size: int = 1000
@@ -31,6 +49,10 @@ class ESClientConfig(BaseModel):
     max_retries: int = 0
     max_retry_wait_s: int | float = 60
     timeout_s: int | float = 60 * 5
+    # Number of concurrent slices used by the searches which don't need a global
+    # sort order, 1 disables slicing
+    search_slices: int = 1
+    bulk: BulkIndexingConfig = BulkIndexingConfig()
 
     def to_es_client(self, api_key: str | None = None) -> ESClient:
         client = ESClient(
@@ -96,13 +118,17 @@ class LoggingConfig(BaseModel):
 class ResourceCacheConfig(BaseModel):
     size: int = 1
     exit_context_managers: bool = True
+    # How long to wait for a resource being loaded concurrently, None waits forever
+    load_timeout_s: float | None = None
 
     def to_resource_cache(self) -> SharedResources:
         eviction_callback = None
         if self.exit_context_managers:
             eviction_callback = close_cm_callback
         return SharedResources(
-            cache_size=self.size, eviction_callback=eviction_callback
+            cache_size=self.size,
+            eviction_callback=eviction_callback,
+            load_timeout_s=self.load_timeout_s,
         )
 
 
@@ -129,6 +155,9 @@ class WorkerConfig(ICIJSettings, BaseModel):
     def to_es_client(self) -> ESClient:
         return self.elasticsearch.to_es_client(self.datashare.api_key)
 
+    def to_bulk_indexer(self, es_client: ESClient) -> BulkIndexer:
+        return self.elasticsearch.bulk.to_bulk_indexer(es_client)
+
     def to_task_client(self) -> DatashareTaskClient:
         return self.datashare.to_task_client()
 
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncGenerator, AsyncIterable, Iterable
+from enum import StrEnum
+from typing import Any, Self
+
+from elasticsearch._async.helpers import async_bulk
+from elasticsearch.helpers import expand_action
+from icij_common.es import ESClient
+
+logger = logging.getLogger(__name__)
+
+BulkAction = dict[str, Any]
+BulkError = dict[str, Any]
+
+_INDEX = "_index"
+
+
+class RefreshPolicy(StrEnum):
+    # Wait for a refresh after each bulk, docs are searchable as soon as written
+    WAIT_FOR = "wait_for"
+    # Don't refresh during bulks, written indices are refreshed once on exit
+    END = "end"
+    # Never refresh, rely on the indices refresh interval
+    NONE = "none"
+
+
+class BulkIndexer:
+    def __init__(
+        self,
+        es_client: ESClient,
+        *,
+        refresh: RefreshPolicy = RefreshPolicy.END,
+        max_bulk_bytes: int = 10 * 1024**2,
+        max_bulk_actions: int = 1000,
+        max_in_flight: int = 2,
+    ) -> None:
+        self._es_client = es_client
+        self._refresh = refresh
+        self._max_bulk_bytes = max_bulk_bytes
+        self._max_bulk_actions = max_bulk_actions
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._written_indices: set[str] = set()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
+        if exc_type is None:
+            await self.refresh()
+
+    async def bulk(
+        self,
+        actions: Iterable[BulkAction] | AsyncIterable[BulkAction],
+        *,
+        raise_on_error: bool = True,
+    ) -> tuple[int, list[BulkError]]:
+        # Bulks are sent concurrently, the order in which actions are applied is
+        # hence only guaranteed when max_in_flight == 1
+        requests = []
+        try:
+            async for chunk in self._chunks(actions):
+                await self._in_flight.acquire()
+                failed = next((r for r in requests if _has_failed(r)), None)
+                if failed is not None:
+                    self._in_flight.release()
+                    raise failed.exception()
+                request = self._send(chunk, raise_on_error=raise_on_error)
+                request = asyncio.create_task(request)
+                # Release from a callback rather than from _send, the permit is then
+                # also released when the request is cancelled before it started
+                request.add_done_callback(lambda _: self._in_flight.release())
+                requests.append(request)
+            results = await asyncio.gather(*requests)
+        finally:
+            for r in requests:
+                r.cancel()
+            await asyncio.gather(*requests, return_exceptions=True)
+        n_success = sum(n for n, _ in results)
+        errors = [e for _, chunk_errors in results for e in chunk_errors]
+        return n_success, errors
+
+    async def refresh(self) -> None:
+        if self._refresh is not RefreshPolicy.END or not self._written_indices:
+            return
+        indices = ",".join(sorted(self._written_indices))
+        logger.debug("refreshing %s...", indices)
+        await self._es_client.indices.refresh(index=indices)
+        self._written_indices.clear()
+
+    async def _send(
+        self, chunk: list[BulkAction], *, raise_on_error: bool
+    ) -> tuple[int, list[BulkError]]:
+        refresh = "wait_for" if self._refresh is RefreshPolicy.WAIT_FOR else False
+        return await async_bulk(
+            self._es_client,
+            chunk,
+            chunk_size=len(chunk),
+            max_chunk_bytes=self._max_bulk_bytes,
+            raise_on_error=raise_on_error,
+            refresh=refresh,
+        )
+
+    async def _chunks(
+        self, actions: Iterable[BulkAction] | AsyncIterable[BulkAction]
+    ) -> AsyncGenerator[list[BulkAction], None]:
+        if not isinstance(actions, AsyncIterable):
+            actions = _as_async_iterable(actions)
+        chunk = []
+        chunk_bytes = 0
+        async for action in actions:
+            if index := action.get(_INDEX):
+                self._written_indices.add(index)
+            action_bytes = _action_size(action)
+            if chunk and (
+                len(chunk) >= self._max_bulk_actions
+                or chunk_bytes + action_bytes > self._max_bulk_bytes
+            ):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(action)
+            chunk_bytes += action_bytes
+        if chunk:
+            yield chunk
+
+
+def _action_size(action: BulkAction) -> int:
+    # Estimates the size of the action in the bulk request body
+    size = 0
+    for line in expand_action(action):
+        if line is not None:
+            size += len(json.dumps(line, separators=(",", ":"), default=str)) + 1
+    return size
+
+
+async def _as_async_iterable[T](iterable: Iterable[T]) -> AsyncGenerator[T, None]:
+    for item in iterable:
+        yield item
+
+
+def _has_failed(request: asyncio.Task) -> bool:
+    # Calling exception() on a cancelled task raises CancelledError
+    return (
+        request.done() and not request.cancelled() and request.exception() is not None
+    )
@@ -1,12 +1,15 @@
 import asyncio
 import dataclasses
 import datetime
+import logging
 import secrets
-from collections.abc import Callable, Generator, Mapping
-from contextlib import contextmanager
+import threading
+import warnings
+from collections.abc import Callable, Generator, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from copy import deepcopy
-from functools import wraps
+from functools import cache
 from inspect import signature
 from types import UnionType
 from typing import (
@@ -20,12 +23,14 @@ from typing import (
     get_type_hints,
 )
 
+from lru import LRU
 from nexusrpc import InputT, OutputT
-from pydantic import Field
+from pydantic import Field, TypeAdapter, ValidationError
 from temporalio import activity
 from temporalio.activity import _Definition
 from temporalio.api.common.v1 import Payload
 from temporalio.client import WorkflowHandle
+from temporalio.common import RawValue
 from temporalio.converter import DataConverter
 from temporalio.worker import (
     ActivityInboundInterceptor,
@@ -64,10 +69,20 @@ from .utils import (
     PYDANTIC_DATA_CONVERTER,
     ActivityWithProgress,
     ProgressSignal,
+    ProgressSignalBatch,
+    fatal_error_from_exception,
 )
 
+logger = logging.getLogger(__name__)
+
 _TRACEPARENT = "traceparent"
+_UPDATE_PROGRESS = "update_progress"
+_UPDATE_PROGRESS_BATCH = "update_progress_batch"
 _DEFAULT_PAYLOAD_CONVERTER = DataConverter.default.payload_converter
+_PAYLOAD_CONVERTER = PYDANTIC_DATA_CONVERTER.payload_converter
+_MAX_CACHED_WORKFLOW_HANDLES = 128
+_MAX_SIGNAL_ATTEMPTS = 3
+_SIGNAL_RETRY_BACKOFF_S = 0.1
 _PROGRESS_TYPES = {
     ProgressRateHandler,
     AsyncProgressRateHandler,
@@ -234,15 +249,60 @@ def _with_trace_context_header[InputWithHeaders](
     return new_obj
 
 
+@dataclasses.dataclass(frozen=True)
+class ActivityMetadata:
+    is_async: bool
+    supports_progress: bool
+    progress_weight: float = 1.0
+    # Arg types without the progress handler
+    arg_types: list[type] | None = None
+
+    @classmethod
+    def from_activity(cls, act_fn: Callable) -> Self:
+        act_definition = _Definition.must_from_callable(act_fn)
+        if not supports_progress(act_fn):
+            return cls(is_async=act_definition.is_async, supports_progress=False)
+        return cls(
+            is_async=act_definition.is_async,
+            supports_progress=True,
+            progress_weight=_parse_progress_weight(act_fn),
+            arg_types=_without_progress(act_definition.arg_types),
+        )
+
+
+def activities_metadata(activities: list[Callable]) -> dict[str, ActivityMetadata]:
+    return {
+        _Definition.must_from_callable(act).name: ActivityMetadata.from_activity(act)
+        for act in activities
+    }
+
+
 class ProgressInterceptor(Interceptor):
-    def __init__(self, min_progress_interval_s: float = 30.0):
-        self._min_progress_interval_s: float = min_progress_interval_s
+    def __init__(
+        self,
+        min_progress_interval_s: float = 30.0,
+        *,
+        activities: dict[str, ActivityMetadata] | None = None,
+        linger_s: float = 0.1,
+    ):
+        if activities is None:
+            activities = dict()
+        self._activities = activities
+        # Inbound interceptors are created for each activity execution, state shared
+        # by activities of the worker lives here
+        self._batcher = ProgressBatcher(min_progress_interval_s, linger_s=linger_s)
+        self._workflow_handles = LRU(_MAX_CACHED_WORKFLOW_HANDLES)
 
     def intercept_activity(
         self,
         next: ActivityInboundInterceptor,  # noqa: A002
     ) -> ActivityInboundInterceptor:
-        return _ProgressInboundInterceptor(next, self._min_progress_interval_s)
+        return _ProgressInboundInterceptor(
+            next,
+            activities=self._activities,
+            batcher=self._batcher,
+            workflow_handles=self._workflow_handles,
+        )
 
 
 def _parse_progress_weight(act_fn: Callable) -> float:
@@ -259,6 +319,8 @@ def _parse_progress_weight(act_fn: Callable) -> float:
 
 
 class TemporalProgressHandler:
+    # TODO: deprecated, remove me at the next breaking. Progress is now reported by
+    #  a ProgressReporter and batched by the ProgressBatcher
     def __init__(
         self,
         handle: WorkflowHandle,
@@ -268,6 +330,11 @@ class TemporalProgressHandler:
         min_progress_interval_s: float = 30.0,
         weight: float = 1.0,
     ) -> None:
+        msg = (
+            f"{TemporalProgressHandler.__name__} is deprecated, use"
+            f" {ProgressReporter.__name__} instead"
+        )
+        warnings.warn(msg, DeprecationWarning, stacklevel=2)
         self._handle = handle
         self._activity_id = activity_id
         self._run_id = run_id
@@ -292,7 +359,173 @@ class TemporalProgressHandler:
             progress=progress,
             weight=self._weight,
         )
-        await self._handle.signal("update_progress", signal)
+        await self._handle.signal(_UPDATE_PROGRESS, signal)
+
+
+class ProgressBatcher:
+    # Collects the progress of all activities running on the worker and signals it
+    # to each workflow as a single batch. Only the latest progress of each activity
+    # is sent besides forced updates, which are always delivered in order. Updates
+    # are flushed every flush_interval_s, forced updates trigger a flush after
+    # linger_s, to let concurrent activities add theirs to the batch.
+    # Reporting is thread safe and never blocks on the signal round trip
+    def __init__(self, flush_interval_s: float = 30.0, *, linger_s: float = 0.1):
+        self._flush_interval_s = flush_interval_s
+        self._linger_s = linger_s
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], _PendingProgress] = dict()
+        self._generation = 0
+        self._flushed_generation = -1
+        self._flushed = asyncio.Condition()
+        self._urgent = asyncio.Event()
+        self._n_active = 0
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> Self:
+        # The flusher only runs while activities are using the batcher
+        self._n_active += 1
+        if self._flusher is None:
+            self._event_loop = asyncio.get_running_loop()
+            self._flusher = asyncio.create_task(self._flush_every())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
+        try:
+            await self.flushed()
+        finally:
+            self._n_active -= 1
+            if not self._n_active and self._flusher is not None:
+                flusher, self._flusher = self._flusher, None
+                flusher.cancel()
+                await asyncio.wait([flusher])
+
+    def report(
+        self, handle: WorkflowHandle, signal: ProgressSignal, *, force: bool = False
+    ) -> None:
+        key = (handle.id, handle.run_id)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _PendingProgress(handle)
+                self._pending[key] = pending
+            pending.add(signal, force=force)
+        if force:
+            self._wake()
+
+    async def flushed(self) -> None:
+        # Waits for all progress reported so far to be flushed
+        with self._lock:
+            generation = self._generation
+        self._wake()
+        async with self._flushed:
+            await self._flushed.wait_for(lambda: self._flushed_generation >= generation)
+
+    def _wake(self) -> None:
+        if self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._urgent.set)
+
+    async def _flush_every(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._urgent.wait(), self._flush_interval_s)
+            if self._urgent.is_set() and self._n_active > 1:
+                await asyncio.sleep(self._linger_s)
+            self._urgent.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, dict()
+            generation = self._generation
+            self._generation += 1
+        await asyncio.gather(*(p.send() for p in pending.values()))
+        async with self._flushed:
+            self._flushed_generation = generation
+            self._flushed.notify_all()
+
+
+class _PendingProgress:
+    def __init__(self, handle: WorkflowHandle) -> None:
+        self.handle = handle
+        self.signals: list[ProgressSignal] = []
+        # Position of the last unforced signal of each activity in the batch
+        self._supersedable: dict[str, int] = dict()
+
+    def add(self, signal: ProgressSignal, *, force: bool) -> None:
+        # Since signals are applied in order, the latest one of each activity
+        # supersedes the previous unforced one. Forced signals are never superseded
+        i = self._supersedable.pop(signal.activity_id, None)
+        if i is None:
+            i = len(self.signals)
+            self.signals.append(signal)
+        else:
+            self.signals[i] = signal
+        if not force:
+            self._supersedable[signal.activity_id] = i
+
+    async def send(self) -> None:
+        # Newer signals are queued in the next batch while this one is retried, they
+        # are hence never overwritten by the retried ones
+        batch = ProgressSignalBatch(signals=self.signals)
+        backoff_s = _SIGNAL_RETRY_BACKOFF_S
+        for attempt in range(1, _MAX_SIGNAL_ATTEMPTS + 1):
+            try:
+                await self.handle.signal(_UPDATE_PROGRESS_BATCH, batch)
+                return
+            except Exception:  # noqa: BLE001
+                if attempt == _MAX_SIGNAL_ATTEMPTS:
+                    logger.exception(
+                        "failed to report progress to %s after %s attempts",
+                        self.handle.id,
+                        attempt,
+                    )
+                    return
+                logger.warning(
+                    "failed to report progress to %s, retrying in %ss",
+                    self.handle.id,
+                    backoff_s,
+                )
+            await asyncio.sleep(backoff_s)
+            backoff_s *= 2
+
+
+class ProgressReporter:
+    def __init__(
+        self,
+        batcher: ProgressBatcher,
+        handle: WorkflowHandle,
+        activity_id: str,
+        *,
+        run_id: str,
+        weight: float = 1.0,
+    ) -> None:
+        self._batcher = batcher
+        self._handle = handle
+        self._activity_id = activity_id
+        self._run_id = run_id
+        self._weight = weight
+
+    def report(self, progress: float, *, force: bool = False) -> None:
+        signal = ProgressSignal(
+            activity_id=self._activity_id,
+            run_id=self._run_id,
+            progress=progress,
+            weight=self._weight,
+        )
+        self._batcher.report(self._handle, signal, force=force)
+
+    async def progress(self, progress: float, *, force: bool = False) -> None:
+        self.report(progress, force=force)
+
+    def sync_progress(
+        self,
+        progress: float,
+        event_loop: asyncio.AbstractEventLoop,  # noqa: ARG002
+        *,
+        force: bool = False,
+    ) -> None:
+        self.report(progress, force=force)
 
 
 def supports_progress(task_fn: Callable) -> bool:
@@ -302,9 +535,13 @@ def supports_progress(task_fn: Callable) -> bool:
     )
 
 
-def _get_progress_handler(
-    act_fn: Callable, min_progress_interval_s: float
-) -> ProgressRateHandler:
+def _get_progress_reporter(
+    act_fn: Callable,
+    batcher: ProgressBatcher,
+    *,
+    weight: float,
+    workflow_handles: MutableMapping[tuple[str, str], WorkflowHandle],
+) -> ProgressReporter:
     act = getattr(act_fn, "__self__", None)
     # Weirdly isinstance doesn't work here
     if act is None or not isinstance(act, ActivityWithProgress):
@@ -313,21 +550,18 @@ def _get_progress_handler(
             f"{ActivityWithProgress.__name__}."
         )
         raise TypeError(msg)
-    weight = _parse_progress_weight(act_fn)
     info = activity.info()
     run_id = info.workflow_run_id
     workflow_id = info.workflow_id
-    activity_id = activity.info().activity_id
-    client = act._temporal_client
-    workflow_handle = client.get_workflow_handle(workflow_id, run_id=run_id)
-    handler = TemporalProgressHandler(
-        workflow_handle,
-        activity_id,
-        run_id=run_id,
-        weight=weight,
-        min_progress_interval_s=min_progress_interval_s,
+    activity_id = info.activity_id
+    workflow_handle = workflow_handles.get((workflow_id, run_id))
+    if workflow_handle is None:
+        client = act._temporal_client
+        workflow_handle = client.get_workflow_handle(workflow_id, run_id=run_id)
+        workflow_handles[(workflow_id, run_id)] = workflow_handle
+    return ProgressReporter(
+        batcher, workflow_handle, activity_id, run_id=run_id, weight=weight
     )
-    return handler.progress
 
 
 def _is_progress(t: type) -> bool:
@@ -348,43 +582,89 @@ def _without_progress(arg_types: list[type] | None) -> list[type] | None:
     return filtered
 
 
+@cache
+def _type_adapter(t: type) -> TypeAdapter:
+    return TypeAdapter(t)
+
+
+def _convert_arg(arg: Any, arg_type: type) -> Any:
+    if isinstance(arg, RawValue):
+        arg = arg.payload
+    if isinstance(arg, Payload):
+        return _PAYLOAD_CONVERTER.from_payloads([arg], [arg_type])[0]
+    if isinstance(arg_type, type) and isinstance(arg, arg_type):
+        return arg
+    try:
+        adapter = _type_adapter(arg_type)
+    except TypeError:
+        # Unhashable type hint
+        adapter = TypeAdapter(arg_type)
+    return adapter.validate_python(arg)
+
+
+def _convert_args(args: Sequence[Any], arg_types: list[type] | None) -> list[Any]:
+    # Since the progress arg is never sent, temporal sees an arg count mismatch and
+    # decodes args without type hints, as plain JSON values. Rather than encoding
+    # and decoding them again, we only validate args which don't have the expected
+    # type yet
+    if arg_types is None:
+        return list(args)
+    try:
+        converted = [
+            _convert_arg(arg, t) for arg, t in zip(args, arg_types, strict=False)
+        ]
+    except (TypeError, ValidationError) as e:
+        raise fatal_error_from_exception(e) from e
+    converted.extend(args[len(converted) :])
+    return converted
+
+
 class _ProgressInboundInterceptor(ActivityInboundInterceptor):
     def __init__(
         self,
         next: ActivityInboundInterceptor,  # noqa: A002
-        min_progress_interval_s: float,
+        *,
+        activities: dict[str, ActivityMetadata],
+        batcher: ProgressBatcher,
+        workflow_handles: MutableMapping[tuple[str, str], WorkflowHandle],
     ) -> None:
         super().__init__(next)
-        self._min_progress_interval_s = min_progress_interval_s
+        self._activities = activities
+        self._batcher = batcher
+        self._workflow_handles = workflow_handles
+
+    def _metadata(self, act_fn: Callable) -> ActivityMetadata:
+        name = activity.info().activity_type
+        metadata = self._activities.get(name)
+        if metadata is None:
+            # The activity wasn't registered at worker start
+            metadata = ActivityMetadata.from_activity(act_fn)
+            self._activities[name] = metadata
+        return metadata
 
     async def execute_activity(self, input: ExecuteActivityInput) -> Any:  # noqa: A002
-        if not supports_progress(input.fn):
+        metadata = self._metadata(input.fn)
+        if not metadata.supports_progress:
             return await super().execute_activity(input)
         # The progress args breaks trigger a bypass of the dataloader:
         # https://github.com/temporalio/sdk-python/blob/631ebaf0e20fb214b16589b45627b358048a5d77/temporalio/worker/_activity.py#L600
         # we have to force it here again
-        progress_handler = _get_progress_handler(
-            input.fn, self._min_progress_interval_s
+        reporter = _get_progress_reporter(
+            input.fn,
+            self._batcher,
+            weight=metadata.progress_weight,
+            workflow_handles=self._workflow_handles,
         )
-        new_args = []
-        act_definition = _Definition.must_from_callable(input.fn)
-        if input.args:
-            data_converter = PYDANTIC_DATA_CONVERTER
-            arg_types = act_definition.arg_types
-            arg_types = _without_progress(arg_types)
-            arg_types = arg_types[: len(input.args)]
-            encoded = await data_converter.encode(input.args)
-            new_args = await data_converter.decode(encoded, type_hints=arg_types)
+        new_args = _convert_args(input.args, metadata.arg_types)
         injected_progress = (
-            progress_handler
-            if act_definition.is_async
-            else _sync_progress(progress_handler)
+            reporter.progress if metadata.is_async else reporter.sync_progress
         )
         new_args.append(injected_progress)
         new_input = dataclasses.replace(input, args=new_args)
-        await progress_handler(0.0, force=True)
-        res = await super().execute_activity(new_input)
-        await progress_handler(1.0, force=True)
+        async with self._batcher:
+            reporter.report(0.0, force=True)
+            res = await super().execute_activity(new_input)
+            reporter.report(1.0, force=True)
         return res
 
 
@@ -441,17 +721,3 @@ class _HeartbeatInboundInterceptor(ActivityInboundInterceptor):
             if heartbeat_task:
                 heartbeat_task.cancel()
                 await asyncio.wait([heartbeat_task])
-
-
-def _sync_progress(
-    progress_handler: AsyncProgressRateHandler,
-) -> SyncProgressRateHandler:
-    @wraps(progress_handler)
-    def p(
-        progress: float, event_loop: asyncio.AbstractEventLoop, *, force: bool = False
-    ) -> None:
-        asyncio.run_coroutine_threadsafe(
-            progress_handler(progress, force=force), event_loop
-        ).result()
-
-    return p
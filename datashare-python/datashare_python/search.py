@@ -0,0 +1,56 @@
+import logging
+from collections.abc import AsyncGenerator
+from copy import deepcopy
+from typing import Any
+
+from icij_common.es import ASC, ID, KEEP_ALIVE, PIT, SHARD_DOC_, ESClient, ESSort
+
+from .utils import merge_async_iterables
+
+logger = logging.getLogger(__name__)
+
+_SLICE = "slice"
+_MAX = "max"
+
+
+async def sliced_search_pages(
+    es_client: ESClient,
+    *,
+    index: str,
+    body: dict[str, Any],
+    n_slices: int = 1,
+    sort: ESSort = None,
+    keep_alive: str | None = None,
+    **kwargs,
+) -> AsyncGenerator[dict[str, Any], None]:
+    # Search a point in time of the index using n_slices concurrent cursors. Pages
+    # of the different slices are interleaved, the sort order is hence only
+    # preserved inside each slice, callers relying on a global sort order must use
+    # a single slice
+    if n_slices < 1:
+        raise ValueError(f"n_slices must be >= 1, found {n_slices}")
+    if n_slices == 1:
+        pages = es_client.poll_search_pages(index=index, body=body, sort=sort, **kwargs)
+        async for page in pages:
+            yield page
+        return
+    if keep_alive is None:
+        keep_alive = es_client.keep_alive
+    if sort is None:
+        sort = f"{SHARD_DOC_}:{ASC}"
+    pit = await es_client.open_point_in_time(index=index, keep_alive=keep_alive)
+    pit_id = pit[ID]
+    logger.debug("searching %s with %s slices...", index, n_slices)
+    try:
+        slices = []
+        for slice_id in range(n_slices):
+            slice_body = deepcopy(body)
+            slice_body[PIT] = {ID: pit_id, KEEP_ALIVE: keep_alive}
+            slice_body[_SLICE] = {ID: slice_id, _MAX: n_slices}
+            slices.append(
+                es_client.poll_search_pages(body=slice_body, sort=sort, **kwargs)
+            )
+        async for page in merge_async_iterables(slices, max_buffered=n_slices):
+            yield page
+    finally:
+        await es_client.close_point_in_time(body={ID: pit_id})
@@ -9,7 +9,9 @@ import shutil
 import sys
 import threading
 import time
+from collections import defaultdict, deque
 from collections.abc import (
+    AsyncGenerator,
     AsyncIterable,
     Awaitable,
     Callable,
@@ -21,12 +23,13 @@ from collections.abc import (
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import timedelta
-from functools import cache, wraps
+from functools import cache, partial, wraps
 from hashlib import sha256
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Self, TypeVar
 from uuid import uuid4
+from weakref import WeakValueDictionary
 
 import temporalio
 from aiofile import async_open
@@ -79,7 +82,9 @@ _NEVER_RETRIABLES = {
 }
 
 
-_ARTIFACT_LOCK = threading.Lock()
+_ARTIFACT_LOCK_POLL_INTERVAL_S = 0.02
+_ARTIFACT_LOCKS: WeakValueDictionary[Path, threading.Lock] = WeakValueDictionary()
+_ARTIFACT_LOCKS_GUARD = threading.Lock()
 # For test
 _LOCKED = threading.Event()
 
@@ -107,6 +112,11 @@ class ProgressSignal:
         return Progress(current=self.progress * self.weight, max_progress=self.weight)
 
 
+@dataclass(frozen=True)
+class ProgressSignalBatch:
+    signals: list[ProgressSignal]
+
+
 class ActivityWithProgress:
     def __init__(
         self,
@@ -125,16 +135,25 @@ class WorkflowWithProgress:
     @workflow.signal
     async def update_progress(self, signal: ProgressSignal) -> None:
         async with self._update_lock:
-            # TODO: remove this log
+            self._apply_progress([signal])
+
+    @workflow.signal
+    async def update_progress_batch(self, batch: ProgressSignalBatch) -> None:
+        async with self._update_lock:
+            self._apply_progress(batch.signals)
+
+    def _apply_progress(self, signals: list[ProgressSignal]) -> None:
+        # Search attributes are upserted once per signal, not for each activity
+        for signal in signals:
             key = (signal.run_id, signal.activity_id)
             self._progress[key] = signal.to_progress()
-            progress = sum(p.current for p in self._progress.values())
-            max_progress = sum(p.max_progress for p in self._progress.values())
-            attributes = [
-                SearchAttributeKey.for_float("Progress").value_set(progress),
-                SearchAttributeKey.for_float("MaxProgress").value_set(max_progress),
-            ]
-            workflow.upsert_search_attributes(attributes)
+        progress = sum(p.current for p in self._progress.values())
+        max_progress = sum(p.max_progress for p in self._progress.values())
+        attributes = [
+            SearchAttributeKey.for_float("Progress").value_set(progress),
+            SearchAttributeKey.for_float("MaxProgress").value_set(max_progress),
+        ]
+        workflow.upsert_search_attributes(attributes)
 
 
 def _retry_policy_with_default(retry_policy: RetryPolicy | None) -> RetryPolicy:
@@ -399,29 +418,71 @@ def _read_artifact_manifest(root: Path, artifact: DocArtifact) -> dict:
 def write_artifact(
     root: Path, artifact: DocArtifact, lock_timeout_ms: int = 30_000
 ) -> Path:
-    # TODO: WARNING many writers could write at the time, to avoid inconsistent
-    #  states we should handle this somehow
     artif_dir = root / artifacts_dir(artifact.doc_id, project=artifact.project)
     artif_dir.mkdir(exist_ok=True, parents=True)
-    artifact_path = artif_dir / artifact.filename
-    # We're using POSIX locks which are not exclusive to filedescriptors
-    # but to processes, we hence have to ensure several threads from the same
-    # Python process acquire the lock at the same time. We're using a python mutex lock
     with artifact_lock(artif_dir, lock_timeout_ms):
-        # Read the metadata first (things could go wrong here in case someone is reading
-        # at the same time). We read in a backward compatible wat and write to that same
-        # location. We don't take responsibility for migrating the data, the DS back
-        # will do it
-        manifest_path, manifest = _read_manifest_backward_compatible(root, artifact)
-        is_legacy = manifest_path.name == "metadata.json"
-        # Pop the status key from the manifest before writing
-        manifest_entry = manifest.get(artifact.type)
-        if manifest_entry is not None and not is_legacy:
-            manifest[artifact.type].pop("status", None)
-            manifest_path.write_text(json.dumps(manifest))
-        # Write the artifact
+        return _write_artifact_and_manifest(root, artifact, artif_dir)
+
+
+async def async_write_artifact(
+    root: Path, artifact: DocArtifact, lock_timeout_ms: int = 30_000
+) -> Path:
+    artif_dir = root / artifacts_dir(artifact.doc_id, project=artifact.project)
+    artif_dir.mkdir(exist_ok=True, parents=True)
+    async with async_artifact_lock(artif_dir, lock_timeout_ms):
+        return await asyncio.to_thread(
+            _write_artifact_and_manifest, root, artifact, artif_dir
+        )
+
+
+def write_artifacts(
+    root: Path, artifacts: Iterable[DocArtifact], lock_timeout_ms: int = 30_000
+) -> list[Path]:
+    artifacts = list(artifacts)
+    paths: list[Path | None] = [None] * len(artifacts)
+    for artif_dir, dir_artifacts in _group_by_artifacts_dir(root, artifacts).items():
+        artif_dir.mkdir(exist_ok=True, parents=True)
+        with artifact_lock(artif_dir, lock_timeout_ms):
+            dir_paths = _write_dir_artifacts_and_manifest(
+                root, [a for _, a in dir_artifacts], artif_dir
+            )
+        for (i, _), path in zip(dir_artifacts, dir_paths, strict=True):
+            paths[i] = path
+    return paths
+
+
+async def async_write_artifacts(
+    root: Path, artifacts: Iterable[DocArtifact], lock_timeout_ms: int = 30_000
+) -> list[Path]:
+    return await asyncio.to_thread(write_artifacts, root, artifacts, lock_timeout_ms)
+
+
+def _group_by_artifacts_dir(
+    root: Path, artifacts: list[DocArtifact]
+) -> dict[Path, list[tuple[int, DocArtifact]]]:
+    by_dir = defaultdict(list)
+    for i, artifact in enumerate(artifacts):
+        artif_dir = root / artifacts_dir(artifact.doc_id, project=artifact.project)
+        by_dir[artif_dir].append((i, artifact))
+    return by_dir
+
+
+def _write_dir_artifacts_and_manifest(
+    root: Path, artifacts: list[DocArtifact], artif_dir: Path
+) -> list[Path]:
+    # All artifacts belong to the same doc, hence share the same manifest which we
+    # read and write only once. We read in a backward compatible way and write to
+    # that same location. We don't take responsibility for migrating the data, the
+    # DS back will do it.
+    # Artifacts and manifest are written to temp files and renamed, readers hence
+    # never see partial files and a crash at any point leaves the previous manifest
+    # untouched
+    manifest_path, manifest = _read_manifest_backward_compatible(root, artifacts[0])
+    is_legacy = manifest_path.name == "metadata.json"
+    paths = []
+    for artifact in artifacts:
+        artifact_path = artif_dir / artifact.filename
         _write_artifact_bytes(artifact_path, artifact.artifact)
-        # Update the manifest entry with details and new states
         if is_legacy:
             manifest_entry = str(artifact_path.relative_to(artif_dir))
         else:
@@ -429,8 +490,28 @@ def write_artifact(
                 mode="json", by_alias=True
             )
         manifest[artifact.type] = manifest_entry
-        manifest_path.write_text(json.dumps(manifest))
-        return artifact_path.relative_to(root)
+        paths.append(artifact_path.relative_to(root))
+    _write_manifest_atomically(manifest_path, manifest)
+    return paths
+
+
+def _write_manifest_atomically(manifest_path: Path, manifest: dict[str, Any]) -> None:
+    tmp_path = _tmp_path(manifest_path)
+    try:
+        tmp_path.write_text(json.dumps(manifest))
+        tmp_path.replace(manifest_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+
+
+def _write_artifact_and_manifest(
+    root: Path, artifact: DocArtifact, artif_dir: Path
+) -> Path:
+    return _write_dir_artifacts_and_manifest(root, [artifact], artif_dir)[0]
 
 
 @contextlib.contextmanager
@@ -442,34 +523,88 @@ def _set_event() -> Generator[None, None, None]:
         _LOCKED.clear()
 
 
+def _artifact_dir_lock(artifacts_dir: Path) -> threading.Lock:
+    with _ARTIFACT_LOCKS_GUARD:
+        lock = _ARTIFACT_LOCKS.get(artifacts_dir)
+        if lock is None:
+            lock = threading.Lock()
+            _ARTIFACT_LOCKS[artifacts_dir] = lock
+        return lock
+
+
+def _try_lock_file(fd: int) -> bool:
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _lock_timeout_error(lock_path: Path, lock_timeout_ms: int) -> TimeoutError:
+    msg = f"failed to acquire lock on {lock_path} in less than {lock_timeout_ms} ms."
+    return TimeoutError(msg)
+
+
 @contextlib.contextmanager
 def artifact_lock(
     artifacts_dir: Path, lock_timeout_ms: int
 ) -> Generator[None, None, None]:
+    # We're using POSIX locks which are not exclusive to filedescriptors but to
+    # processes, we hence have to ensure several threads from the same Python process
+    # don't acquire the lock at the same time. We're using a Python mutex per
+    # directory so that writers of different documents don't wait for each other
     lock_path = artifacts_dir / f"{MANIFEST_JSON}.lock"
-    acquired = False
-    fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
+    deadline = time.monotonic() + lock_timeout_ms / 1000
+    dir_lock = _artifact_dir_lock(artifacts_dir)
+    if not dir_lock.acquire(timeout=lock_timeout_ms / 1000):
+        raise _lock_timeout_error(lock_path, lock_timeout_ms)
     try:
-        with _ARTIFACT_LOCK, _set_event():
-            start = time.time()
-            timeout_s = lock_timeout_ms / 1000
-            while time.time() - start < timeout_s:
+        with _set_event():
+            fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
+            try:
+                while not _try_lock_file(fd):
+                    if time.monotonic() >= deadline:
+                        raise _lock_timeout_error(lock_path, lock_timeout_ms)
+                    time.sleep(_ARTIFACT_LOCK_POLL_INTERVAL_S)
                 try:
-                    _, acquired = fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB), True
-                except OSError:
-                    # TODO: we shouldn't block here, use asyncio instead
-                    time.sleep(0.02)
-                    continue
+                    yield
+                finally:
+                    lock_path.unlink(missing_ok=True)
+            finally:
+                os.close(fd)
+    finally:
+        dir_lock.release()
+
+
+@contextlib.asynccontextmanager
+async def async_artifact_lock(
+    artifacts_dir: Path, lock_timeout_ms: int
+) -> AsyncGenerator[None, None]:
+    # Same as artifact_lock, but we poll both the directory mutex (shared with sync
+    # writers running in activity threads) and the file lock without blocking, giving
+    # control back to the event loop in between attempts
+    lock_path = artifacts_dir / f"{MANIFEST_JSON}.lock"
+    deadline = time.monotonic() + lock_timeout_ms / 1000
+    dir_lock = _artifact_dir_lock(artifacts_dir)
+    while not dir_lock.acquire(blocking=False):
+        if time.monotonic() >= deadline:
+            raise _lock_timeout_error(lock_path, lock_timeout_ms)
+        await asyncio.sleep(_ARTIFACT_LOCK_POLL_INTERVAL_S)
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
+        try:
+            while not _try_lock_file(fd):
+                if time.monotonic() >= deadline:
+                    raise _lock_timeout_error(lock_path, lock_timeout_ms)
+                await asyncio.sleep(_ARTIFACT_LOCK_POLL_INTERVAL_S)
+            try:
                 yield
-                return
-            msg = (
-                f"failed to acquire lock on {lock_path} in less than "
-                f"{lock_timeout_ms} ms."
-            )
-            raise TimeoutError(msg)
+            finally:
+                lock_path.unlink(missing_ok=True)
+        finally:
+            os.close(fd)
     finally:
-        if acquired:
-            lock_path.unlink(missing_ok=True)
+        dir_lock.release()
 
 
 def _read_manifest_backward_compatible(
@@ -485,18 +620,22 @@ def _read_manifest_backward_compatible(
 
 
 def _write_artifact_bytes(path: Path, artifact: bytes | BytesIO | Path) -> None:
-    match artifact:
-        case bytes():
-            path.write_bytes(artifact)
-        case BytesIO():
-            with path.open("wb") as f:
-                f.write(artifact.read())
-        case Path():
-            path.unlink(missing_ok=True)
-            shutil.move(artifact, path)
-        case _:
-            msg = f"unsupported artifact type: {artifact.__class__.__name__}"
-            raise ValueError(msg)
+    tmp_path = _tmp_path(path)
+    try:
+        match artifact:
+            case bytes():
+                tmp_path.write_bytes(artifact)
+            case BytesIO():
+                with tmp_path.open("wb") as f:
+                    f.write(artifact.read())
+            case Path():
+                shutil.move(artifact, tmp_path)
+            case _:
+                msg = f"unsupported artifact type: {artifact.__class__.__name__}"
+                raise ValueError(msg)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 def debuggable_name(
@@ -657,32 +796,231 @@ def ext_to_mime_types(ext: str) -> set[str]:
 
 async def publish_and_consume(
     publisher: asyncio.Task,
-    publisher_completion_callback: Callable[[], None],
+    publisher_completion_callback: Callable[[], Awaitable[None] | None],
     *,
-    consumer: asyncio.Task,
+    consumer: asyncio.Task | None = None,
+    consumers: Sequence[asyncio.Task] | None = None,
 ) -> tuple[Any, Any]:
-    # Publish and consume concurrently
-    logger.debug("starting publish and subscribe")
-    done, pending = await asyncio.wait(
-        [publisher, consumer], return_when=asyncio.FIRST_COMPLETED
-    )
-    for d in done:
-        # Stop everything case of exception
-        exc = d.exception()
-        if exc:
-            for p in pending:
-                p.cancel()
-            raise exc
-    # Wait for publish to be done and push the poison pill to stop consuming
-    p_res = await publisher
-    publisher_completion_callback()
-    logger.debug("done publishing, waiting for consumer to complete...")
-    # Wait for consumption to be done
-    c_res = await consumer
+    # Publish and consume concurrently using either a single consumer or a pool of
+    # consumers, in which case the consumers results are returned as a list
+    if (consumer is None) == (consumers is None):
+        raise ValueError("expected either a consumer or a sequence of consumers")
+    pool = [consumer] if consumer is not None else list(consumers)
+    logger.debug("starting publish and subscribe with %s consumers", len(pool))
+    try:
+        await _wait_watching(publisher, watched=pool)
+        p_res = publisher.result()
+        # Push one poison pill per consumer to stop consuming
+        for _ in pool:
+            pill = publisher_completion_callback()
+            if inspect.isawaitable(pill):
+                await _wait_watching(asyncio.ensure_future(pill), watched=pool)
+        logger.debug("done publishing, waiting for consumers to complete...")
+        await asyncio.gather(*pool)
+    except BaseException:
+        # Stop everything in case of exception
+        for t in (publisher, *pool):
+            t.cancel()
+        await asyncio.gather(publisher, *pool, return_exceptions=True)
+        raise
     logger.debug("done consuming !")
+    c_res = [c.result() for c in pool]
+    if consumer is not None:
+        c_res = c_res[0]
     return p_res, c_res
 
 
+async def _wait_watching(task: asyncio.Future, *, watched: list[asyncio.Task]) -> None:
+    # Wait for the task to complete, fails as soon as one of the watched task fails
+    pending = {task, *watched}
+    try:
+        while not task.done():
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for d in done:
+                if not d.cancelled() and d.exception() is not None:
+                    raise d.exception()
+    except BaseException:
+        task.cancel()
+        raise
+    task.result()
+
+
+class BytesBoundedQueue[T]:
+    # Queue bounded by the total size of its items rather than by their count, puts
+    # block until enough room is available. An item is always accepted by an empty
+    # queue, even when it exceeds the max size, and None (poison pills) are never
+    # blocked
+    def __init__(self, max_size_bytes: int, size_fn: Callable[[T], int]) -> None:
+        self._max_size_bytes = max_size_bytes
+        self._size_fn = size_fn
+        self._items: deque[tuple[T, int]] = deque()
+        self._size_bytes = 0
+        self._not_full_or_empty = asyncio.Condition()
+        # Metrics
+        self.max_depth = 0
+        self.max_size_bytes_reached = 0
+        self.n_blocked_puts = 0
+        self.blocked_s = 0.0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, item: T) -> None:
+        size = self._size_fn(item) if item is not None else 0
+        async with self._not_full_or_empty:
+            if not self._fits(size):
+                start = time.monotonic()
+                await self._not_full_or_empty.wait_for(partial(self._fits, size))
+                self.blocked_s += time.monotonic() - start
+                self.n_blocked_puts += 1
+            self._items.append((item, size))
+            self._size_bytes += size
+            self.max_depth = max(self.max_depth, len(self._items))
+            self.max_size_bytes_reached = max(
+                self.max_size_bytes_reached, self._size_bytes
+            )
+            self._not_full_or_empty.notify_all()
+
+    async def get(self) -> T:
+        async with self._not_full_or_empty:
+            await self._not_full_or_empty.wait_for(lambda: self._items)
+            item, size = self._items.popleft()
+            self._size_bytes -= size
+            self._not_full_or_empty.notify_all()
+        return item
+
+    def _fits(self, size: int) -> bool:
+        return (
+            not size
+            or not self._items
+            or self._size_bytes + size <= self._max_size_bytes
+        )
+
+
+_THREAD_ITER_DONE = object()
+_THREAD_ITER_POLL_INTERVAL_S = 0.1
+
+
+async def iterate_in_thread[T](
+    iterable: Iterable[T], *, max_buffered: int = 1
+) -> AsyncGenerator[T, None]:
+    # Consume a blocking iterable in a thread and stream items to the event loop
+    # through a bounded queue, the thread blocks when the consumer lags behind
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_buffered)
+    stopped = threading.Event()
+
+    def put(item: Any, exc: BaseException | None = None) -> bool:
+        fut = asyncio.run_coroutine_threadsafe(queue.put((item, exc)), loop)
+        while not stopped.is_set():
+            try:
+                fut.result(timeout=_THREAD_ITER_POLL_INTERVAL_S)
+                return True
+            except TimeoutError:
+                continue
+        fut.cancel()
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:  # noqa: BLE001
+            put(_THREAD_ITER_DONE, e)
+            return
+        put(_THREAD_ITER_DONE)
+
+    producer = asyncio.create_task(asyncio.to_thread(produce))
+    try:
+        while True:
+            item, exc = await queue.get()
+            if exc is not None:
+                raise exc
+            if item is _THREAD_ITER_DONE:
+                return
+            yield item
+    finally:
+        stopped.set()
+        await producer
+
+
+_PREFETCH_DONE = object()
+
+
+async def prefetch[T](
+    iterable: AsyncIterable[T], *, max_buffered: int = 1
+) -> AsyncGenerator[T, None]:
+    # Consume an async iterable in a background task so that it runs ahead of the
+    # consumer by at most max_buffered items
+    if max_buffered < 1:
+        raise ValueError(f"max_buffered must be >= 1, found {max_buffered}")
+    queue = asyncio.Queue(maxsize=max_buffered)
+
+    async def produce() -> None:
+        try:
+            async for item in iterable:
+                await queue.put((item, None))
+        except Exception as e:  # noqa: BLE001
+            await queue.put((_PREFETCH_DONE, e))
+            return
+        await queue.put((_PREFETCH_DONE, None))
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item, exc = await queue.get()
+            if exc is not None:
+                raise exc
+            if item is _PREFETCH_DONE:
+                return
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def merge_async_iterables[T](
+    iterables: Sequence[AsyncIterable[T]], *, max_buffered: int = 1
+) -> AsyncGenerator[T, None]:
+    # Consume async iterables concurrently and yield their items as they come, items
+    # of a given iterable keep their order but iterables are interleaved
+    if max_buffered < 1:
+        raise ValueError(f"max_buffered must be >= 1, found {max_buffered}")
+    queue = asyncio.Queue(maxsize=max_buffered)
+
+    async def produce(iterable: AsyncIterable[T]) -> None:
+        try:
+            async for item in iterable:
+                await queue.put((item, None))
+        except Exception as e:  # noqa: BLE001
+            await queue.put((_PREFETCH_DONE, e))
+            return
+        await queue.put((_PREFETCH_DONE, None))
+
+    producers = [asyncio.create_task(produce(it)) for it in iterables]
+    n_running = len(producers)
+    try:
+        while n_running:
+            item, exc = await queue.get()
+            if exc is not None:
+                raise exc
+            if item is _PREFETCH_DONE:
+                n_running -= 1
+                continue
+            yield item
+    finally:
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+
+
 class _PydanticPayloadConverter(CompositePayloadConverter):
     def __init__(self) -> None:
         json_payload_converter = PydanticJSONPlainPayloadConverter(
@@ -722,10 +1060,16 @@ class SharedResources:
         self,
         cache_size: int = 1,
         eviction_callback: Callable[[Any, Any], None] | None = None,
+        *,
+        load_timeout_s: float | None = None,
     ) -> None:
         self._eviction_callback = eviction_callback
         self._cache = LRU(cache_size, self._eviction_callback)
         self._sentinel = object()
+        self._load_timeout_s = load_timeout_s
+        self._lock = threading.Lock()
+        self._loading: dict[str, _Loading] = dict()
+        self._async_loading: dict[str, _Loading] = dict()
 
     def __enter__(self) -> Self:
         return self
@@ -736,48 +1080,99 @@ class SharedResources:
                 self._eviction_callback(k, v)
 
     def get_or_cache_resource(
-        self, key: str, default_factory: Callable[[], Any]
+        self,
+        key: str,
+        default_factory: Callable[[], Any],
+        *,
+        load_timeout_s: float | None = None,
     ) -> Any:
-        value = self._cache.get(key, self._sentinel)
-        if value is not self._sentinel:
-            return value
-        # Get the value first to be sure to return the right one in case of concurrent
-        # access.
-        #
-        # Additionally, the factory can be long to complete (that's one of the reason
-        # we want to cache its results). Because we don't lock the factory call,
-        # together with the cache update, in case of concurrent access,
-        # quicker factories will complete first and will stay longer in the cache.
-        # This is fine, the alternative is to lock factory + cache update to avoid
-        # concurrent access but this will mean waiting for the first factory call to
-        # complete, this can potentially imply longer waits than no getting the value
-        # from the cache
-        value = default_factory()
-        self._cache[key] = value
+        # Resources can be large and long to load (models...), concurrent callers
+        # missing the cache hence wait for the first one to load the resource rather
+        # than loading their own copy
+        with self._lock:
+            value = self._cache.get(key, self._sentinel)
+            if value is not self._sentinel:
+                return value
+            loading = self._loading.get(key)
+            is_loading = loading is not None
+            if not is_loading:
+                loading = _Loading(threading.Event())
+                self._loading[key] = loading
+        if is_loading:
+            if load_timeout_s is None:
+                load_timeout_s = self._load_timeout_s
+            if not loading.done.wait(load_timeout_s):
+                msg = f"timed out waiting for resource {key} to be loaded"
+                raise TimeoutError(msg)
+            return loading.result()
+        try:
+            value = default_factory()
+        except BaseException as e:
+            loading.error = e
+            raise
+        else:
+            loading.value = value
+            with self._lock:
+                self._cache[key] = value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.done.set()
         return value
 
     async def async_get_or_cache_resource(
-        self, key: str, default_factory: Callable[[], Awaitable[Any]]
+        self,
+        key: str,
+        default_factory: Callable[[], Awaitable[Any]],
+        *,
+        load_timeout_s: float | None = None,
     ) -> Any:
-        value = self._cache.get(key, self._sentinel)
-        if value is not self._sentinel:
-            return value
-        # Get the value first to be sure to return the right one in case of concurrent
-        # access.
-        #
-        # Additionally, the factory can be long to complete (that's one of the reason
-        # we want to cache its results). Because we don't lock the factory call,
-        # together with the cache update, in case of concurrent access,
-        # quicker factories will complete first and will stay longer in the cache.
-        # This is fine, the alternative is to lock factory + cache update to avoid
-        # concurrent access but this will mean waiting for the first factory call to
-        # complete, this can potentially imply longer waits than no getting the value
-        # from the cache
-        value = await default_factory()
-        self._cache[key] = value
+        if load_timeout_s is None:
+            load_timeout_s = self._load_timeout_s
+        while True:
+            value = self._cache.get(key, self._sentinel)
+            if value is not self._sentinel:
+                return value
+            loading = self._async_loading.get(key)
+            if loading is None:
+                break
+            try:
+                async with asyncio.timeout(load_timeout_s):
+                    await loading.done.wait()
+            except TimeoutError as e:
+                msg = f"timed out waiting for resource {key} to be loaded"
+                raise TimeoutError(msg) from e
+            if not isinstance(loading.error, asyncio.CancelledError):
+                return loading.result()
+            # The loading task was cancelled, let's try to load it ourselves
+        loading = _Loading(asyncio.Event())
+        self._async_loading[key] = loading
+        try:
+            value = await default_factory()
+        except BaseException as e:
+            loading.error = e
+            raise
+        else:
+            loading.value = value
+            self._cache[key] = value
+        finally:
+            del self._async_loading[key]
+            loading.done.set()
         return value
 
 
+class _Loading:
+    def __init__(self, done: threading.Event | asyncio.Event) -> None:
+        self.done = done
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+    def result(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
 def close_cm_callback(key: str, value: Any) -> None:  # noqa: ARG001
     if hasattr(value, "__exit__"):
         value.__exit__(*sys.exc_info())
@@ -809,3 +1204,10 @@ def async_enter_cm(
 
 def config_cache_key(config: BaseModel) -> str:
     return str(hash(config))
+
+
+def persistent_config_cache_key(config: BaseModel) -> str:
+    # Unlike config_cache_key, this key is stable across processes and can hence be
+    # used to key on-disk caches
+    as_json = f"{config.__class__.__qualname__}{config.model_dump_json()}"
+    return sha256(as_json.encode()).hexdigest()
@@ -26,6 +26,7 @@ from .interceptors import (
     HeartbeatInterceptor,
     ProgressInterceptor,
     TraceContextInterceptor,
+    activities_metadata,
 )
 from .types_ import ContextManagerFactory, TemporalClient
 
@@ -90,7 +91,9 @@ def datashare_worker(
         workflows = []
     if activities is None:
         activities = []
-    are_async = [a.__temporal_activity_definition.is_async for a in activities]
+    # Introspect activities once, the interceptors only read from it
+    metadata = activities_metadata(activities)
+    are_async = [m.is_async for m in metadata.values()]
     if are_async and all(not a for a in are_async):
         activity_executor = ThreadPoolExecutor(
             thread_name_prefix=_ACTIVITY_THREAD_NAME_PREFIX
@@ -109,7 +112,9 @@ def datashare_worker(
             logger.warning(_SEPARATE_IO_AND_CPU_WORKERS)
     interceptors = [
         TraceContextInterceptor(),
-        ProgressInterceptor(min_progress_interval_s=min_progress_interval_s),
+        ProgressInterceptor(
+            min_progress_interval_s=min_progress_interval_s, activities=metadata
+        ),
         HeartbeatInterceptor(),
     ]
     wf_runner = SandboxedWorkflowRunner() if sandboxed else UnsandboxedWorkflowRunner()
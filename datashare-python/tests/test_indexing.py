@@ -0,0 +1,142 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from datashare_python.indexing import BulkIndexer, RefreshPolicy
+from elasticsearch.helpers import BulkIndexError
+
+
+def _action(doc_id: str, index: str = "test-project") -> dict:
+    return {"_op_type": "update", "_index": index, "_id": doc_id, "doc": {"a": "b"}}
+
+
+def _mock_es_client() -> MagicMock:
+    es_client = MagicMock()
+    es_client.indices.refresh = AsyncMock()
+    return es_client
+
+
+async def _bulk_ok(es_client, actions, **kwargs) -> tuple[int, list]:  # noqa: ANN001, ARG001
+    return len(actions), []
+
+
+async def test_bulk_indexer_should_chunk_by_actions_and_bytes() -> None:
+    # Given
+    actions = [_action(str(i)) for i in range(5)]
+    big_action = _action("big")
+    big_action["doc"]["a"] = "b" * 1000
+    actions.append(big_action)
+    indexer = BulkIndexer(_mock_es_client(), max_bulk_actions=2, max_bulk_bytes=500)
+    # When
+    with patch("datashare_python.indexing.async_bulk", side_effect=_bulk_ok) as bulk:
+        n_success, errors = await indexer.bulk(actions)
+    # Then
+    assert n_success == 6
+    assert not errors
+    chunks = [[a["_id"] for a in c.args[1]] for c in bulk.mock_calls]
+    assert chunks == [["0", "1"], ["2", "3"], ["4"], ["big"]]
+
+
+async def test_bulk_indexer_should_bound_in_flight_bulks() -> None:
+    # Given
+    actions = [_action(str(i)) for i in range(10)]
+    indexer = BulkIndexer(_mock_es_client(), max_bulk_actions=1, max_in_flight=3)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _slow_bulk(es_client, actions, **kwargs) -> tuple[int, list]:  # noqa: ANN001, ARG001
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return len(actions), []
+
+    # When
+    with patch("datashare_python.indexing.async_bulk", side_effect=_slow_bulk):
+        n_success, _ = await indexer.bulk(actions)
+    # Then
+    assert n_success == 10
+    assert max_in_flight == 3
+
+
+async def test_bulk_indexer_should_release_permits_of_cancelled_bulks() -> None:
+    # Given
+    indexer = BulkIndexer(_mock_es_client(), max_bulk_actions=1, max_in_flight=2)
+
+    def _failing_actions() -> Iterator[dict]:
+        yield _action("0")
+        yield _action("1")
+        yield _action("2")
+        raise ValueError("failed to read actions")
+
+    with patch("datashare_python.indexing.async_bulk", side_effect=_bulk_ok):
+        # Bulks are cancelled before they even started
+        with pytest.raises(ValueError, match="failed to read actions"):
+            await indexer.bulk(_failing_actions())
+        # When
+        actions = [_action(str(i)) for i in range(3)]
+        n_success, _ = await asyncio.wait_for(indexer.bulk(actions), timeout=1.0)
+    # Then
+    assert n_success == 3
+
+
+@pytest.mark.parametrize(
+    ("refresh", "expected_bulk_refresh", "expected_refreshes"),
+    [
+        (RefreshPolicy.END, False, 1),
+        (RefreshPolicy.WAIT_FOR, "wait_for", 0),
+        (RefreshPolicy.NONE, False, 0),
+    ],
+)
+async def test_bulk_indexer_refresh(
+    refresh: RefreshPolicy,
+    expected_bulk_refresh: str | bool,  # noqa: FBT001
+    expected_refreshes: int,
+) -> None:
+    # Given
+    es_client = _mock_es_client()
+    actions = [_action("0", index="index-b"), _action("1", index="index-a")]
+    # When
+    with patch("datashare_python.indexing.async_bulk", side_effect=_bulk_ok) as bulk:
+        async with BulkIndexer(es_client, refresh=refresh) as indexer:
+            await indexer.bulk(actions[:1])
+            await indexer.bulk(actions[1:])
+    # Then
+    assert all(c.kwargs["refresh"] == expected_bulk_refresh for c in bulk.mock_calls)
+    refresh_calls = es_client.indices.refresh.mock_calls
+    assert len(refresh_calls) == expected_refreshes
+    if expected_refreshes:
+        assert refresh_calls[0].kwargs["index"] == "index-a,index-b"
+
+
+async def test_bulk_indexer_should_raise_bulk_errors() -> None:
+    # Given
+    es_client = _mock_es_client()
+    actions = [_action(str(i)) for i in range(4)]
+    error = BulkIndexError("1 document(s) failed to index.", [{"update": {}}])
+    # When
+    mocked_bulk = patch("datashare_python.indexing.async_bulk", side_effect=error)
+    with mocked_bulk, pytest.raises(BulkIndexError):
+        async with BulkIndexer(es_client, max_bulk_actions=1) as indexer:
+            await indexer.bulk(actions)
+    # Then
+    es_client.indices.refresh.assert_not_called()
+
+
+async def test_bulk_indexer_should_skip_cancelled_bulks_when_checking_failures() -> (
+    None
+):
+    # Given
+    es_client = _mock_es_client()
+    actions = [_action(str(i)) for i in range(3)]
+    error = BulkIndexError("1 document(s) failed to index.", [{"update": {}}])
+    # The first bulk is cancelled, the second one fails
+    side_effect = [asyncio.CancelledError(), error]
+    # When
+    mocked_bulk = patch("datashare_python.indexing.async_bulk", side_effect=side_effect)
+    indexer = BulkIndexer(es_client, max_bulk_actions=1, max_in_flight=1)
+    # Then
+    with mocked_bulk, pytest.raises(BulkIndexError):
+        await indexer.bulk(actions)
@@ -13,6 +13,7 @@ from datashare_python.objects import DatashareModel
 from datashare_python.utils import (
     ActivityWithProgress,
     ProgressSignal,
+    ProgressSignalBatch,
     WorkflowWithProgress,
     activity_defn,
     execute_activity,
@@ -23,11 +24,17 @@ from temporalio.common import RetryPolicy
 with temporalio.workflow.unsafe.imports_passed_through():
     from datashare_python.config import WorkerConfig
     from datashare_python.interceptors import (
+        _MAX_SIGNAL_ATTEMPTS,
+        ActivityMetadata,
         HeartbeatInterceptor,
+        ProgressBatcher,
         ProgressInterceptor,
+        ProgressReporter,
         TemporalProgressHandler,
         TraceContext,
         TraceContextInterceptor,
+        _convert_args,
+        activities_metadata,
         get_trace_context,
     )
     from datashare_python.types_ import (
@@ -414,6 +421,13 @@ async def test_heartbeat_interceptor_should_fail_when_no_heartbeat(
     assert "Heartbeat timeout" in cause.args[0]
 
 
+def test_progress_handler_should_be_deprecated() -> None:
+    # When/Then
+    with pytest.warns(DeprecationWarning, match="TemporalProgressHandler"):
+        TemporalProgressHandler(AsyncMock(), "activity-id", run_id="run-id")
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 async def test_should_progress_handler_should_not_report_progress() -> None:
     # Given
     mocked_wf_handle = AsyncMock()
@@ -436,6 +450,7 @@ async def test_should_progress_handler_should_not_report_progress() -> None:
     mocked_wf_handle.signal.assert_called_once_with("update_progress", expected_signal)
 
 
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 async def test_should_progress_handler_should_report_progress() -> None:
     # Given
     mocked_wf_handle = AsyncMock()
@@ -469,6 +484,7 @@ async def test_should_progress_handler_should_report_progress() -> None:
     mocked_wf_handle.signal.assert_has_calls(expected_calls)
 
 
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
 async def test_should_progress_handler_should_report_progress_on_force() -> None:
     # Given
     mocked_wf_handle = AsyncMock()
@@ -500,3 +516,207 @@ async def test_should_progress_handler_should_report_progress_on_force() -> None
         ),
     ]
     mocked_wf_handle.signal.assert_has_calls(expected_calls)
+
+
+def _mock_wf_handle(workflow_id: str = "workflow-id") -> AsyncMock:
+    handle = AsyncMock()
+    handle.id = workflow_id
+    handle.run_id = "run-id"
+    return handle
+
+
+def _reported(mocked_wf_handle: AsyncMock) -> list[list[tuple[str, float]]]:
+    return [
+        [(s.activity_id, s.progress) for s in c.args[1].signals]
+        for c in mocked_wf_handle.signal.call_args_list
+    ]
+
+
+async def test_progress_batcher_should_batch_progress() -> None:
+    # Given
+    handles = [_mock_wf_handle("workflow-0"), _mock_wf_handle("workflow-1")]
+    batcher = ProgressBatcher(flush_interval_s=60.0)
+    reporters = [
+        ProgressReporter(batcher, handles[0], "act-0", run_id="run-id"),
+        ProgressReporter(batcher, handles[0], "act-1", run_id="run-id"),
+        ProgressReporter(batcher, handles[1], "act-2", run_id="run-id"),
+    ]
+    # When
+    async with batcher:
+        for r in reporters:
+            await r.progress(0.0, force=True)
+        await reporters[0].progress(0.5)
+        await reporters[1].progress(0.2)
+        await reporters[0].progress(0.7)
+        await reporters[2].progress(1.0, force=True)
+    # Then
+    expected_reported = [
+        [("act-0", 0.0), ("act-1", 0.0), ("act-0", 0.7), ("act-1", 0.2)]
+    ]
+    assert _reported(handles[0]) == expected_reported
+    assert _reported(handles[1]) == [[("act-2", 0.0), ("act-2", 1.0)]]
+    expected_batch = ProgressSignalBatch(
+        signals=[
+            ProgressSignal(activity_id="act-2", run_id="run-id", progress=0.0),
+            ProgressSignal(activity_id="act-2", run_id="run-id", progress=1.0),
+        ]
+    )
+    handles[1].signal.assert_called_once_with("update_progress_batch", expected_batch)
+
+
+async def test_progress_batcher_should_batch_concurrent_activities() -> None:
+    # Given
+    handle = _mock_wf_handle()
+    batcher = ProgressBatcher(flush_interval_s=60.0, linger_s=0.05)
+
+    async def act(activity_id: str) -> None:
+        reporter = ProgressReporter(batcher, handle, activity_id, run_id="run-id")
+        async with batcher:
+            reporter.report(0.0, force=True)
+            await asyncio.sleep(0)
+            reporter.report(1.0, force=True)
+
+    # When
+    await asyncio.gather(act("act-0"), act("act-1"))
+    # Then
+    expected_reported = [
+        [("act-0", 0.0), ("act-1", 0.0), ("act-0", 1.0), ("act-1", 1.0)]
+    ]
+    assert _reported(handle) == expected_reported
+
+
+async def test_progress_batcher_should_not_supersede_forced_progress() -> None:
+    # Given
+    handle = _mock_wf_handle()
+    batcher = ProgressBatcher(flush_interval_s=60.0)
+    reporter = ProgressReporter(batcher, handle, "act-0", run_id="run-id")
+    # When
+    async with batcher:
+        await reporter.progress(0.1)
+        await reporter.progress(0.2, force=True)
+        await reporter.progress(0.3)
+        await reporter.progress(0.4)
+        await reporter.progress(1.0, force=True)
+    # Then
+    assert _reported(handle) == [[("act-0", 0.2), ("act-0", 1.0)]]
+
+
+async def test_progress_batcher_should_retry_failed_batches() -> None:
+    # Given
+    handle = _mock_wf_handle()
+    handle.signal.side_effect = [RuntimeError("signal failed"), None, None]
+    batcher = ProgressBatcher(flush_interval_s=60.0)
+    reporter = ProgressReporter(batcher, handle, "act-0", run_id="run-id")
+    # When
+    async with batcher:
+        await reporter.progress(0.0, force=True)
+        await batcher.flushed()
+        await reporter.progress(1.0, force=True)
+    # Then
+    assert _reported(handle) == [[("act-0", 0.0)], [("act-0", 0.0)], [("act-0", 1.0)]]
+
+
+async def test_progress_batcher_should_give_up_on_failing_batches() -> None:
+    # Given
+    handle = _mock_wf_handle()
+    handle.signal.side_effect = RuntimeError("signal failed")
+    batcher = ProgressBatcher(flush_interval_s=60.0)
+    reporter = ProgressReporter(batcher, handle, "act-0", run_id="run-id")
+    # When
+    async with batcher:
+        await reporter.progress(1.0, force=True)
+    # Then
+    assert _reported(handle) == [[("act-0", 1.0)]] * _MAX_SIGNAL_ATTEMPTS
+
+
+async def test_progress_batcher_should_flush_periodically() -> None:
+    # Given
+    handle = _mock_wf_handle()
+    batcher = ProgressBatcher(flush_interval_s=0.01)
+    reporter = ProgressReporter(batcher, handle, "act-0", run_id="run-id")
+    # When
+    async with batcher:
+        await reporter.progress(0.1)
+        await reporter.progress(0.2)
+        await asyncio.sleep(0.1)
+        reported = _reported(handle)
+    # Then
+    assert reported == [[("act-0", 0.2)]]
+
+
+async def test_progress_batcher_should_not_block_sync_reporters() -> None:
+    # Given
+    loop = asyncio.get_running_loop()
+    can_signal = asyncio.Event()
+
+    async def slow_signal(*_: Any) -> None:
+        await can_signal.wait()
+
+    handle = _mock_wf_handle()
+    handle.signal.side_effect = slow_signal
+    batcher = ProgressBatcher(flush_interval_s=60.0)
+    reporter = ProgressReporter(batcher, handle, "act-0", run_id="run-id")
+
+    def sync_act() -> None:
+        for i in range(10):
+            reporter.sync_progress(i / 10, loop, force=True)
+
+    # When
+    async with batcher:
+        with ThreadPoolExecutor(1) as executor:
+            # Would time out if the thread waited for signals to be sent
+            await asyncio.wait_for(loop.run_in_executor(executor, sync_act), 1.0)
+        can_signal.set()
+    # Then
+    assert _reported(handle)[-1][-1] == ("act-0", 0.9)
+
+
+def test_convert_args() -> None:
+    # Given
+    arg_types = ActivityMetadata.from_activity(_ProgressAct.hello_async_act).arg_types
+    typed = ProgressArg(name="typed")
+    extra = PYDANTIC_DATA_CONVERTER.payload_converter.to_payload("extra")
+    # When
+    from_json = _convert_args([{"name": "json"}], arg_types)
+    from_typed = _convert_args([typed, extra], arg_types)
+    # Then
+    assert from_json == [ProgressArg(name="json")]
+    assert from_typed == [typed, "extra"]
+    assert from_typed[0] is typed
+
+
+def test_convert_args_should_raise_fatal_error_for_invalid_args() -> None:
+    # Given
+    arg_types = ActivityMetadata.from_activity(_ProgressAct.hello_async_act).arg_types
+    # When/Then
+    with pytest.raises(temporalio_exceptions.ApplicationError) as ctx:
+        _convert_args([{"not_a_name": "json"}], arg_types)
+    assert ctx.value.non_retryable
+
+
+def test_activities_metadata() -> None:
+    # Given
+    activities = [
+        _ProgressAct.hello_async_act,
+        _ProgressAct.hello_sync_act,
+        sleep_for_act,
+    ]
+    # When
+    metadata = activities_metadata(activities)
+    # Then
+    expected = {
+        "hello-async": ActivityMetadata(
+            is_async=True,
+            supports_progress=True,
+            progress_weight=5.0,
+            arg_types=[ProgressArg, str | None],
+        ),
+        "hello-sync": ActivityMetadata(
+            is_async=False,
+            supports_progress=True,
+            progress_weight=1.0,
+            arg_types=[ProgressArg],
+        ),
+        "sleep-for-act": ActivityMetadata(is_async=True, supports_progress=False),
+    }
+    assert metadata == expected
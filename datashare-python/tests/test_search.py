@@ -0,0 +1,49 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from datashare_python.conftest import TEST_PROJECT
+from datashare_python.objects import Document
+from datashare_python.search import sliced_search_pages
+from icij_common.es import HITS, ID_, ESClient, match_all_query
+
+
+@pytest.mark.parametrize("n_slices", [1, 3])
+async def test_sliced_search_pages(
+    populate_es: list[Document], test_es_client: ESClient, n_slices: int
+) -> None:
+    # Given
+    es_client = test_es_client
+    body = match_all_query()
+    # When
+    pages = sliced_search_pages(
+        es_client, index=TEST_PROJECT, body=body, n_slices=n_slices, size=1
+    )
+    doc_ids = [hit[ID_] async for page in pages for hit in page[HITS][HITS]]
+    # Then
+    assert sorted(doc_ids) == sorted(d.id for d in populate_es)
+
+
+async def test_sliced_search_pages_should_close_pit_on_error() -> None:
+    # Given
+    es_client = MagicMock()
+    es_client.keep_alive = "1m"
+    es_client.open_point_in_time = AsyncMock(return_value={"id": "some-pit"})
+    es_client.close_point_in_time = AsyncMock()
+
+    async def _failing_pages(**kwargs):  # noqa: ANN202, ARG001
+        yield {HITS: {HITS: []}}
+        raise ValueError("search failed")
+
+    es_client.poll_search_pages = MagicMock(side_effect=_failing_pages)
+    # When
+    pages = sliced_search_pages(
+        es_client, index=TEST_PROJECT, body=match_all_query(), n_slices=2
+    )
+    with pytest.raises(ValueError, match="search failed"):
+        async for _ in pages:
+            pass
+    # Then
+    es_client.close_point_in_time.assert_awaited_once_with(body={"id": "some-pit"})
+    slices = [c.kwargs["body"]["slice"] for c in es_client.poll_search_pages.mock_calls]
+    assert slices == [{"id": 0, "max": 2}, {"id": 1, "max": 2}]
+    assert all("index" not in c.kwargs for c in es_client.poll_search_pages.mock_calls)
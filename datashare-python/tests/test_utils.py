@@ -1,9 +1,13 @@
 import asyncio
+import contextlib
 import fcntl
 import json
 import os
+import threading
+import time
 import uuid
-from concurrent.futures import ProcessPoolExecutor
+from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
 from pathlib import Path
 from typing import ClassVar
@@ -21,11 +25,19 @@ from datashare_python.objects import (
 from datashare_python.types_ import TemporalClient
 from datashare_python.utils import (
     _LOCKED,
+    BytesBoundedQueue,
     SharedResources,
     activity_defn,
     artifact_lock,
+    async_artifact_lock,
+    async_write_artifact,
+    iterate_in_thread,
+    merge_async_iterables,
     positional_args_only,
+    prefetch,
+    publish_and_consume,
     write_artifact,
+    write_artifacts,
 )
 from datashare_python.worker import datashare_worker
 from temporalio import activity, workflow
@@ -314,6 +326,163 @@ def test_overwrite_artifact(tmp_path: Path) -> None:
     assert artifact_path.read_bytes() == b"second"
 
 
+async def test_async_write_artifact(tmp_path: Path) -> None:
+    from datashare_python.conftest import TEST_PROJECT  # noqa: PLC0415
+
+    # Given
+    args = MockedArgs(some_value="value")
+    root_dir = Path(tmp_path)
+    artifact_bytes = b"artifacts"
+    manifest_entry = MockedManifestEntry.complete(args)
+    artifact = MockedArtifact(
+        project=TEST_PROJECT,
+        doc_id="doc_id",
+        artifact=artifact_bytes,
+        manifest_entry=manifest_entry,
+    )
+    # When
+    artifact_path = await async_write_artifact(root_dir, artifact)
+    # Then
+    expected_artifact_path = (
+        Path(TEST_PROJECT) / "do" / "c_" / "doc_id" / "mocked-structure"
+    )
+    assert artifact_path == expected_artifact_path
+    artifact_dir = (root_dir / artifact_path).parent
+    manifest = json.loads((artifact_dir / "manifest.json").read_text())
+    expected_manifest = {
+        "structure": {
+            "status": "complete",
+            "taskInput": {"someValue": "value"},
+            "label": None,
+        }
+    }
+    assert manifest == expected_manifest
+    assert (artifact_dir / "mocked-structure").read_bytes() == artifact_bytes
+    assert not (artifact_dir / f"{MANIFEST_JSON}.lock").exists()
+
+
+async def test_async_write_artifact_concurrent_writers(tmp_path: Path) -> None:
+    from datashare_python.conftest import TEST_PROJECT  # noqa: PLC0415
+
+    # Given
+    args = MockedArgs(some_value="value")
+    root_dir = Path(tmp_path)
+    manifest_entry = MockedManifestEntry.complete(args)
+    n_docs = 20
+    artifacts = [
+        MockedArtifact(
+            project=TEST_PROJECT,
+            doc_id=f"doc-{i % 5}",
+            artifact=f"artifact-{i}".encode(),
+            manifest_entry=manifest_entry,
+        )
+        for i in range(n_docs)
+    ]
+    # When
+    paths = await asyncio.gather(
+        *(async_write_artifact(root_dir, a) for a in artifacts)
+    )
+    # Then
+    assert len(set(paths)) == 5
+    for path in set(paths):
+        artifact_dir = (root_dir / path).parent
+        manifest = json.loads((artifact_dir / "manifest.json").read_text())
+        assert manifest["structure"]["status"] == "complete"
+        assert (artifact_dir / "mocked-structure").read_bytes().startswith(b"artifact-")
+
+
+class OtherMockedArtifact(DocArtifact):
+    filename: ClassVar[str] = "other-mocked-structure"
+    type: ClassVar[ArtifactType] = ArtifactType.PASSPORTS
+
+
+def test_write_artifacts(tmp_path: Path) -> None:
+    from datashare_python.conftest import TEST_PROJECT  # noqa: PLC0415
+
+    # Given
+    args = MockedArgs(some_value="value")
+    root_dir = Path(tmp_path)
+    manifest_entry = MockedManifestEntry.complete(args)
+    artifacts = [
+        MockedArtifact(
+            project=TEST_PROJECT,
+            doc_id="doc-0",
+            artifact=b"doc-0",
+            manifest_entry=manifest_entry,
+        ),
+        MockedArtifact(
+            project=TEST_PROJECT,
+            doc_id="doc-1",
+            artifact=b"doc-1",
+            manifest_entry=manifest_entry,
+        ),
+        OtherMockedArtifact(
+            project=TEST_PROJECT,
+            doc_id="doc-0",
+            artifact=b"other-doc-0",
+            manifest_entry=manifest_entry,
+        ),
+    ]
+    # When
+    paths = write_artifacts(root_dir, artifacts)
+    # Then
+    doc_0_dir = Path(TEST_PROJECT) / "do" / "c-" / "doc-0"
+    doc_1_dir = Path(TEST_PROJECT) / "do" / "c-" / "doc-1"
+    expected_paths = [
+        doc_0_dir / "mocked-structure",
+        doc_1_dir / "mocked-structure",
+        doc_0_dir / "other-mocked-structure",
+    ]
+    assert paths == expected_paths
+    for path, artifact in zip(paths, artifacts, strict=True):
+        assert (root_dir / path).read_bytes() == artifact.artifact
+    entry = {"status": "complete", "taskInput": {"someValue": "value"}, "label": None}
+    doc_0_manifest = json.loads((root_dir / doc_0_dir / MANIFEST_JSON).read_text())
+    assert doc_0_manifest == {"structure": entry, "passports": entry}
+    doc_1_manifest = json.loads((root_dir / doc_1_dir / MANIFEST_JSON).read_text())
+    assert doc_1_manifest == {"structure": entry}
+    leftovers = [
+        p.name for p in (root_dir / doc_0_dir).iterdir() if p.name.startswith(".")
+    ]
+    assert not leftovers
+    assert not (root_dir / doc_0_dir / f"{MANIFEST_JSON}.lock").exists()
+
+
+def test_write_artifact_failure_leaves_manifest_untouched(tmp_path: Path) -> None:
+    from datashare_python.conftest import TEST_PROJECT  # noqa: PLC0415
+
+    # Given
+    args = MockedArgs(some_value="value")
+    root_dir = Path(tmp_path)
+    existing = MockedArtifact(
+        project=TEST_PROJECT,
+        doc_id="doc_id",
+        artifact=b"existing",
+        manifest_entry=MockedManifestEntry.partial(args),
+    )
+    artifact_path = write_artifact(root_dir, existing)
+    artifact_dir = (root_dir / artifact_path).parent
+    manifest_before = (artifact_dir / MANIFEST_JSON).read_text()
+    overwrite = MockedArtifact(
+        project=TEST_PROJECT,
+        doc_id="doc_id",
+        artifact=b"new",
+        manifest_entry=MockedManifestEntry.complete(args),
+    )
+    broken = OtherMockedArtifact(
+        project=TEST_PROJECT,
+        doc_id="doc_id",
+        artifact=tmp_path / "missing-file",
+        manifest_entry=MockedManifestEntry.complete(args),
+    )
+    # When
+    with pytest.raises(FileNotFoundError):
+        write_artifacts(root_dir, [overwrite, broken])
+    # Then
+    assert (artifact_dir / MANIFEST_JSON).read_text() == manifest_before
+    assert not [p for p in artifact_dir.iterdir() if p.name.endswith(".tmp")]
+
+
 def _acquire_lock(artifact_dir: Path, timeout_ms: int) -> str:
     with artifact_lock(artifact_dir, timeout_ms):
         return "acquired"
@@ -348,6 +517,48 @@ def test_artifact_lock_file_is_freed(tmp_path: Path) -> None:
     assert not lock_path.exists()
 
 
+async def _async_acquire_lock(artifact_dir: Path, timeout_ms: int) -> str:
+    async with async_artifact_lock(artifact_dir, timeout_ms):
+        return "acquired"
+
+
+def _run_async_acquire_lock(artifact_dir: Path, timeout_ms: int) -> str:
+    return asyncio.run(_async_acquire_lock(artifact_dir, timeout_ms))
+
+
+def test_async_artifact_lock_file(tmp_path: Path) -> None:
+    # Given
+    timeout_ms = 100
+    artifact_dir = Path(tmp_path)
+    lock_path = artifact_dir / f"{MANIFEST_JSON}.lock"
+    fd = os.open(lock_path, os.O_CREAT | os.O_WRONLY)
+    pool = ProcessPoolExecutor(max_workers=1)
+    # When
+    with pool:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        f = pool.submit(_run_async_acquire_lock, artifact_dir, timeout_ms)
+    # Then
+    expected = "failed to acquire lock"
+    with pytest.raises(TimeoutError, match=expected):
+        f.result()
+
+
+async def test_async_artifact_lock_does_not_block_other_dirs(tmp_path: Path) -> None:
+    # Given
+    timeout_ms = 100
+    locked_dir = tmp_path / "locked"
+    locked_dir.mkdir()
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    # When
+    async with async_artifact_lock(locked_dir, timeout_ms):
+        acquired_other = await _async_acquire_lock(other_dir, timeout_ms)
+        # Then
+        assert acquired_other == "acquired"
+        with pytest.raises(TimeoutError, match="failed to acquire lock"):
+            await _async_acquire_lock(locked_dir, timeout_ms)
+
+
 async def _sleep_with_lock(
     sleep_s: int, artifact_dir: Path, *, timeout_ms: int
 ) -> None:
@@ -408,3 +619,338 @@ def test_get_or_cache_eviction_callback_is_called_on_exit() -> None:
         shared.get_or_cache_resource(key, factory)
     # Then
     eviction_callback.assert_called_once_with(key, "value")
+
+
+def test_get_or_cache_resource_should_load_once_for_concurrent_callers() -> None:
+    # Given
+    shared = SharedResources()
+    n_callers = 4
+    barrier = threading.Barrier(n_callers)
+    n_loads = 0
+
+    def factory() -> str:
+        nonlocal n_loads
+        n_loads += 1
+        time.sleep(0.1)
+        return uuid.uuid4().hex
+
+    def get() -> str:
+        barrier.wait(timeout=1.0)
+        return shared.get_or_cache_resource("k", factory)
+
+    # When
+    with ThreadPoolExecutor(n_callers) as executor:
+        values = list(executor.map(lambda _: get(), range(n_callers)))
+    # Then
+    assert n_loads == 1
+    assert len(set(values)) == 1
+
+
+def test_get_or_cache_resource_should_timeout_waiting_for_load() -> None:
+    # Given
+    shared = SharedResources()
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_factory() -> str:
+        loading.set()
+        release.wait(timeout=1.0)
+        return "value"
+
+    # When
+    with ThreadPoolExecutor(1) as executor:
+        loaded = executor.submit(shared.get_or_cache_resource, "k", slow_factory)
+        loading.wait(timeout=1.0)
+        try:
+            # Then
+            with pytest.raises(TimeoutError):
+                shared.get_or_cache_resource("k", slow_factory, load_timeout_s=0.01)
+        finally:
+            release.set()
+        assert loaded.result() == "value"
+
+
+async def test_async_get_or_cache_resource_should_load_once() -> None:
+    # Given
+    shared = SharedResources()
+    n_loads = 0
+
+    async def factory() -> str:
+        nonlocal n_loads
+        n_loads += 1
+        await asyncio.sleep(0.01)
+        return uuid.uuid4().hex
+
+    # When
+    values = await asyncio.gather(
+        *(shared.async_get_or_cache_resource("k", factory) for _ in range(5))
+    )
+    # Then
+    assert n_loads == 1
+    assert len(set(values)) == 1
+
+
+async def test_async_get_or_cache_resource_should_propagate_loading_error() -> None:
+    # Given
+    shared = SharedResources()
+    release = asyncio.Event()
+
+    async def failing_factory() -> str:
+        await release.wait()
+        raise ValueError("failed to load")
+
+    async def factory() -> str:
+        return "value"
+
+    # When
+    loading = asyncio.create_task(
+        shared.async_get_or_cache_resource("k", failing_factory)
+    )
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(shared.async_get_or_cache_resource("k", factory))
+    await asyncio.sleep(0)
+    release.set()
+    # Then
+    for task in (loading, waiting):
+        with pytest.raises(ValueError, match="failed to load"):
+            await task
+    # Errors aren't cached
+    assert await shared.async_get_or_cache_resource("k", factory) == "value"
+
+
+async def test_async_get_or_cache_resource_should_retry_cancelled_load() -> None:
+    # Given
+    shared = SharedResources()
+
+    async def never_loading_factory() -> str:
+        await asyncio.Event().wait()
+
+    async def factory() -> str:
+        return "value"
+
+    # When
+    loading = asyncio.create_task(
+        shared.async_get_or_cache_resource("k", never_loading_factory)
+    )
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(shared.async_get_or_cache_resource("k", factory))
+    await asyncio.sleep(0)
+    loading.cancel()
+    # Then
+    assert await waiting == "value"
+
+
+async def test_publish_and_consume_with_consumers_pool() -> None:
+    # Given
+    queue = asyncio.Queue(maxsize=2)
+    n_consumers = 3
+
+    async def publish() -> int:
+        for i in range(10):
+            await queue.put(i)
+        return 10
+
+    async def consume() -> list[int]:
+        consumed = []
+        while (item := await queue.get()) is not None:
+            consumed.append(item)
+            # Simulate some IO to let other consumers pick items
+            await asyncio.sleep(0.01)
+        return consumed
+
+    publisher = asyncio.create_task(publish())
+    consumers = [asyncio.create_task(consume()) for _ in range(n_consumers)]
+    # When
+    n_published, consumed = await publish_and_consume(
+        publisher, lambda: queue.put(None), consumers=consumers
+    )
+    # Then
+    assert n_published == 10
+    assert len(consumed) == n_consumers
+    assert all(c for c in consumed)
+    assert sorted(i for c in consumed for i in c) == list(range(10))
+
+
+async def test_publish_and_consume_should_raise_consumer_error() -> None:
+    # Given
+    queue = asyncio.Queue(maxsize=1)
+
+    async def publish() -> None:
+        for i in range(10):
+            await queue.put(i)
+
+    async def consume() -> None:
+        while (item := await queue.get()) is not None:
+            if item == 3:
+                raise ValueError("consumer failed")
+
+    publisher = asyncio.create_task(publish())
+    consumers = [asyncio.create_task(consume()) for _ in range(2)]
+    # When/Then
+    with pytest.raises(ValueError, match="consumer failed"):
+        await publish_and_consume(
+            publisher, lambda: queue.put(None), consumers=consumers
+        )
+    assert publisher.cancelled()
+    assert all(c.done() for c in consumers)
+
+
+async def test_iterate_in_thread() -> None:
+    # Given
+    consumed = threading.Event()
+
+    def produce() -> Generator[int, None, None]:
+        yield 0
+        # Make sure items are streamed before the iterable is exhausted
+        assert consumed.wait(timeout=1.0)
+        yield 1
+
+    # When
+    items = []
+    async for item in iterate_in_thread(produce(), max_buffered=1):
+        items.append(item)
+        consumed.set()
+    # Then
+    assert items == [0, 1]
+
+
+async def test_iterate_in_thread_should_raise_producer_error() -> None:
+    # Given
+    def produce() -> Generator[int, None, None]:
+        yield 0
+        raise ValueError("producer failed")
+
+    items = []
+
+    async def consume() -> None:
+        async for item in iterate_in_thread(produce()):
+            items.append(item)
+
+    # When/Then
+    with pytest.raises(ValueError, match="producer failed"):
+        await consume()
+    assert items == [0]
+
+
+async def test_iterate_in_thread_should_stop_producer_on_exit() -> None:
+    # Given
+    produced = []
+
+    def produce() -> Generator[int, None, None]:
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    # When
+    async with contextlib.aclosing(iterate_in_thread(produce())) as items:
+        async for item in items:
+            if item == 1:
+                break
+    # Then
+    assert len(produced) < 100
+
+
+async def test_prefetch_should_run_ahead_of_consumer() -> None:
+    # Given
+    produced = []
+
+    async def produce() -> AsyncGenerator[int, None]:
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    # When
+    async with contextlib.aclosing(prefetch(produce(), max_buffered=2)) as items:
+        first = await anext(items)
+        await asyncio.sleep(0.01)
+        # Then
+        assert first == 0
+        # 2 items are buffered, a third one is waiting to be put in the queue
+        assert produced == [0, 1, 2, 3]
+
+
+async def test_prefetch_should_raise_producer_error() -> None:
+    # Given
+    async def produce() -> AsyncGenerator[int, None]:
+        yield 0
+        raise ValueError("producer failed")
+
+    items = []
+
+    async def consume() -> None:
+        async for item in prefetch(produce()):
+            items.append(item)
+
+    # When/Then
+    with pytest.raises(ValueError, match="producer failed"):
+        await consume()
+    assert items == [0]
+
+
+async def test_bytes_bounded_queue_should_block_until_room_is_available() -> None:
+    # Given
+    queue = BytesBoundedQueue(max_size_bytes=10, size_fn=len)
+    await queue.put("a" * 6)
+
+    # When
+    put = asyncio.create_task(queue.put("b" * 6))
+    await asyncio.sleep(0.01)
+
+    # Then
+    assert not put.done()
+    assert queue.qsize() == 1
+    assert await queue.get() == "a" * 6
+    await asyncio.wait_for(put, timeout=1.0)
+    assert queue.size_bytes == 6
+    assert queue.n_blocked_puts == 1
+    assert queue.blocked_s > 0
+    assert queue.max_depth == 1
+    assert queue.max_size_bytes_reached == 6
+
+
+async def test_bytes_bounded_queue_should_accept_oversized_item_when_empty() -> None:
+    # Given
+    queue = BytesBoundedQueue(max_size_bytes=10, size_fn=len)
+
+    # When
+    await asyncio.wait_for(queue.put("a" * 20), timeout=1.0)
+    await queue.put(None)
+
+    # Then
+    assert queue.qsize() == 2
+    assert await queue.get() == "a" * 20
+    assert await queue.get() is None
+    assert queue.n_blocked_puts == 0
+
+
+async def test_merge_async_iterables() -> None:
+    # Given
+    async def produce(start: int) -> AsyncGenerator[int, None]:
+        for i in range(start, start + 3):
+            await asyncio.sleep(0)
+            yield i
+
+    # When
+    merged = [i async for i in merge_async_iterables([produce(0), produce(10)])]
+
+    # Then
+    assert sorted(merged) == [0, 1, 2, 10, 11, 12]
+    assert [i for i in merged if i < 10] == [0, 1, 2]
+    assert [i for i in merged if i >= 10] == [10, 11, 12]
+
+
+async def test_merge_async_iterables_should_raise_producer_error() -> None:
+    # Given
+    async def produce() -> AsyncGenerator[int, None]:
+        yield 0
+        raise ValueError("producer failed")
+
+    async def never_ending() -> AsyncGenerator[int, None]:
+        while True:
+            await asyncio.sleep(0.01)
+            yield 1
+
+    # When/Then
+    with pytest.raises(ValueError, match="producer failed"):
+        async for _ in merge_async_iterables([produce(), never_ending()]):
+            pass
@@ -5,6 +5,8 @@ from functools import partial
 from typing import TYPE_CHECKING
 
 from aiostream.stream import chain
+from datashare_python.config import BulkIndexingConfig
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import Document, Language, Translation
 from datashare_python.types_ import AsyncProgressRateHandler
 from datashare_python.utils import (
@@ -13,7 +15,6 @@ from datashare_python.utils import (
     to_raw_async_progress,
     to_scaled_async_progress,
 )
-from elasticsearch._async.helpers import async_bulk
 from icij_common.es import (
     BOOL,
     COUNT,
@@ -37,7 +38,7 @@ from icij_common.es import (
 from icij_common.iter_utils import async_batches, batches, before_and_after, once
 from temporalio import activity
 
-from worker_template.dependencies import lifespan_es_client
+from worker_template.dependencies import lifespan_es_client, lifespan_worker_config
 
 if TYPE_CHECKING:
     from transformers import Pipeline
@@ -96,12 +97,14 @@ class TranslateDocs(ActivityWithProgress):
         progress: AsyncProgressRateHandler | None = None,
     ) -> int:
         es_client = lifespan_es_client()
+        bulk_config = lifespan_worker_config().elasticsearch.bulk
         return await translate_docs(
             docs,
             target_language=target_language,
             project=project,
             es_client=es_client,
             config=config,
+            bulk_config=bulk_config,
             progress=progress,
         )
 
@@ -118,12 +121,14 @@ class ClassifyDocs(ActivityWithProgress):
         progress: AsyncProgressRateHandler | None = None,
     ) -> int:
         es_client = lifespan_es_client()
+        bulk_config = lifespan_worker_config().elasticsearch.bulk
         return await classify_docs(
             docs,
             classified_language=classified_language,
             project=project,
             es_client=es_client,
             config=config,
+            bulk_config=bulk_config,
             progress=progress,
         )
 
@@ -202,12 +207,15 @@ async def translate_docs(
     es_client: ESClient | None = None,
     progress: AsyncProgressRateHandler | None = None,  # noqa: F821
     config: TranslationConfig | None = None,
+    bulk_config: BulkIndexingConfig | None = None,
 ) -> int:
     import torch  # noqa:PLC0415
     from transformers import pipeline  # noqa: PLC0415
 
     if config is None:
         config = TranslationConfig()
+    if bulk_config is None:
+        bulk_config = BulkIndexingConfig()
 
     n_docs = len(docs)
     if not n_docs:
@@ -224,42 +232,43 @@ async def translate_docs(
     pipe = None
     # We batch the data ourselves, ideally, we should use an async version of:
     # https://huggingface.co/docs/datasets/v3.1.0/en/package_reference/main_classes#datasets.Dataset.from_generator
-    for batch in batches(docs, batch_size=config.batch_size):
-        if not batch:
-            continue
-        batch_docs = []
-        async for page in es_client.poll_search_pages(
-            body={QUERY: has_id(batch)},
-            _source_includes=_TRANSLATION_DOC_SOURCES,
-        ):
-            batch_docs.extend(Document.from_es(doc) for doc in page[HITS][HITS])
-        if pipe is None:
-            source_language = batch_docs[0].language
-            kwargs = config.to_pipeline_args(
-                source_language, target_language=target_language
-            )
-            pipe = pipeline(device=device, **kwargs)
-        # Load the classification pipeline
-        contents = [d.content for d in batch_docs]
-        translations = await asyncio.to_thread(_translate_as_list, pipe, contents)
-        translations = [
-            Translation(
-                source_language=source_language,
+    async with bulk_config.to_bulk_indexer(es_client) as indexer:
+        for batch in batches(docs, batch_size=config.batch_size):
+            if not batch:
+                continue
+            batch_docs = []
+            async for page in es_client.poll_search_pages(
+                body={QUERY: has_id(batch)},
+                _source_includes=_TRANSLATION_DOC_SOURCES,
+            ):
+                batch_docs.extend(Document.from_es(doc) for doc in page[HITS][HITS])
+            if pipe is None:
+                source_language = batch_docs[0].language
+                kwargs = config.to_pipeline_args(
+                    source_language, target_language=target_language
+                )
+                pipe = pipeline(device=device, **kwargs)
+            # Load the classification pipeline
+            contents = [d.content for d in batch_docs]
+            translations = await asyncio.to_thread(_translate_as_list, pipe, contents)
+            translations = [
+                Translation(
+                    source_language=source_language,
+                    target_language=target_language,
+                    translator=kwargs["model"],
+                    content=t,
+                )
+                for t in translations
+            ]
+            await _add_translation(
+                indexer,
+                zip(batch_docs, translations, strict=False),
+                project,
                 target_language=target_language,
-                translator=kwargs["model"],
-                content=t,
             )
-            for t in translations
-        ]
-        await _add_translation(
-            es_client,
-            zip(batch_docs, translations, strict=False),
-            project,
-            target_language=target_language,
-        )
-        seen += len(batch)
-        if progress is not None:
-            await progress(seen)
+            seen += len(batch)
+            if progress is not None:
+                await progress(seen)
     # Return the number of classified documents
     return n_docs
 
@@ -275,12 +284,15 @@ async def classify_docs(
     config: ClassificationConfig | None = None,
     progress: AsyncProgressRateHandler | None = None,
     es_client: ESClient,
+    bulk_config: BulkIndexingConfig | None = None,
 ) -> int:
     import torch  # noqa: PLC0415
     from transformers import pipeline  # noqa: PLC0415
 
     if config is None:
         config = ClassificationConfig()
+    if bulk_config is None:
+        bulk_config = BulkIndexingConfig()
     # TODO: fix this, we should have a ClassificationConfig hered
 
     n_docs = len(docs)
@@ -299,35 +311,38 @@ async def classify_docs(
     seen = 0
     # We batch the data ourselves, ideally, we should use an async version of:
     # https://huggingface.co/docs/datasets/v3.1.0/en/package_reference/main_classes#datasets.Dataset.from_generator
-    for batch in batches(docs, batch_size=config.batch_size):
-        batch_length = len(batch)
-        batch_docs = []
-        async for page in es_client.poll_search_pages(
-            body={QUERY: has_id(batch)},
-            _source_includes=_CLASSIF_DOC_SOURCES,
-        ):
-            batch_docs.extend([Document.from_es(doc) for doc in page[HITS][HITS]])
-        contents = (_get_language_content(d, classified_language) for d in batch_docs)
-        batch_docs, contents = zip(
-            *(
-                (d, c)
-                for d, c in zip(batch_docs, contents, strict=False)
-                if c is not None
-            ),
-            strict=False,
-        )
-        batch_docs = tuple(batch_docs)
-        # Offload CPU bound computation to a thread to avoid blocking the IO loop,
-        # classification will happen in numpy/python (outside of Python's GIL reach)
-        labels = await asyncio.to_thread(_classify_as_list, pipe, list(contents))
-        # We add the classification results by updating the documents with new tags,
-        # this could also be done using: https://github.com/ICIJ/datashare-tarentula
-        await _add_classification_tags(
-            es_client, zip(batch_docs, labels, strict=False), project, model=model
-        )
-        seen += batch_length
-        if progress is not None:
-            await progress(seen)
+    async with bulk_config.to_bulk_indexer(es_client) as indexer:
+        for batch in batches(docs, batch_size=config.batch_size):
+            batch_length = len(batch)
+            batch_docs = []
+            async for page in es_client.poll_search_pages(
+                body={QUERY: has_id(batch)},
+                _source_includes=_CLASSIF_DOC_SOURCES,
+            ):
+                batch_docs.extend([Document.from_es(doc) for doc in page[HITS][HITS]])
+            contents = (
+                _get_language_content(d, classified_language) for d in batch_docs
+            )
+            batch_docs, contents = zip(
+                *(
+                    (d, c)
+                    for d, c in zip(batch_docs, contents, strict=False)
+                    if c is not None
+                ),
+                strict=False,
+            )
+            batch_docs = tuple(batch_docs)
+            # Offload CPU bound computation to a thread to avoid blocking the IO loop,
+            # classification will happen in numpy/python (outside of Python's GIL reach)
+            labels = await asyncio.to_thread(_classify_as_list, pipe, list(contents))
+            # We add the classification results by updating the documents with new tags,
+            # this could also be done using: https://github.com/ICIJ/datashare-tarentula
+            await _add_classification_tags(
+                indexer, zip(batch_docs, labels, strict=False), project, model=model
+            )
+            seen += batch_length
+            if progress is not None:
+                await progress(seen)
     # Return the number of classified documents
     return n_docs
 
@@ -374,7 +389,7 @@ ctx._source.{DOC_CONTENT_TRANSLATED}.add(params.translation);
 
 
 async def _add_translation(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     translations: Iterable[tuple[Document, Translation]],
     project: str,
     *,
@@ -397,7 +412,7 @@ async def _add_translation(
         }
         for doc, translation in translations
     )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    await indexer.bulk(actions)
 
 
 def _untranslated_query(target_language: str) -> dict:
@@ -466,7 +481,7 @@ if( !ctx._source.tags.contains(params.tag) ) {
 
 
 async def _add_classification_tags(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     tags: Iterable[tuple[Document, str]],
     project: str,
     *,
@@ -486,7 +501,7 @@ async def _add_classification_tags(
         )
         for doc, label in tags
     )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    await indexer.bulk(actions)
 
 
 def _unclassified_query(model: str, language: str) -> dict:
@@ -2,6 +2,8 @@ import asyncio
 import logging
 from collections.abc import AsyncGenerator, Generator, Iterable
 
+from datashare_python.config import BulkIndexingConfig
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import Document, Translation
 from datashare_python.types_ import AsyncProgressRateHandler
 from datashare_python.utils import (
@@ -10,7 +12,6 @@ from datashare_python.utils import (
     to_raw_async_progress,
     to_scaled_async_progress,
 )
-from elasticsearch._async.helpers import async_bulk
 from icij_common.es import (
     BOOL,
     DOC_CONTENT,
@@ -143,11 +144,14 @@ async def classify_docs(
     config: ClassificationConfig | None = None,
     progress: AsyncProgressRateHandler | None = None,
     es_client: ESClient,
+    bulk_config: BulkIndexingConfig | None = None,
 ) -> int:
     import torch  # noqa: PLC0415
 
     if config is None:
         config = ClassificationConfig()
+    if bulk_config is None:
+        bulk_config = BulkIndexingConfig()
     # TODO: fix this, we should have a ClassificationConfig hered
     if not isinstance(config, ClassificationConfig):
         config = ClassificationConfig.model_validate(config)
@@ -168,35 +172,38 @@ async def classify_docs(
     seen = 0
     # We batch the data ourselves, ideally, we should use an async version of:
     # https://huggingface.co/docs/datasets/v3.1.0/en/package_reference/main_classes#datasets.Dataset.from_generator
-    for batch in batches(docs, batch_size=config.batch_size):
-        batch_length = len(batch)
-        batch_docs = []
-        async for page in es_client.poll_search_pages(
-            body={QUERY: has_id(batch)},
-            _source_includes=_CLASSIF_DOC_SOURCES,
-        ):
-            batch_docs.extend([Document.from_es(doc) for doc in page[HITS][HITS]])
-        contents = (_get_language_content(d, classified_language) for d in batch_docs)
-        batch_docs, contents = zip(
-            *(
-                (d, c)
-                for d, c in zip(batch_docs, contents, strict=False)
-                if c is not None
-            ),
-            strict=False,
-        )
-        batch_docs = tuple(batch_docs)
-        # Offload CPU bound computation to a thread to avoid blocking the IO loop,
-        # classification will happen in numpy/python (outside of Python's GIL reach)
-        labels = await asyncio.to_thread(_classify_as_list, pipe, list(contents))
-        # We add the classification results by updating the documents with new tags,
-        # this could also be done using: https://github.com/ICIJ/datashare-tarentula
-        await _add_classification_tags(
-            es_client, zip(batch_docs, labels, strict=False), project, model=model
-        )
-        seen += batch_length
-        if progress is not None:
-            await progress(seen)
+    async with bulk_config.to_bulk_indexer(es_client) as indexer:
+        for batch in batches(docs, batch_size=config.batch_size):
+            batch_length = len(batch)
+            batch_docs = []
+            async for page in es_client.poll_search_pages(
+                body={QUERY: has_id(batch)},
+                _source_includes=_CLASSIF_DOC_SOURCES,
+            ):
+                batch_docs.extend([Document.from_es(doc) for doc in page[HITS][HITS]])
+            contents = (
+                _get_language_content(d, classified_language) for d in batch_docs
+            )
+            batch_docs, contents = zip(
+                *(
+                    (d, c)
+                    for d, c in zip(batch_docs, contents, strict=False)
+                    if c is not None
+                ),
+                strict=False,
+            )
+            batch_docs = tuple(batch_docs)
+            # Offload CPU bound computation to a thread to avoid blocking the IO loop,
+            # classification will happen in numpy/python (outside of Python's GIL reach)
+            labels = await asyncio.to_thread(_classify_as_list, pipe, list(contents))
+            # We add the classification results by updating the documents with new tags,
+            # this could also be done using: https://github.com/ICIJ/datashare-tarentula
+            await _add_classification_tags(
+                indexer, zip(batch_docs, labels, strict=False), project, model=model
+            )
+            seen += batch_length
+            if progress is not None:
+                await progress(seen)
     # Return the number of classified documents
     return n_docs
 
@@ -228,7 +235,7 @@ if( !ctx._source.tags.contains(params.tag) ) {
 
 
 async def _add_classification_tags(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     tags: Iterable[tuple[Document, Translation]],
     project: str,
     *,
@@ -248,7 +255,7 @@ async def _add_classification_tags(
         )
         for doc, label in tags
     )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    await indexer.bulk(actions)
 
 
 def _unclassified_query(model: str, language: str) -> dict:
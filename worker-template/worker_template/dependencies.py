@@ -1,5 +1,6 @@
 from datashare_python.dependencies import (
     lifespan_es_client,  # noqa: F401
+    lifespan_worker_config,  # noqa: F401
     set_es_client,
     set_loggers,
     set_worker_config,
@@ -3,6 +3,8 @@ from collections.abc import AsyncGenerator, Generator, Iterable
 from functools import partial
 
 from aiostream.stream import chain
+from datashare_python.config import BulkIndexingConfig
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import Document
 from datashare_python.types_ import AsyncProgressRateHandler
 from datashare_python.utils import (
@@ -10,7 +12,6 @@ from datashare_python.utils import (
     activity_defn,
     to_raw_async_progress,
 )
-from elasticsearch._async.helpers import async_bulk
 from icij_common.es import (
     BOOL,
     COUNT,
@@ -122,11 +123,14 @@ async def translate_docs(
     es_client: ESClient | None = None,
     progress: AsyncProgressRateHandler | None = None,  # noqa: F821
     config: TranslationConfig | None = None,
+    bulk_config: BulkIndexingConfig | None = None,
 ) -> int:
     import torch  # noqa:PLC0415
 
     if config is None:
         config = TranslationConfig()
+    if bulk_config is None:
+        bulk_config = BulkIndexingConfig()
 
     # TODO: this should not happen
     if not isinstance(config, TranslationConfig):
@@ -147,31 +151,32 @@ async def translate_docs(
     pipe = None
     # We batch the data ourselves, ideally, we should use an async version of:
     # https://huggingface.co/docs/datasets/v3.1.0/en/package_reference/main_classes#datasets.Dataset.from_generator
-    for batch in batches(docs, batch_size=config.batch_size):
-        batch_docs = []
-        async for page in es_client.poll_search_pages(
-            body={QUERY: has_id(batch)},
-            _source_includes=_TRANSLATION_DOC_SOURCES,
-        ):
-            batch_docs.extend(Document.from_es(doc) for doc in page[HITS][HITS])
-        if pipe is None:
-            source_language = batch_docs[0].language
-            kwargs = config.to_pipeline_args(
-                source_language, target_language=target_language
+    async with bulk_config.to_bulk_indexer(es_client) as indexer:
+        for batch in batches(docs, batch_size=config.batch_size):
+            batch_docs = []
+            async for page in es_client.poll_search_pages(
+                body={QUERY: has_id(batch)},
+                _source_includes=_TRANSLATION_DOC_SOURCES,
+            ):
+                batch_docs.extend(Document.from_es(doc) for doc in page[HITS][HITS])
+            if pipe is None:
+                source_language = batch_docs[0].language
+                kwargs = config.to_pipeline_args(
+                    source_language, target_language=target_language
+                )
+                pipe = pipeline(device=device, **kwargs)
+            # Load the classification pipeline
+            contents = [d.content for d in batch_docs]
+            translations = await asyncio.to_thread(_translate_as_list, pipe, contents)
+            await _add_translation(
+                indexer,
+                zip(batch_docs, translations, strict=False),
+                project,
+                target_language=target_language,
             )
-            pipe = pipeline(device=device, **kwargs)
-        # Load the classification pipeline
-        contents = [d.content for d in batch_docs]
-        translations = await asyncio.to_thread(_translate_as_list, pipe, contents)
-        await _add_translation(
-            es_client,
-            zip(batch_docs, translations, strict=False),
-            project,
-            target_language=target_language,
-        )
-        seen += len(batch)
-        if progress is not None:
-            await progress(seen)
+            seen += len(batch)
+            if progress is not None:
+                await progress(seen)
     # Return the number of classified documents
     return n_docs
 
@@ -217,7 +222,7 @@ ctx._source.content_translated[params.language] = params.translation;
 
 
 async def _add_translation(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     translations: Iterable[tuple[Document, str]],
     project: str,
     *,
@@ -237,7 +242,7 @@ async def _add_translation(
         }
         for doc, translation in translations
     )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    await indexer.bulk(actions)
 
 
 def _untranslated_query(target_language: str) -> dict:
@@ -1,11 +1,12 @@
 import asyncio
 import logging
 from asyncio import AbstractEventLoop
+from collections import defaultdict, deque
 from collections.abc import AsyncGenerator, AsyncIterable, Iterable
 from functools import partial
-from itertools import tee
 from pathlib import Path
 from typing import Annotated, Any, Protocol
+from uuid import uuid4
 
 from aiofile import async_open
 from caul_core import (
@@ -18,11 +19,13 @@ from caul_core import (
     Preprocessor,
     PreprocessorConfig,
 )
+from datashare_python.config import BulkIndexingConfig
 from datashare_python.dependencies import lifespan_es_client, lifespan_worker_config
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import DocRoute, Document
+from datashare_python.search import sliced_search_pages
 from datashare_python.types_ import (
     AsyncProgressRateHandler,
-    RawAsyncProgressHandler,
     SyncProgressRateHandler,
     Weight,
 )
@@ -34,6 +37,7 @@ from datashare_python.utils import (
     config_cache_key,
     debuggable_name,
     enter_cm,
+    iterate_in_thread,
     publish_and_consume,
     read_jsonl_as,
     safe_dir,
@@ -41,8 +45,8 @@ from datashare_python.utils import (
     to_raw_async_progress,
     to_raw_sync_progress,
     write_artifact,
+    write_artifacts,
 )
-from elasticsearch._async.helpers import async_bulk
 from icij_common.es import (
     DOC_CONTENT,
     DOC_CONTENT_TYPE,
@@ -58,15 +62,17 @@ from icij_common.es import (
     and_query,
     has_type,
 )
-from icij_common.iter_utils import async_batches
+from icij_common.iter_utils import async_batches, batches
 from icij_common.pydantic_utils import safe_copy
 
+from .cache import PreprocessedInputsCache, TranscriptsCache, link_or_copy
 from .config import ASRWorkerConfig
 from .constants import (
     INDEX_TRANSCRIPTION_ACTIVITY,
     POSTPROCESS_ACTIVITY,
     PREPROCESS_ACTIVITY,
     RUN_INFERENCE_ACTIVITY,
+    RUN_INFERENCE_WITH_STATS_ACTIVITY,
     SEARCH_AUDIOS_ACTIVITY,
     SUPPORTED_CONTENT_TYPES,
 )
@@ -78,6 +84,7 @@ from .dependencies import (
 from .objects import (
     ASRArgs,
     ASRIndexingConfig,
+    InferenceResponse,
     Transcription,
     TranscriptionArtifact,
     TranscriptionManifestEntry,
@@ -91,6 +98,12 @@ _INDEX_AUDIOS_WEIGHT = _BASE_WEIGHT * 3
 _PREPROCESS_WEIGHT = 5 * _BASE_WEIGHT
 _INFERENCE_WEIGHT = 10 * _PREPROCESS_WEIGHT
 
+_PREPROCESSED_INPUTS_CACHE_DIR = Path("cache", "preprocessed-inputs")
+_TRANSCRIPTS_CACHE_DIR = Path("cache", "transcripts")
+
+_ARTIFACTS_FLUSH_SIZE = 64
+_ARTIFACTS_FLUSH_BYTES = 16 * 1024**2
+
 
 class ArtifactFactory(Protocol):
     def __call__(self, artifact: bytes) -> TranscriptionArtifact: ...
@@ -121,6 +134,7 @@ class ASRActivities(ActivityWithProgress):
                 query,
                 output_dir=output_dir,
                 batch_size=batch_size,
+                search_slices=worker_config.elasticsearch.search_slices,
             )
         ]
         return batch_paths
@@ -150,11 +164,20 @@ class ASRActivities(ActivityWithProgress):
         preprocessor = cache.get_or_cache_resource(
             preprocessor_key, preprocessor_factory
         )
+        inputs_cache = None
+        inputs_cache_config = worker_config.cache.preprocessed_inputs
+        if inputs_cache_config.enabled:
+            cache_root = workdir / _PREPROCESSED_INPUTS_CACHE_DIR
+            inputs_cache = PreprocessedInputsCache(
+                inputs_cache_config.to_workdir_cache(cache_root), config
+            )
         batch_paths = preprocess_act(
             preprocessor,
             audio_batch,
             worker_config=worker_config,
             output_dir=output_dir,
+            cache=inputs_cache,
+            batch_size=config.batch_size,
         )
         batches = [p.relative_to(workdir) for p in batch_paths]
         return batches
@@ -166,10 +189,27 @@ class ASRActivities(ActivityWithProgress):
         project: str,
         config: InferenceRunnerConfig,
         *,
-        progress: Annotated[  # noqa: ARG002
+        progress: Annotated[
             AsyncProgressRateHandler | None, Weight(value=_INFERENCE_WEIGHT)
         ] = None,
     ) -> list[Path]:
+        # Kept for workflows started before inference returned cache stats
+        res = await self.infer_with_stats(
+            preprocessed_inputs, project, config, progress=progress
+        )
+        return res.transcripts
+
+    @activity_defn(name=RUN_INFERENCE_WITH_STATS_ACTIVITY)
+    async def infer_with_stats(
+        self,
+        preprocessed_inputs: list[Path],
+        project: str,
+        config: InferenceRunnerConfig,
+        *,
+        progress: Annotated[
+            AsyncProgressRateHandler | None, Weight(value=_INFERENCE_WEIGHT)
+        ] = None,
+    ) -> InferenceResponse:
         # Import caul.tasks to populate the InferenceRunner registry
         import caul.tasks  # noqa: F401, PLC0415
 
@@ -178,10 +218,6 @@ class ASRActivities(ActivityWithProgress):
         output_dir = activity_workdir(workdir, project)
         output_dir.mkdir(parents=True, exist_ok=True)
         preprocessed_inputs = [workdir / p for p in preprocessed_inputs]
-        if progress is not None:
-            progress = to_raw_async_progress(
-                progress, max_progress=len(preprocessed_inputs)
-            )
         logger.info("loading model %s", config.model)
         runner_factory = enter_cm(partial(InferenceRunner.from_config, config))
         runner_key = config_cache_key(config)
@@ -191,14 +227,25 @@ class ASRActivities(ActivityWithProgress):
             "model loaded, starting inference on %s audio chunks !",
             len(preprocessed_inputs),
         )
+        transcripts_cache = None
+        transcripts_cache_config = worker_config.cache.transcripts
+        if transcripts_cache_config.enabled:
+            cache_root = workdir / _TRANSCRIPTS_CACHE_DIR
+            transcripts_cache = TranscriptsCache(
+                transcripts_cache_config.to_workdir_cache(cache_root), config
+            )
         inference_res = infer_act(
             inference_runner,
             preprocessed_inputs,
             output_dir=output_dir,
             progress=progress,
+            cache=transcripts_cache,
         )
         inference_res = [p.relative_to(workdir) async for p in inference_res]
-        return inference_res
+        n_cache_hits = 0
+        if transcripts_cache is not None:
+            n_cache_hits = transcripts_cache.n_hits
+        return InferenceResponse(transcripts=inference_res, n_cache_hits=n_cache_hits)
 
     @activity_defn(name=POSTPROCESS_ACTIVITY)
     def postprocess(
@@ -269,6 +316,8 @@ class ASRActivities(ActivityWithProgress):
             indexing_config=indexing_config,
             artifact_root=worker_config.paths.artifacts,
             target_bulk_char_size=target_bulk_char_size,
+            es_concurrency=es_client.max_concurrency,
+            bulk_config=worker_config.elasticsearch.bulk,
             progress=progress,
         )
         return n_docs
@@ -281,10 +330,15 @@ async def search_audios_act(
     *,
     output_dir: Path,
     batch_size: int,
+    search_slices: int = 1,
 ) -> AsyncIterable[Path]:
     # TODO: supported content types should be args
     docs = _search_audio_paths(
-        es_client, project, query, supported_content_types=SUPPORTED_CONTENT_TYPES
+        es_client,
+        project,
+        query,
+        supported_content_types=SUPPORTED_CONTENT_TYPES,
+        search_slices=search_slices,
     )
     async for p in write_audio_batches(docs, output_dir, batch_size):
         yield p
@@ -296,59 +350,174 @@ def preprocess_act(
     *,
     worker_config: ASRWorkerConfig,
     output_dir: Path,
+    cache: PreprocessedInputsCache | None = None,
+    batch_size: int | None = None,
 ) -> list[Path]:
     logger.debug("locating files...")
-    audios = read_jsonl_as(audio_batch, Document)
-    audios = (a.to_processed_file() for a in audios)
-    audios = (
-        symlink_embedded_document_to_workdir(a, worker_config.paths).locate(
-            worker_config.paths
+    docs = read_jsonl_as(audio_batch, Document)
+    if cache is not None:
+        if batch_size is None:
+            raise ValueError("batch_size is required when using cache")
+        return _preprocess_with_cache(
+            preprocessor,
+            list(docs),
+            cache,
+            worker_config=worker_config,
+            output_dir=output_dir,
+            batch_size=batch_size,
         )
-        for a in audios
-    )
-    # TODO: implement a caching strategy here, we could avoid processing files
-    #  which have already been preprocessed
+    audios = (_locate_audio(d, worker_config) for d in docs)
     logger.debug("starting preprocessing...")
     return list(_preprocess(preprocessor, audios, output_dir))
 
 
+def _preprocess_with_cache(
+    preprocessor: Preprocessor,
+    docs: list[Document],
+    cache: PreprocessedInputsCache,
+    *,
+    worker_config: ASRWorkerConfig,
+    output_dir: Path,
+    batch_size: int,
+) -> list[Path]:
+    doc_inputs = defaultdict(list)
+    misses = []
+    for doc_i, doc in enumerate(docs):
+        cached = cache.get(doc)
+        # Link cached files into the output dir so that they can't be evicted before
+        # inference runs
+        if cached is not None:
+            cached = _link_cached_inputs(cached, output_dir)
+        if cached is None:
+            misses.append(doc_i)
+            continue
+        doc_inputs[doc_i] = cached
+    logger.debug(
+        "found %s/%s preprocessed audios in cache", len(docs) - len(misses), len(docs)
+    )
+    if misses:
+        audios = (str(_locate_audio(docs[doc_i], worker_config)) for doc_i in misses)
+        logger.debug("starting preprocessing...")
+        for batch in preprocessor.process(audios, output_dir=output_dir):
+            for processed in batch:
+                doc_i = misses[processed.metadata.input_ordering]
+                doc_inputs[doc_i].append(_relative_input(processed, output_dir))
+        for doc_i in misses:
+            if doc_inputs[doc_i]:
+                cache.put(docs[doc_i], doc_inputs[doc_i])
+        n_evicted = cache.evict()
+        logger.debug("evicted %s preprocessed audios from cache", n_evicted)
+    # Inputs ordering refers to the doc position inside the audio batch, we rebatch
+    # in doc order to preserve it
+    inputs = (
+        _with_input_ordering(i, doc_i, output_dir)
+        for doc_i in sorted(doc_inputs)
+        for i in doc_inputs[doc_i]
+    )
+    return list(_write_preprocessed_batches(batches(inputs, batch_size), output_dir))
+
+
+def _locate_audio(doc: Document, worker_config: ASRWorkerConfig) -> Path:
+    audio = doc.to_processed_file()
+    audio = symlink_embedded_document_to_workdir(audio, worker_config.paths)
+    return audio.locate(worker_config.paths)
+
+
 async def infer_act(
     inference_runner: InferenceRunner,
     preprocessed_inputs: list[Path],
     output_dir: Path,
-    event_loop: AbstractEventLoop | None = None,
-    progress: RawAsyncProgressHandler | None = None,
+    progress: AsyncProgressRateHandler | None = None,
+    cache: TranscriptsCache | None = None,
+    max_buffered_results: int = 16,
 ) -> AsyncIterable[Path]:
     # Audios paths in the input are relative to the batch file directory
-    inputs = (
+    inputs = [
         [_relative_input(i, f.parent) for i in read_jsonl_as(f, PreprocessedInput)]
         for f in preprocessed_inputs
+    ]
+    audio_paths = (i.metadata.preprocessed_file_path for b in inputs for i in b)
+    n_inputs = sum(len(b) for b in inputs)
+    if progress is not None and n_inputs:
+        progress = to_raw_async_progress(progress, max_progress=n_inputs)
+    if cache is None:
+        inference_results = _transcribe(inference_runner, inputs)
+    else:
+        inference_results = _transcribe_with_cache(inference_runner, inputs, cache)
+    # Results are consumed as soon as they're produced by the runner, this lets us
+    # write them and report progress while inference is still running
+    inference_results = iterate_in_thread(
+        inference_results, max_buffered=max_buffered_results
     )
-    audio_paths, inputs = tee(inputs)
-    audio_paths = (i.metadata.preprocessed_file_path for b in audio_paths for i in b)
-    # TODO: implement caching
-    inference_results = await asyncio.to_thread(
-        _transcribe_as_list, inference_runner, list(inputs)
-    )
-    for res_i, (path, asr_res) in enumerate(
-        zip(audio_paths, inference_results, strict=True)
-    ):
+    res_i = 0
+    async for asr_res in inference_results:
+        path = next(audio_paths)
         filename = f"{debuggable_name(path.name)}-transcript.json"
         transcript_path = output_dir / safe_dir(filename) / filename
         transcript_path.parent.mkdir(parents=True, exist_ok=True)
         logger.debug(
             "run inference for %s, writing result to %s", path, transcript_path
         )
-        transcript_path.write_text(asr_res.model_dump_json())
+        async with async_open(transcript_path, "w") as f:
+            await f.write(asr_res.model_dump_json())
         yield transcript_path
-        if progress is not None and event_loop is not None:
+        res_i += 1
+        if progress is not None:
             await progress(res_i)
+    if next(audio_paths, None) is not None:
+        msg = f"inference runner returned {res_i} results for more inputs"
+        raise ValueError(msg)
+
+
+def _transcribe(
+    inference_runner: InferenceRunner, inputs: list[list[PreprocessedInput]]
+) -> Iterable[ASRResult]:
+    # Wrap in a generator to make sure the processing starts in the consuming thread
+    yield from inference_runner.process(inputs)
 
 
-def _transcribe_as_list(
-    inference_runner: InferenceRunner, inputs: Iterable[list[PreprocessedInput]]
-) -> list[ASRResult]:
-    return list(inference_runner.process(inputs))
+def _transcribe_with_cache(
+    inference_runner: InferenceRunner,
+    inputs: list[list[PreprocessedInput]],
+    cache: TranscriptsCache,
+) -> Iterable[ASRResult]:
+    # The cache is looked up batch by batch, as results are consumed, only the
+    # results of the current batch are hence held in memory
+    n_inferred = 0
+    for batch in inputs:
+        cached = [cache.get(i) for i in batch]
+        to_infer = [i for i, res in zip(batch, cached, strict=True) if res is None]
+        inferred = defaultdict(deque)
+        if to_infer:
+            for res in inference_runner.process([to_infer]):
+                inferred[res.input_ordering].append(res)
+        for preprocessed, res in zip(batch, cached, strict=True):
+            if res is None:
+                res = _pop_inferred(inferred, preprocessed)  # noqa: PLW2901
+                cache.put(preprocessed, res)
+            yield res
+        if any(inferred.values()):
+            msg = "inference runner returned more results than inputs"
+            raise ValueError(msg)
+        n_inferred += len(to_infer)
+    n_inputs = sum(len(b) for b in inputs)
+    logger.info("found %s/%s transcripts in cache", cache.n_hits, n_inputs)
+    if n_inferred:
+        n_evicted = cache.evict()
+        logger.debug("evicted %s transcripts from cache", n_evicted)
+
+
+def _pop_inferred(
+    inferred: dict[int, deque[ASRResult]], preprocessed: PreprocessedInput
+) -> ASRResult:
+    # Results are matched to their input by ordering rather than by position, chunks
+    # of the same input share its ordering and are expected in order
+    ordering = preprocessed.metadata.input_ordering
+    try:
+        return inferred[ordering].popleft()
+    except IndexError as e:
+        msg = f"inference runner returned no result for input {ordering}"
+        raise ValueError(msg) from e
 
 
 def postprocess_act(
@@ -362,6 +531,7 @@ def postprocess_act(
     progress: SyncProgressRateHandler | None = None,
 ) -> list[DocRoute]:
     transcriptions = postprocessor.process(inference_results)
+    artifacts, artifacts_bytes, n_written = [], 0, 0
     # Strict is important here !
     for i, (doc, asr_result) in enumerate(zip(docs, transcriptions, strict=True)):
         manifest_entry = TranscriptionManifestEntry.complete(
@@ -373,10 +543,21 @@ def postprocess_act(
             doc_id=doc.id,
             manifest_entry=manifest_entry,
         )
-        t_path = write_transcription(asr_result, artifact_factory, artifacts_root)
-        logger.debug("wrote transcription for %s", t_path)
+        artifact = transcription_artifact(asr_result, artifact_factory)
+        artifacts.append(artifact)
+        artifacts_bytes += len(artifact.artifact)
+        # Flush in bounded chunks to avoid holding all transcriptions in memory
+        if (
+            len(artifacts) >= _ARTIFACTS_FLUSH_SIZE
+            or artifacts_bytes >= _ARTIFACTS_FLUSH_BYTES
+        ):
+            n_written += len(write_artifacts(artifacts_root, artifacts))
+            artifacts, artifacts_bytes = [], 0
         if progress is not None and event_loop is not None:
             progress(i, event_loop)
+    if artifacts:
+        n_written += len(write_artifacts(artifacts_root, artifacts))
+    logger.debug("wrote %s transcriptions", n_written)
     routes = [d.to_route() for d in docs]
     return routes
 
@@ -390,10 +571,13 @@ async def index_transcriptions_act(  # noqa: PLR0917
     target_bulk_char_size: int = 100_000,
     es_concurrency: int = 5,
     indexing_config: ASRIndexingConfig = None,
+    bulk_config: BulkIndexingConfig | None = None,
     progress: AsyncProgressRateHandler | None = None,
 ) -> int:
     if indexing_config is None:
         indexing_config = ASRIndexingConfig()
+    if bulk_config is None:
+        bulk_config = BulkIndexingConfig()
     es_queue = asyncio.Queue(maxsize=es_concurrency)
     publisher = _read_transcriptions_and_queue(
         list(routes),
@@ -404,14 +588,18 @@ async def index_transcriptions_act(  # noqa: PLR0917
         indexing_config=indexing_config,
         progress=progress,
     )
-    publisher = asyncio.create_task(publisher)
-    publisher_callback = lambda: es_queue.put_nowait(None)  # noqa: E731
-    consumer = asyncio.create_task(
-        _write_transcriptions_to_es(es_client, queue=es_queue, project=project)
-    )
-    n_docs, _ = await publish_and_consume(
-        publisher, publisher_callback, consumer=consumer
-    )
+    async with bulk_config.to_bulk_indexer(es_client) as indexer:
+        publisher = asyncio.create_task(publisher)
+        publisher_callback = lambda: es_queue.put(None)  # noqa: E731
+        consumers = [
+            asyncio.create_task(
+                _write_transcriptions_to_es(indexer, queue=es_queue, project=project)
+            )
+            for _ in range(es_concurrency)
+        ]
+        n_docs, _ = await publish_and_consume(
+            publisher, publisher_callback, consumers=consumers
+        )
     return n_docs
 
 
@@ -419,9 +607,14 @@ def _preprocess(
     preprocessor: Preprocessor, audios: Iterable[Path], output_dir: Path
 ) -> Iterable[Path]:
     audios = (str(a) for a in audios)
-    for batch_i, batch in enumerate(
-        preprocessor.process(audios, output_dir=output_dir)
-    ):
+    preprocessed = preprocessor.process(audios, output_dir=output_dir)
+    yield from _write_preprocessed_batches(preprocessed, output_dir)
+
+
+def _write_preprocessed_batches(
+    preprocessed: Iterable[Iterable[PreprocessedInput]], output_dir: Path
+) -> Iterable[Path]:
+    for batch_i, batch in enumerate(preprocessed):
         # TODO: we might to create safe subdirs to avoid creating too many
         #  files in the same dir
         batch_file = output_dir / f"{batch_i}.jsonl"
@@ -432,16 +625,61 @@ def _preprocess(
         yield batch_file
 
 
+def _link_cached_inputs(
+    cached: list[PreprocessedInput], output_dir: Path
+) -> list[PreprocessedInput] | None:
+    linked = []
+    try:
+        for i in cached:
+            linked.append(_link_input_to_dir(i, output_dir))
+    except FileNotFoundError:
+        # The entry was replaced or evicted concurrently, it's a cache miss
+        logger.debug("cached inputs were removed from cache while linking them")
+        for i in linked:
+            i.metadata.preprocessed_file_path.unlink(missing_ok=True)
+        return None
+    return linked
+
+
+def _link_input_to_dir(
+    preprocessed_input: PreprocessedInput, output_dir: Path
+) -> PreprocessedInput:
+    path = preprocessed_input.metadata.preprocessed_file_path
+    linked = output_dir / f"{uuid4().hex}{path.suffix}"
+    link_or_copy(path, linked)
+    update = {"preprocessed_file_path": linked}
+    metadata = safe_copy(preprocessed_input.metadata, update=update)
+    return PreprocessedInput(metadata=metadata)
+
+
+def _with_input_ordering(
+    preprocessed_input: PreprocessedInput, input_ordering: int, output_dir: Path
+) -> PreprocessedInput:
+    # Paths are written relative to the batch file directory
+    path = preprocessed_input.metadata.preprocessed_file_path.relative_to(output_dir)
+    metadata = safe_copy(
+        preprocessed_input.metadata,
+        update={"input_ordering": input_ordering, "preprocessed_file_path": path},
+    )
+    return PreprocessedInput(metadata=metadata)
+
+
 def write_transcription(
     asr_result: ASRResult, artifact_factory: ArtifactFactory, artifacts_root: Path
 ) -> Path:
+    artifact = transcription_artifact(asr_result, artifact_factory)
+    rel_path = write_artifact(artifacts_root, artifact)
+    return rel_path
+
+
+def transcription_artifact(
+    asr_result: ASRResult, artifact_factory: ArtifactFactory
+) -> TranscriptionArtifact:
     result = Transcription.from_asr_handler_result(asr_result)
-    artifact_bytes = result.model_dump_json().encode()
-    artifact = artifact_factory(artifact=artifact_bytes)
     # TODO: if transcriptions are too large we could also serialize them
     #  as jsonl
-    rel_path = write_artifact(artifacts_root, artifact)
-    return rel_path
+    artifact_bytes = result.model_dump_json().encode()
+    return artifact_factory(artifact=artifact_bytes)
 
 
 def _relative_input(
@@ -481,10 +719,15 @@ async def _search_audio_paths(
     project: str,
     query: dict[str, Any],
     supported_content_types: set[str],
+    search_slices: int = 1,
 ) -> AsyncGenerator[Document, None]:
     body = _with_audio_content(query, supported_content_types)
-    async for page in es_client.poll_search_pages(
-        index=project, body=body, sort="_doc:asc", _source_includes=_DOC_CONTENT_SOURCES
+    async for page in sliced_search_pages(
+        es_client,
+        index=project,
+        body=body,
+        n_slices=search_slices,
+        _source_includes=_DOC_CONTENT_SOURCES,
     ):
         for hit in page[HITS][HITS]:
             yield Document.from_es(hit)
@@ -548,12 +791,11 @@ async def _read_transcriptions_and_queue(
         await queue.put(bulk)
     if progress is not None:
         await progress(n_docs)
-    queue.put_nowait(None)
     return n_docs
 
 
 async def _write_transcriptions_to_es(
-    es_client: ESClient, queue: asyncio.Queue, project: str
+    indexer: BulkIndexer, queue: asyncio.Queue, project: str
 ) -> None:
     while True:
         transcriptions = await queue.get()
@@ -562,13 +804,13 @@ async def _write_transcriptions_to_es(
             queue.task_done()
             return
         logger.debug("writing translations to the index..")
-        await _update_docs_content(es_client, transcriptions, project=project)
+        await _update_docs_content(indexer, transcriptions, project=project)
         logger.debug("translation written !")
         queue.task_done()
 
 
 async def _update_docs_content(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     transcribed_docs: Iterable[tuple[DocRoute, str]],
     project: str,
 ) -> None:
@@ -582,13 +824,14 @@ async def _update_docs_content(
         }
         for (routing, doc_id), transcription in transcribed_docs
     )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    await indexer.bulk(actions)
 
 
 REGISTRY = [
     ASRActivities.search_audio_paths,
     ASRActivities.preprocess,
     ASRActivities.infer,
+    ASRActivities.infer_with_stats,
     ASRActivities.postprocess,
     ASRActivities.index_transcriptions,
 ]
@@ -0,0 +1,243 @@
+import logging
+import os
+import shutil
+from collections.abc import Callable
+from hashlib import sha256
+from pathlib import Path
+from uuid import uuid4
+
+from caul_core import (
+    ASRResult,
+    InferenceRunnerConfig,
+    PreprocessedInput,
+    PreprocessorConfig,
+)
+from datashare_python.objects import Document
+from datashare_python.utils import (
+    artifact_lock,
+    persistent_config_cache_key,
+    safe_dir,
+)
+from icij_common.pydantic_utils import safe_copy
+
+logger = logging.getLogger(__name__)
+
+_COMPLETE_MARKER = ".complete"
+_PREPROCESSED_INPUTS = "inputs.jsonl"
+_TRANSCRIPT = "transcript.json"
+_HASH_CHUNK_SIZE = 1024 * 1024
+_SIZE = "size"
+_SIZE_LOCK_TIMEOUT_MS = 30_000
+
+
+class WorkdirCache:
+    def __init__(self, root: Path, max_size_bytes: int) -> None:
+        self._root = root
+        self._max_size_bytes = max_size_bytes
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def entry_dir(self, key: str) -> Path:
+        return self._root / safe_dir(key) / key
+
+    def get(self, key: str) -> Path | None:
+        entry_dir = self.entry_dir(key)
+        marker = entry_dir / _COMPLETE_MARKER
+        try:
+            # Touch the marker to keep track of the last access for LRU eviction
+            os.utime(marker)
+        except FileNotFoundError:
+            return None
+        return entry_dir
+
+    def put(self, key: str, populate: Callable[[Path], None]) -> Path:
+        entry_dir = self.entry_dir(key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = entry_dir.with_name(f".{key}.{uuid4().hex}.tmp")
+        tmp_dir.mkdir()
+        try:
+            populate(tmp_dir)
+            (tmp_dir / _COMPLETE_MARKER).touch()
+            size = _entry_size(tmp_dir)
+            # Readers can be using the current entry, move it aside before
+            # renaming the new one in place rather than deleting it in place.
+            # Readers hence either see the old entry, the new one or a cache miss,
+            # never a partially deleted entry
+            _remove_entry(entry_dir)
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Some other worker populated the same entry concurrently
+                logger.debug("%s was already cached, skipping", key)
+            else:
+                self._add_size(size)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return entry_dir
+
+    def evict(self) -> int:
+        # The cache size is kept up to date by put, the entries are only scanned
+        # once it goes above the max size
+        size = self._read_size()
+        if size is not None and size <= self._max_size_bytes:
+            return 0
+        entries = []
+        total_size = 0
+        for marker in self._root.glob(f"*/*/*/{_COMPLETE_MARKER}"):
+            entry_dir = marker.parent
+            if entry_dir.name.startswith("."):
+                continue
+            try:
+                last_access = marker.stat().st_mtime
+                size = _entry_size(entry_dir)
+            except FileNotFoundError:
+                continue
+            entries.append((last_access, size, entry_dir))
+            total_size += size
+        n_evicted = 0
+        for _, size, entry_dir in sorted(entries, key=lambda e: e[0]):
+            if total_size <= self._max_size_bytes:
+                break
+            logger.debug("evicting %s from cache", entry_dir)
+            _remove_entry(entry_dir)
+            total_size -= size
+            n_evicted += 1
+        # Entries put during the scan might be missed here, the size is then
+        # slightly underestimated until the next scan
+        self._root.mkdir(parents=True, exist_ok=True)
+        with artifact_lock(self._root, _SIZE_LOCK_TIMEOUT_MS):
+            self._write_size(total_size)
+        return n_evicted
+
+    def _add_size(self, n_bytes: int) -> None:
+        with artifact_lock(self._root, _SIZE_LOCK_TIMEOUT_MS):
+            size = self._read_size()
+            # When unknown, the size is computed by the next eviction
+            if size is not None:
+                self._write_size(size + n_bytes)
+
+    def _read_size(self) -> int | None:
+        try:
+            return int((self._root / _SIZE).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_size(self, size: int) -> None:
+        size_path = self._root / _SIZE
+        tmp_path = size_path.with_name(f".{_SIZE}.{uuid4().hex}.tmp")
+        tmp_path.write_text(str(size))
+        os.replace(tmp_path, size_path)
+
+
+class PreprocessedInputsCache:
+    def __init__(self, cache: WorkdirCache, config: PreprocessorConfig) -> None:
+        self._cache = cache
+        self._config_key = persistent_config_cache_key(config)
+
+    def get(self, doc: Document) -> list[PreprocessedInput] | None:
+        entry_dir = self._cache.get(self._key(doc))
+        if entry_dir is None:
+            return None
+        inputs_path = entry_dir / _PREPROCESSED_INPUTS
+        try:
+            with inputs_path.open() as f:
+                inputs = [PreprocessedInput.model_validate_json(line) for line in f]
+        except FileNotFoundError:
+            # The entry was replaced or evicted concurrently
+            logger.debug("%s was removed from cache while reading it", entry_dir)
+            return None
+        return [_resolve_input(i, entry_dir) for i in inputs]
+
+    def put(self, doc: Document, inputs: list[PreprocessedInput]) -> None:
+        def populate(entry_dir: Path) -> None:
+            with (entry_dir / _PREPROCESSED_INPUTS).open("w") as f:
+                for chunk_i, i in enumerate(inputs):
+                    path = i.metadata.preprocessed_file_path
+                    cached_path = Path(f"{chunk_i}{path.suffix}")
+                    link_or_copy(path, entry_dir / cached_path)
+                    update = {"preprocessed_file_path": cached_path}
+                    metadata = safe_copy(i.metadata, update=update)
+                    cached = PreprocessedInput(metadata=metadata)
+                    f.write(cached.model_dump_json() + "\n")
+
+        self._cache.put(self._key(doc), populate)
+
+    def evict(self) -> int:
+        return self._cache.evict()
+
+    def _key(self, doc: Document) -> str:
+        return sha256(f"{self._config_key}/{doc.index}/{doc.id}".encode()).hexdigest()
+
+
+class TranscriptsCache:
+    def __init__(self, cache: WorkdirCache, config: InferenceRunnerConfig) -> None:
+        self._cache = cache
+        self._config_key = persistent_config_cache_key(config)
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def get(self, preprocessed_input: PreprocessedInput) -> ASRResult | None:
+        entry_dir = self._cache.get(self._key(preprocessed_input))
+        if entry_dir is None:
+            self.n_misses += 1
+            return None
+        try:
+            res = (entry_dir / _TRANSCRIPT).read_text()
+        except FileNotFoundError:
+            # The entry was replaced or evicted concurrently
+            logger.debug("%s was removed from cache while reading it", entry_dir)
+            self.n_misses += 1
+            return None
+        self.n_hits += 1
+        res = ASRResult.model_validate_json(res)
+        update = {"input_ordering": preprocessed_input.metadata.input_ordering}
+        return safe_copy(res, update=update)
+
+    def put(self, preprocessed_input: PreprocessedInput, res: ASRResult) -> None:
+        def populate(entry_dir: Path) -> None:
+            (entry_dir / _TRANSCRIPT).write_text(res.model_dump_json())
+
+        self._cache.put(self._key(preprocessed_input), populate)
+
+    def evict(self) -> int:
+        return self._cache.evict()
+
+    def _key(self, preprocessed_input: PreprocessedInput) -> str:
+        h = sha256(self._config_key.encode())
+        with preprocessed_input.metadata.preprocessed_file_path.open("rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                h.update(chunk)
+        return h.hexdigest()
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _remove_entry(entry_dir: Path) -> None:
+    # Renaming is atomic, the entry stops being visible before its content is
+    # deleted. Hidden dirs are ignored by get and evict
+    trash_dir = entry_dir.with_name(f".{entry_dir.name}.{uuid4().hex}.trash")
+    try:
+        os.replace(entry_dir, trash_dir)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash_dir, ignore_errors=True)
+
+
+def _entry_size(entry_dir: Path) -> int:
+    return sum(f.stat().st_size for f in entry_dir.iterdir())
+
+
+def _resolve_input(
+    preprocessed_input: PreprocessedInput, root: Path
+) -> PreprocessedInput:
+    path = root / preprocessed_input.metadata.preprocessed_file_path
+    update = {"preprocessed_file_path": path}
+    metadata = safe_copy(preprocessed_input.metadata, update=update)
+    return PreprocessedInput(metadata=metadata)
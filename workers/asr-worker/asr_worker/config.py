@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import datashare_python
 from datashare_python.config import (
     LogFormat,
@@ -8,22 +10,38 @@ from datashare_python.config import (
 from datashare_python.objects import BaseModel, WorkerPaths
 from pydantic import Field
 
+from .cache import WorkdirCache
+
 _DEFAULT_LOGGERS = {datashare_python.__name__: "INFO", __name__: "INFO"}
 _DEFAULT_LOGGING_CONFIG = LoggingConfig(
     format=LogFormat.DEFAULT, loggers=_DEFAULT_LOGGERS
 )
 
 
+class WorkdirCacheConfig(BaseModel):
+    enabled: bool = True
+    max_size_bytes: int = 20 * 1024**3
+
+    def to_workdir_cache(self, root: Path) -> WorkdirCache:
+        return WorkdirCache(root, max_size_bytes=self.max_size_bytes)
+
+
+def _resource_cache_config() -> ResourceCacheConfig:
+    return ResourceCacheConfig(size=1, exit_context_managers=True)
+
+
+def _transcripts_cache_config() -> WorkdirCacheConfig:
+    return WorkdirCacheConfig(max_size_bytes=1024**3)
+
+
 class ASRCache(BaseModel):
-    preprocessor: ResourceCacheConfig = ResourceCacheConfig(
-        size=1, exit_context_managers=True
-    )
-    inference_runner: ResourceCacheConfig = ResourceCacheConfig(
-        size=1, exit_context_managers=True
-    )
-    postprocessor: ResourceCacheConfig = ResourceCacheConfig(
-        size=1, exit_context_managers=True
+    preprocessor: ResourceCacheConfig = Field(default_factory=_resource_cache_config)
+    inference_runner: ResourceCacheConfig = Field(
+        default_factory=_resource_cache_config
     )
+    postprocessor: ResourceCacheConfig = Field(default_factory=_resource_cache_config)
+    preprocessed_inputs: WorkdirCacheConfig = Field(default_factory=WorkdirCacheConfig)
+    transcripts: WorkdirCacheConfig = Field(default_factory=_transcripts_cache_config)
 
 
 class IndexingWorkerConfig(BaseModel):
@@ -15,6 +15,7 @@ GET_CONFIG_ACTIVITY = "asr.transcription.config"
 PREPROCESS_ACTIVITY = "asr.transcription.preprocess"
 SEARCH_AUDIOS_ACTIVITY = "asr.transcription.search-audios"
 RUN_INFERENCE_ACTIVITY = "asr.transcription.infer"
+RUN_INFERENCE_WITH_STATS_ACTIVITY = "asr.transcription.infer-with-stats"
 POSTPROCESS_ACTIVITY = "asr.transcription.postprocess"
 INDEX_TRANSCRIPTION_ACTIVITY = "asr.transcription.index"
 
@@ -1,6 +1,7 @@
 import math
 from collections import defaultdict
 from functools import cache
+from pathlib import Path
 from typing import Any, ClassVar, Self
 
 from caul_core import ASRPipelineConfig, ASRResult
@@ -47,6 +48,14 @@ class ASRArgs(TaskArgs):
 
 class ASRResponse(DatashareModel):
     n_transcribed: int
+    # Transcripts produced by inference, including the ones found in cache
+    n_transcripts: int = 0
+    n_inference_cache_hits: int = 0
+
+
+class InferenceResponse(DatashareModel):
+    transcripts: list[Path]
+    n_cache_hits: int = 0
 
 
 class Timestamp(DatashareModel):
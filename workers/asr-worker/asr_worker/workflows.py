@@ -10,7 +10,7 @@ from pydantic import TypeAdapter
 from temporalio import workflow
 
 from .constants import ASR_WORKFLOW
-from .objects import ASRArgs, ASRResponse
+from .objects import ASRArgs, ASRResponse, InferenceResponse
 
 with workflow.unsafe.imports_passed_through():
     from .activities import ASRActivities
@@ -24,6 +24,8 @@ INFERENCE_TIMEOUT = timedelta(minutes=30)
 INDEXATION_TIMEOUT = timedelta(hours=1)
 POSTPROCESSING_TIMEOUT = timedelta(minutes=10)
 
+_INFERENCE_WITH_STATS_PATCH = "inference-with-stats"
+
 
 class TaskQueues(StrEnum):
     WORKFLOWS = "datashare.workflows"
@@ -74,9 +76,15 @@ class ASRWorkflow(WorkflowWithProgress):
         )
         logger.info("preprocessing complete !")
         # Inference
+        # Workflows started before inference returned cache stats run the former
+        # activity, returning transcript paths
+        with_stats = workflow.patched(_INFERENCE_WITH_STATS_PATCH)
+        infer_activity = (
+            ASRActivities.infer_with_stats if with_stats else ASRActivities.infer
+        )
         inference_acts = [
             execute_activity(
-                ASRActivities.infer,
+                infer_activity,
                 task_queue=TaskQueues.INFERENCE_GPU,
                 args=b,
                 # TODO: in practice we should parse the config to find out
@@ -86,8 +94,19 @@ class ASRWorkflow(WorkflowWithProgress):
             for b in inference_args
         ]
         logger.info("running inference...")
-        inference_results = await gather(*inference_acts)
-        logger.info("inference complete !")
+        inference_responses = await gather(*inference_acts)
+        if not with_stats:
+            inference_responses = [
+                InferenceResponse(transcripts=r) for r in inference_responses
+            ]
+        n_transcripts = sum(len(r.transcripts) for r in inference_responses)
+        n_cache_hits = sum(r.n_cache_hits for r in inference_responses)
+        logger.info(
+            "inference complete, %s/%s transcripts found in cache !",
+            n_cache_hits,
+            n_transcripts,
+        )
+        inference_results = [r.transcripts for r in inference_responses]
         # Postprocessing
         postprocessing_args = list(
             zip(
@@ -130,7 +149,11 @@ class ASRWorkflow(WorkflowWithProgress):
         ]
         n_transcribed = await gather(*indexing_acts)
         n_transcribed = sum(n_transcribed)
-        return ASRResponse(n_transcribed=n_transcribed)
+        return ASRResponse(
+            n_transcribed=n_transcribed,
+            n_transcripts=n_transcripts,
+            n_inference_cache_hits=n_cache_hits,
+        )
 
 
 REGISTRY = [ASRWorkflow]
@@ -1,4 +1,5 @@
 import json
+import shutil
 from collections.abc import AsyncGenerator, Iterable
 from functools import partial
 from itertools import cycle
@@ -7,7 +8,11 @@ from typing import Self
 
 import pytest
 from aiostream import stream
+from asr_worker import activities
+from asr_worker import cache as cache_module
 from asr_worker.activities import (
+    _link_cached_inputs,
+    _transcribe_with_cache,
     index_transcriptions_act,
     infer_act,
     postprocess_act,
@@ -16,6 +21,7 @@ from asr_worker.activities import (
     write_audio_batches,
     write_transcription,
 )
+from asr_worker.cache import PreprocessedInputsCache, TranscriptsCache, WorkdirCache
 from asr_worker.config import ASRWorkerConfig
 from asr_worker.objects import (
     ASRArgs,
@@ -32,6 +38,10 @@ from caul_core import (
     Preprocessor,
     PreprocessorOutput,
 )
+from caul_core.config import (
+    ParakeetInferenceRunnerConfig,
+    ParakeetPreprocessorConfig,
+)
 from datashare_python.conftest import TEST_PROJECT
 from datashare_python.objects import (
     DatashareLanguage,
@@ -41,6 +51,7 @@ from datashare_python.objects import (
 from datashare_python.utils import read_jsonl_as
 from icij_common.es import HITS, ESClient, ids_query, match_all
 from icij_common.iter_utils import batches
+from icij_common.pydantic_utils import safe_copy
 from icij_common.registrable import RegistrableConfig
 
 PREPROCESSED_INPUT_0 = PreprocessedInput(
@@ -135,7 +146,6 @@ class MockInferenceRunner(InferenceRunner):
         *args,  # noqa: ARG002
         **kwargs,  # noqa: ARG002
     ) -> Iterable[ASRResult]:
-        i = 0
         for batch in inputs:
             for preprocessed in batch:
                 transcription = (
@@ -143,11 +153,11 @@ class MockInferenceRunner(InferenceRunner):
                         ".wav", ""
                     )
                 )
-                transcription = [(0.0, float(i), transcription)]
+                ordering = preprocessed.metadata.input_ordering
+                transcription = [(0.0, float(ordering), transcription)]
                 yield ASRResult(
-                    input_ordering=i, transcription=transcription, score=1.0
+                    input_ordering=ordering, transcription=transcription, score=1.0
                 )
-                i += 1
 
 
 class MockPostprocessor(Postprocessor):
@@ -251,6 +261,88 @@ def test_preprocess_act(test_worker_config: ASRWorkerConfig, tmpdir: Path) -> No
     assert written_batches == expected_batches
 
 
+class RecordingPreprocessor(MockPreprocessor):
+    def __init__(self, batch_size: int) -> None:
+        super().__init__(batch_size)
+        self.processed = []
+
+    def process(
+        self, audios: Iterable[Path], **kwargs
+    ) -> Iterable[list[PreprocessedInput]]:
+        audios = list(audios)
+        self.processed.extend(audios)
+        yield from super().process(audios, **kwargs)
+
+
+def test_workdir_cache_put_should_not_delete_entry_in_place(tmpdir: Path) -> None:
+    # Given
+    root = Path(tmpdir) / "cache"
+    cache = WorkdirCache(root, max_size_bytes=1024)
+    key = "some-key"
+    cache.put(key, lambda d: (d / "data.txt").write_text("old"))
+    # When
+    with (cache.get(key) / "data.txt").open() as f:
+        cache.put(key, lambda d: (d / "data.txt").write_text("new"))
+        old = f.read()
+    # Then
+    assert old == "old"
+    assert (cache.get(key) / "data.txt").read_text() == "new"
+    assert not [p for p in cache.entry_dir(key).parent.iterdir() if p.name[0] == "."]
+
+
+def test_preprocess_act_with_cache(
+    test_worker_config: ASRWorkerConfig, tmpdir: Path
+) -> None:
+    # Given
+    tmpdir = Path(tmpdir)
+    output_dir = tmpdir / "output"
+    output_dir.mkdir()
+    for i in range(3):
+        (output_dir / f"preprocessed_{i}.wav").write_text(f"audio-{i}")
+    cache = PreprocessedInputsCache(
+        WorkdirCache(tmpdir / "cache", max_size_bytes=1024),
+        ParakeetPreprocessorConfig(),
+    )
+    docs = [
+        Document(
+            id=f"doc-{i}",
+            language=DatashareLanguage("ENGLISH"),
+            root_document=f"root-{i}",
+            path=Path(str(i)),
+            index=TEST_PROJECT,
+            metadata={"tika_metadata_resourcename": f"doc-{i}.wav"},
+        )
+        for i in range(4)
+    ]
+    first_batch = tmpdir / "first_batch.txt"
+    first_batch.write_text("".join(d.model_dump_json() + "\n" for d in docs[:2]))
+    second_batch = tmpdir / "second_batch.txt"
+    second_batch.write_text("".join(d.model_dump_json() + "\n" for d in docs[1:]))
+    preprocessor = RecordingPreprocessor(batch_size=2)
+    preprocess = partial(
+        preprocess_act,
+        preprocessor,
+        worker_config=test_worker_config,
+        output_dir=output_dir,
+        cache=cache,
+        batch_size=2,
+    )
+
+    # When
+    preprocess(audio_batch=first_batch)
+    preprocessor.processed.clear()
+    batch_files = preprocess(audio_batch=second_batch)
+
+    # Then
+    assert len(preprocessor.processed) == 2
+    inputs = [i for f in batch_files for i in read_jsonl_as(f, PreprocessedInput)]
+    assert [i.metadata.input_ordering for i in inputs] == [0, 1, 2]
+    contents = [
+        (output_dir / i.metadata.preprocessed_file_path).read_text() for i in inputs
+    ]
+    assert contents == ["audio-1", "audio-0", "audio-1"]
+
+
 async def test_infer_act(tmpdir: Path) -> None:
     # Given
     inference_runner = MockInferenceRunner()
@@ -279,8 +371,180 @@ async def test_infer_act(tmpdir: Path) -> None:
     assert asr_results == INFERENCE_RESULTS
 
 
-def test_postprocess_act(tmpdir: Path) -> None:
+class FailingInferenceRunner(MockInferenceRunner):
+    def process(self, inputs: Iterable[list[PreprocessorOutput]], *args, **kwargs):  # noqa: ANN201, ARG002
+        if list(inputs):
+            raise AssertionError("inference should have been cached")
+        yield from ()
+
+
+async def test_infer_act_with_cache(tmpdir: Path) -> None:
+    # Given
+    tmpdir = Path(tmpdir)
+    workdir = tmpdir / "workdir"
+    workdir.mkdir()
+    output_dir = tmpdir / "output"
+    output_dir.mkdir()
+    preprocessed_inputs = [
+        PREPROCESSED_INPUT_0,
+        PREPROCESSED_INPUT_1,
+        PREPROCESSED_INPUT_2,
+    ]
+    paths = []
+    for p_i, p in enumerate(preprocessed_inputs):
+        (workdir / p.metadata.preprocessed_file_path).write_text(f"audio-{p_i}")
+        input_path = workdir / f"{p_i}.json"
+        input_path.write_text(p.model_dump_json())
+        paths.append(input_path)
+    config = ParakeetInferenceRunnerConfig()
+    cache_root = tmpdir / "cache"
+    first_cache = TranscriptsCache(WorkdirCache(cache_root, 1024**2), config)
+    second_cache = TranscriptsCache(WorkdirCache(cache_root, 1024**2), config)
+    first_results = infer_act(
+        MockInferenceRunner(), paths, output_dir=output_dir, cache=first_cache
+    )
+    first_results = [p async for p in first_results]
+
+    # When
+    asr_result_paths = infer_act(
+        FailingInferenceRunner(), paths, output_dir=output_dir, cache=second_cache
+    )
+
+    # Then
+    asr_results = [
+        ASRResult.model_validate_json((output_dir / p).read_text())
+        async for p in asr_result_paths
+    ]
+    assert asr_results == INFERENCE_RESULTS
+    assert first_cache.n_hits == 0
+    assert second_cache.n_hits == 3
+
+
+def test_workdir_cache_should_only_scan_entries_above_max_size(
+    tmpdir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Given
+    cache = WorkdirCache(Path(tmpdir) / "cache", max_size_bytes=10)
+    cache.evict()
+    n_entries_sized = 0
+    entry_size = cache_module._entry_size
+
+    def counting_entry_size(entry_dir: Path) -> int:
+        nonlocal n_entries_sized
+        n_entries_sized += 1
+        return entry_size(entry_dir)
+
+    monkeypatch.setattr(cache_module, "_entry_size", counting_entry_size)
+    for key in ["key-a", "key-b"]:
+        cache.put(key, lambda d: (d / "data.txt").write_text("1234"))
+    # When
+    n_evicted = cache.evict()
+    # Then
+    assert n_evicted == 0
+    assert n_entries_sized == 2
+    # When
+    cache.put("key-c", lambda d: (d / "data.txt").write_text("1234"))
+    n_evicted = cache.evict()
+    # Then
+    assert n_evicted == 1
+    assert cache.get("key-a") is None
+    assert cache.get("key-b") is not None
+    assert cache.get("key-c") is not None
+
+
+def test_transcripts_cache_should_miss_entries_removed_while_reading(
+    tmpdir: Path,
+) -> None:
+    # Given
+    tmpdir = Path(tmpdir)
+    audio_path = tmpdir / "audio.wav"
+    audio_path.write_text("audio")
+    preprocessed_input = safe_copy(
+        PREPROCESSED_INPUT_0,
+        update={
+            "metadata": safe_copy(
+                PREPROCESSED_INPUT_0.metadata,
+                update={"preprocessed_file_path": audio_path},
+            )
+        },
+    )
+    workdir_cache = WorkdirCache(tmpdir / "cache", 1024**2)
+    cache = TranscriptsCache(workdir_cache, ParakeetInferenceRunnerConfig())
+    cache.put(preprocessed_input, INFERENCE_RESULTS[0])
+    # Another worker removes the entry right after it was looked up
+    get_entry = workdir_cache.get
+
+    def get_and_remove(key: str) -> Path | None:
+        entry_dir = get_entry(key)
+        shutil.rmtree(entry_dir)
+        return entry_dir
+
+    workdir_cache.get = get_and_remove
+    # When
+    res = cache.get(preprocessed_input)
+    # Then
+    assert res is None
+    assert cache.n_hits == 0
+    assert cache.n_misses == 1
+
+
+def test_link_cached_inputs_should_miss_inputs_removed_while_linking(
+    tmpdir: Path,
+) -> None:
+    # Given
+    tmpdir = Path(tmpdir)
+    output_dir = tmpdir / "output"
+    output_dir.mkdir()
+    cached = []
+    for i, p in enumerate([PREPROCESSED_INPUT_0, PREPROCESSED_INPUT_1]):
+        path = tmpdir / f"{i}.wav"
+        metadata = safe_copy(p.metadata, update={"preprocessed_file_path": path})
+        cached.append(PreprocessedInput(metadata=metadata))
+    cached[0].metadata.preprocessed_file_path.write_text("audio-0")
+    # When
+    linked = _link_cached_inputs(cached, output_dir)
+    # Then
+    assert linked is None
+    assert not list(output_dir.iterdir())
+
+
+class _ReversedInferenceRunner(MockInferenceRunner):
+    def process(self, inputs: Iterable[list[PreprocessorOutput]], *args, **kwargs):  # noqa: ANN201, ANN202
+        for batch in inputs:
+            yield from reversed(list(super().process([batch], *args, **kwargs)))
+
+
+def test_transcribe_with_cache_should_look_up_batches_lazily(tmpdir: Path) -> None:
+    # Given
+    tmpdir = Path(tmpdir)
+    inputs = []
+    for p_i, p in enumerate([PREPROCESSED_INPUT_0, PREPROCESSED_INPUT_1]):
+        path = tmpdir / p.metadata.preprocessed_file_path
+        path.write_text(f"audio-{p_i}")
+        metadata = safe_copy(p.metadata, update={"preprocessed_file_path": path})
+        inputs.append(PreprocessedInput(metadata=metadata))
+    config = ParakeetInferenceRunnerConfig()
+    cache = TranscriptsCache(WorkdirCache(tmpdir / "cache", 1024**2), config)
+    # When
+    results = _transcribe_with_cache(
+        _ReversedInferenceRunner(), [inputs, inputs], cache
+    )
+    first_batch = [next(results), next(results)]
+    n_lookups = cache.n_hits + cache.n_misses
+    second_batch = list(results)
+    # Then
+    assert n_lookups == 2
+    assert [r.input_ordering for r in first_batch] == [0, 1]
+    assert second_batch == first_batch
+    assert cache.n_hits == 2
+
+
+@pytest.mark.parametrize("flush_size", [1, 2, 64])
+def test_postprocess_act(
+    tmpdir: Path, flush_size: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
     # Given
+    monkeypatch.setattr(activities, "_ARTIFACTS_FLUSH_SIZE", flush_size)
     args = ASRArgs(project=TEST_PROJECT, docs=[], batch_size=2)
     postprocessor = MockPostprocessor()
     project = TEST_PROJECT
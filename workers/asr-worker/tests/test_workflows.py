@@ -11,6 +11,7 @@ from asr_worker.constants import (
     POSTPROCESS_ACTIVITY,
     PREPROCESS_ACTIVITY,
     RUN_INFERENCE_ACTIVITY,
+    RUN_INFERENCE_WITH_STATS_ACTIVITY,
     SEARCH_AUDIOS_ACTIVITY,
 )
 from asr_worker.objects import (
@@ -123,7 +124,7 @@ async def gpu_inference_worker(
         worker_config=test_worker_config,
         client=client,
         task_queue=task_queue,
-        activities=[RUN_INFERENCE_ACTIVITY],
+        activities=[RUN_INFERENCE_ACTIVITY, RUN_INFERENCE_WITH_STATS_ACTIVITY],
         dependencies=dependencies,
     )
     async with worker_ctx:
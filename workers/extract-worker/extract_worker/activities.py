@@ -16,14 +16,15 @@ from datashare_python.objects import (
     Pages,
     ProcessedFile,
 )
+from datashare_python.search import sliced_search_pages
 from datashare_python.types_ import AsyncProgressRateHandler
 from datashare_python.utils import (
     ActivityWithProgress,
     activity_defn,
     activity_workdir,
+    async_write_artifacts,
     read_jsonl_as,
     to_raw_async_progress,
-    write_artifact,
 )
 from datashare_python.utils import ext_to_mime_types as _ext_to_mime_types
 from extract_core import (
@@ -108,6 +109,7 @@ class MarkdownExtract(ActivityWithProgress):
                 output_dir=output_dir,
                 target_n_pages_per_batch=target_n_pages_per_batch,
                 es_client=es_client,
+                search_slices=worker_config.elasticsearch.search_slices,
             )
         ]
         logger.debug("created extraction batches !")
@@ -151,6 +153,8 @@ class MarkdownExtract(ActivityWithProgress):
 _DOC_SORT = [f"{DOC_CONTENT_TYPE}:asc", f"{DOC_LANGUAGE}:asc", "_doc:asc"]
 _DOC_CONTENT_SOURCES = [DOC_PATH, DOC_ROOT_ID, DOC_LANGUAGE, DOC_METADATA]
 
+_ARTIFACTS_FLUSH_SIZE = 64
+
 
 async def create_markdown_extract_batches_act(
     docs: list[DocId] | DocumentSearchQuery | None,
@@ -162,12 +166,18 @@ async def create_markdown_extract_batches_act(
     output_dir: Path,
     target_n_pages_per_batch: int,
     es_client: ESClient | None = None,
+    search_slices: int = 1,
 ) -> AsyncIterable[Path]:
     # TODO: supported content types should be args
     query = _build_doc_query(docs, supported_exts)
+    # With several slices, docs are only sorted inside each slice, batches are
+    # hence less homogeneous
+    docs = _search_docs(
+        es_client, project, query, sort=_DOC_SORT, search_slices=search_slices
+    )
     docs = (
         _symlink_embedded_processed_doc_to_workdir(d, artifacts_root, workdir=workdir)
-        async for d in _search_docs(es_client, project, query, sort=_DOC_SORT)
+        async for d in docs
     )
     batches = _batch_by_n_pages(docs, target_n_pages_per_batch=target_n_pages_per_batch)
     async for p in _write_batches(batches, output_dir):
@@ -194,6 +204,7 @@ async def extract_markdown_content_act(
     docs = iter(docs)
     n_docs, n_pages, n_successes, n_successes_pages = 0, 0, 0, 0
     errors = []
+    artifacts = []
     manifest_entry_factory = partial(StructureManifestEntry.complete, args=args)
     async for extract_res in results:
         # Heartbeat explicitly to avoid heartbeat timeout
@@ -223,9 +234,15 @@ async def extract_markdown_content_act(
                 artifact=md_path,
                 manifest_entry=manifest_entry,
             )
-            write_artifact(artifacts_root, artifact)
+            artifacts.append(artifact)
+            # Flush in bounded chunks rather than once all docs are extracted
+            if len(artifacts) >= _ARTIFACTS_FLUSH_SIZE:
+                await async_write_artifacts(artifacts_root, artifacts)
+                artifacts = []
         if progress is not None:
             await progress(n_docs)
+    if artifacts:
+        await async_write_artifacts(artifacts_root, artifacts)
     processed = ProcessingReport(n_docs=n_docs, n_pages=n_pages)
     successes = ProcessingReport(n_docs=n_successes, n_pages=n_successes_pages)
     response = MarkdownExtractResponse(
@@ -261,11 +278,17 @@ def _build_doc_query(
 
 
 async def _search_docs(
-    es_client: ESClient, project: str, query: dict[str, Any], sort: ESSort = None
+    es_client: ESClient,
+    project: str,
+    query: dict[str, Any],
+    sort: ESSort = None,
+    search_slices: int = 1,
 ) -> AsyncIterable[ProcessedFile]:
-    async for page in es_client.poll_search_pages(
+    async for page in sliced_search_pages(
+        es_client,
         index=project,
         body=query,
+        n_slices=search_slices,
         sort=sort,
         _source_includes=_DOC_CONTENT_SOURCES,
     ):
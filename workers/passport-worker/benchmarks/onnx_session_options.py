@@ -0,0 +1,98 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from passport_worker.inference import YOLOPassportDetector
+from passport_worker.objects import (
+    ONNXExecutionMode,
+    ONNXGraphOptimizationLevel,
+    ONNXSessionConfig,
+    YOLOPassportDetectorConfig,
+)
+
+
+def _synthetic_pages(n_pages: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(42)
+    return [
+        rng.integers(0, 255, size=(1754, 1240, 3), dtype=np.uint8)
+        for _ in range(n_pages)
+    ]
+
+
+def _session_configs(
+    args: argparse.Namespace, optimized_path: Path
+) -> dict[str, ONNXSessionConfig]:
+    n_cpus = len(os.sched_getaffinity(0))
+    configs = {
+        "default": ONNXSessionConfig(),
+        "no optimization": ONNXSessionConfig(
+            graph_optimization_level=ONNXGraphOptimizationLevel.DISABLE_ALL
+        ),
+        "basic optimization": ONNXSessionConfig(
+            graph_optimization_level=ONNXGraphOptimizationLevel.BASIC
+        ),
+        "parallel execution": ONNXSessionConfig(
+            execution_mode=ONNXExecutionMode.PARALLEL
+        ),
+        "no memory arena": ONNXSessionConfig(enable_cpu_mem_arena=False),
+        # The first load saves the optimized model, the second one reuses it
+        "optimized model (save)": ONNXSessionConfig(
+            optimized_model_path=optimized_path
+        ),
+        "optimized model (load)": ONNXSessionConfig(
+            optimized_model_path=optimized_path
+        ),
+    }
+    for n_threads in args.threads:
+        configs[f"intra threads={n_threads}"] = ONNXSessionConfig(
+            intra_op_num_threads=n_threads
+        )
+        if n_threads <= n_cpus:
+            configs[f"intra threads={n_threads}, pinned"] = ONNXSessionConfig(
+                cpu_affinity=list(range(n_threads))
+            )
+    return configs
+
+
+def _bench(
+    model_path: Path,
+    session: ONNXSessionConfig,
+    pages: list[np.ndarray],
+    batch_size: int,
+) -> tuple[float, float]:
+    config = YOLOPassportDetectorConfig(model_path=model_path, session=session)
+    start = time.perf_counter()
+    with YOLOPassportDetector.from_config(config) as detector:
+        load_s = time.perf_counter() - start
+        ins = [detector.scale_image(page)[1:] for page in pages]
+        # Warm up the session before measuring
+        detector.detect_passports(ins[:batch_size])
+        start = time.perf_counter()
+        for i in range(0, len(ins), batch_size):
+            detector.detect_passports(ins[i : i + batch_size])
+        elapsed = time.perf_counter() - start
+    return load_s, len(pages) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="passport detection throughput for several ONNX session options"
+    )
+    parser.add_argument("--model-path", type=Path, required=True)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    pages = _synthetic_pages(args.pages)
+    with tempfile.TemporaryDirectory() as root:
+        optimized_path = Path(root) / "optimized.onnx"
+        for name, session in _session_configs(args, optimized_path).items():
+            load_s, rate = _bench(args.model_path, session, pages, args.batch_size)
+            print(f"{name}: load {load_s:.2f}s, {rate:.1f} pages/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+import cv2
+import numpy as np
+from datashare_python.objects import DocumentLocation, ProcessedPage, WorkerPaths
+from icij_common.registrable import RegistrableConfig
+from passport_service.core.object_detection import preprocess_image
+from passport_service.objects import ObjectDetection, Passport
+from passport_worker.inference import PassportDetector, detect_passports_act
+from passport_worker.objects import (
+    PassportDetectionArgs,
+    PassportDetectionConfig,
+    PassportInferenceConfig,
+    YOLOPassportDetectorConfig,
+)
+from passport_worker.utils import write_batches
+
+if TYPE_CHECKING:
+    from cv2.typing import MatLike
+
+_PROJECT = "bench-project"
+_DETECTION = ObjectDetection(class_id="passport", confidence=0.9, box=(1, 1, 1, 1))
+
+
+class _SimulatedPassportDetector(PassportDetector):
+    # Simulates the detection cost with a per page cost and the OCR with a per
+    # passport cost, both release the GIL as the ONNX runtime and tesseract do
+    def __init__(self, page_cost_s: float, mrz_cost_s: float, image_size: int):
+        self._page_cost_s = page_cost_s
+        self._mrz_cost_s = mrz_cost_s
+        self._image_size = image_size
+
+    def detect_passports(
+        self, ins: Sequence[tuple["MatLike", float]]
+    ) -> list[list[ObjectDetection]]:
+        time.sleep(len(ins) * self._page_cost_s)
+        return [[_DETECTION] for _ in ins]
+
+    def read_mrz(
+        self,
+        page: "np.array",  # noqa: ARG002
+        passport: ObjectDetection,
+        country_codes: list[str] | None = None,  # noqa: ARG002
+    ) -> Passport:
+        time.sleep(self._mrz_cost_s)
+        return Passport.from_detection(passport, None)
+
+    def scale_image(self, im: "MatLike") -> "tuple[np.ndarray, MatLike, float]":
+        return preprocess_image(im, self._image_size)
+
+    @classmethod
+    def _from_config(cls, config: RegistrableConfig, **extras) -> Self: ...  # noqa: ARG003
+
+
+def _write_synthetic_pages(paths: WorkerPaths, n_pages: int) -> list[ProcessedPage]:
+    rng = np.random.default_rng(42)
+    pages = []
+    for i in range(n_pages):
+        path = Path(f"page_{i}.png")
+        im = rng.integers(0, 255, size=(1754, 1240, 3), dtype=np.uint8)
+        cv2.imwrite(str(paths.filesystem / path), im)
+        page = ProcessedPage(
+            id=f"doc-{i // 4}",
+            path=path,
+            project=_PROJECT,
+            location=DocumentLocation.FILESYSTEM,
+            resource_name=path.name,
+            n_pages=4,
+            page_number=i % 4,
+        )
+        pages.append(page)
+    return pages
+
+
+async def _bench(
+    paths: WorkerPaths,
+    batch: Path,
+    detector: PassportDetector,
+    args: argparse.Namespace,
+    n_threads: int,
+) -> float:
+    detection_args = PassportDetectionArgs(
+        project=_PROJECT,
+        docs=None,
+        config=PassportDetectionConfig(
+            inference=PassportInferenceConfig(
+                passport_detector=YOLOPassportDetectorConfig(model_path=Path("unused"))
+            )
+        ),
+    )
+    start = time.perf_counter()
+    await detect_passports_act(
+        batch,
+        detector,
+        paths,
+        detection_args,
+        batch_size=args.batch_size,
+        n_decoding_threads=n_threads,
+        n_mrz_threads=n_threads,
+        prefetch_batches=args.prefetch_batches,
+    )
+    return time.perf_counter() - start
+
+
+def _sequential_reference(
+    paths: WorkerPaths,
+    pages: list[ProcessedPage],
+    detector: PassportDetector,
+    batch_size: int,
+) -> float:
+    # Decodes, detects and reads MRZs one step after another, as done before the
+    # pipeline was staged
+    start = time.perf_counter()
+    for i in range(0, len(pages), batch_size):
+        ims, detection_ins = [], []
+        for page in pages[i : i + batch_size]:
+            im, *detection_in = detector.scale_image(
+                cv2.imread(str(page.locate(paths)))
+            )
+            ims.append(im)
+            detection_ins.append(detection_in)
+        detections = detector.detect_passports(detection_ins)
+        for im, page_detections in zip(ims, detections, strict=True):
+            for detection in page_detections:
+                detector.read_mrz(im, detection)
+    return time.perf_counter() - start
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        paths = WorkerPaths(
+            filesystem=root / "fs", artifacts=root / "artifacts", workdir=root / "wd"
+        )
+        for p in (paths.filesystem, paths.artifacts, paths.workdir):
+            p.mkdir()
+        pages = _write_synthetic_pages(paths, args.pages)
+        batch = [b async for b in write_batches([pages], paths.workdir)][0]
+        detector = _SimulatedPassportDetector(
+            args.page_cost_s, args.mrz_cost_s, image_size=640
+        )
+        elapsed = _sequential_reference(paths, pages, detector, args.batch_size)
+        print(f"sequential: {args.pages / elapsed:.1f} pages/s")  # noqa: T201
+        for n_threads in args.threads:
+            elapsed = await _bench(paths, batch, detector, args, n_threads)
+            rate = args.pages / elapsed
+            print(f"staged, threads={n_threads}: {rate:.1f} pages/s")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="passport detection throughput on synthetic pages"
+    )
+    parser.add_argument("--pages", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--prefetch-batches", type=int, default=2)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--page-cost-s", type=float, default=0.005)
+    parser.add_argument("--mrz-cost-s", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
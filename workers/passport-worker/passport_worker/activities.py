@@ -19,8 +19,10 @@ from datashare_python.utils import (
     config_cache_key,
     enter_cm,
 )
+from temporalio import activity
 
 from .aggregate import aggregate_results_act
+from .batching import AdaptiveBatchSizer
 from .config import PassportWorkerConfig
 from .dependencies import (
     lifespan_image_preprocessor_cache,
@@ -58,6 +60,10 @@ _CONVERT_TO_PDF_WEIGHT = _BASE_WEIGHT * 7
 _PREPROCESS_PDF_WEIGHT = _BASE_WEIGHT * 3
 _CREATE_INFERENCE_BATCH_WEIGHT = _CREATE_PREPROCESSING_BATCHES_WEIGHT * 1
 
+_DETECTION_BATCH_SIZE_METRIC = "passport_detection_batch_size"
+# Batch sizers by detector cache key
+_BATCH_SIZERS: dict[str, AdaptiveBatchSizer] = dict()
+
 
 class Activity(StrEnum):
     CREATE_PREPROCESSING_BATCHES = "passport-detection.create-preprocessing-batches"
@@ -94,6 +100,7 @@ class PassportDetectionActivities(ActivityWithProgress):
             worker_config.paths,
             target_n_pages_per_batch,
             output_root=output_root,
+            search_slices=worker_config.elasticsearch.search_slices,
         )
 
     @activity_defn(name=Activity.PREPROCESS_IMAGES)
@@ -247,7 +254,7 @@ class PassportDetectionActivities(ActivityWithProgress):
     ) -> Path:
         logger.info("loading passport detector...")
         worker_config = cast(PassportWorkerConfig, lifespan_worker_config())
-        batch_size = worker_config.inference.batch_size
+        inference_config = worker_config.inference
         cache = lifespan_passport_detector_cache()
         passport_detector_config = args.config.inference.passport_detector
         passport_detector_key = config_cache_key(passport_detector_config)
@@ -258,6 +265,15 @@ class PassportDetectionActivities(ActivityWithProgress):
             passport_detector_key, passport_detector_factory
         )
         logger.info("passport detector loaded !")
+        batch_sizer = None
+        if inference_config.adaptive_batching is not None:
+            # The best batch size depends on the detector, it's hence shared by all
+            # the activities using it. It's kept out of the detector cache to avoid
+            # evicting the detector
+            batch_sizer = _BATCH_SIZERS.get(passport_detector_key)
+            if batch_sizer is None:
+                batch_sizer = inference_config.adaptive_batching.to_batch_sizer()
+                _BATCH_SIZERS[passport_detector_key] = batch_sizer
         workdir = worker_config.paths.workdir
         res_root = activity_workdir(workdir, args.project, act_context=True)
         res_root.mkdir(parents=True, exist_ok=True)
@@ -266,9 +282,18 @@ class PassportDetectionActivities(ActivityWithProgress):
             passport_detector,
             worker_config.paths,
             args,
-            batch_size=batch_size,
+            batch_size=inference_config.batch_size,
             progress=progress,
+            n_decoding_threads=inference_config.n_decoding_threads,
+            n_mrz_threads=inference_config.n_mrz_threads,
+            prefetch_batches=inference_config.prefetch_batches,
+            batch_sizer=batch_sizer,
         )
+        if batch_sizer is not None:
+            logger.info("detection batch size: %s", batch_sizer.batch_size)
+            activity.metric_meter().create_gauge(
+                _DETECTION_BATCH_SIZE_METRIC, "passport detection batch size"
+            ).set(batch_sizer.batch_size)
         result_path = res_root / "inference_results.json"
         async with async_open(result_path, "w") as f:
             await f.write(res.model_dump_json())
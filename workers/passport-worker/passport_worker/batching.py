@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from statistics import mean
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveBatchSizer:
+    # Probes increasing power of 2 batch sizes, stops when the throughput stops
+    # increasing and settles on the fastest one. The batch size is halved when the
+    # available memory runs low and doubled back after recover_after_batches
+    # batches without memory pressure
+    def __init__(
+        self,
+        *,
+        min_batch_size: int = 1,
+        max_batch_size: int = 64,
+        probe_batches: int = 2,
+        min_available_memory_ratio: float = 0.1,
+        memory_check_interval_s: float = 1.0,
+        recover_after_batches: int = 16,
+    ) -> None:
+        if min_batch_size < 1:
+            raise ValueError(f"min_batch_size must be >= 1, found {min_batch_size}")
+        if max_batch_size < min_batch_size:
+            msg = f"max_batch_size must be >= {min_batch_size}, found {max_batch_size}"
+            raise ValueError(msg)
+        self._min_batch_size = min_batch_size
+        self._max_batch_size = max_batch_size
+        self._probe_batches = probe_batches
+        self._min_available_memory_ratio = min_available_memory_ratio
+        self._memory_check_interval_s = memory_check_interval_s
+        self._last_memory_check: float | None = None
+        self._recover_after_batches = recover_after_batches
+        self._n_batches_since_shrink = 0
+        self._candidates = _candidate_sizes(min_batch_size, max_batch_size)
+        self._candidate_i = 0
+        self._throughputs: dict[int, list[float]] = defaultdict(list)
+        self._settled: int | None = None
+        self._ceiling = max_batch_size
+        self._warmed_up = False
+        self._lock = threading.Lock()
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    @property
+    def is_settled(self) -> bool:
+        return self._settled is not None
+
+    @property
+    def batch_size(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            last_check = self._last_memory_check
+            if last_check is None or now - last_check >= self._memory_check_interval_s:
+                self._last_memory_check = now
+                if _is_under_memory_pressure(self._min_available_memory_ratio):
+                    self._shrink(self._current())
+                else:
+                    self._maybe_recover()
+            return self._current()
+
+    def record(self, batch_size: int, elapsed_s: float) -> None:
+        with self._lock:
+            self._n_batches_since_shrink += 1
+            if not self._warmed_up:
+                # The first batch pays for the session warm-up and isn't measured
+                self._warmed_up = True
+                return
+            if self._settled is not None or elapsed_s <= 0:
+                return
+            candidate = self._candidates[self._candidate_i]
+            if batch_size != candidate:
+                return
+            self._throughputs[candidate].append(batch_size / elapsed_s)
+            if len(self._throughputs[candidate]) < self._probe_batches:
+                return
+            self._next_candidate()
+
+    def shrink(self, batch_size: int) -> int:
+        with self._lock:
+            self._shrink(batch_size)
+            return self._current()
+
+    def _current(self) -> int:
+        if self._settled is not None:
+            return min(self._settled, self._ceiling)
+        return min(self._candidates[self._candidate_i], self._ceiling)
+
+    def _next_candidate(self) -> None:
+        current = self._candidates[self._candidate_i]
+        throughput = mean(self._throughputs[current])
+        logger.debug("batch size %s: %.1f items/s", current, throughput)
+        if self._candidate_i > 0:
+            previous = self._candidates[self._candidate_i - 1]
+            if throughput <= mean(self._throughputs[previous]):
+                self._settle()
+                return
+        is_last = self._candidate_i == len(self._candidates) - 1
+        if is_last or self._candidates[self._candidate_i + 1] > self._ceiling:
+            self._settle()
+            return
+        self._candidate_i += 1
+
+    def _settle(self) -> None:
+        best, throughput = max(
+            ((size, mean(t)) for size, t in self._throughputs.items()),
+            key=lambda x: x[1],
+        )
+        self._settled = best
+        logger.info(
+            "settled on a batch size of %s (%.1f items/s)", self._settled, throughput
+        )
+
+    def _shrink(self, batch_size: int) -> None:
+        ceiling = max(self._min_batch_size, batch_size // 2)
+        if ceiling >= self._ceiling:
+            return
+        self._ceiling = ceiling
+        self._n_batches_since_shrink = 0
+        logger.warning("memory is running low, reducing batch size to %s", ceiling)
+
+    def _maybe_recover(self) -> None:
+        # While the ceiling is below the probed size, batches don't match the
+        # probed size and probing is paused until the ceiling recovers
+        if self._ceiling >= self._max_batch_size:
+            return
+        if self._n_batches_since_shrink < self._recover_after_batches:
+            return
+        self._ceiling = min(self._max_batch_size, self._ceiling * 2)
+        self._n_batches_since_shrink = 0
+        logger.info("memory recovered, raising batch size ceiling to %s", self._ceiling)
+
+
+def _candidate_sizes(min_batch_size: int, max_batch_size: int) -> list[int]:
+    sizes = [min_batch_size]
+    while sizes[-1] * 2 < max_batch_size:
+        sizes.append(sizes[-1] * 2)
+    if sizes[-1] != max_batch_size:
+        sizes.append(max_batch_size)
+    return sizes
+
+
+_MEMINFO_PATH = Path("/proc/meminfo")
+_MEM_AVAILABLE = "MemAvailable"
+_MEM_TOTAL = "MemTotal"
+
+
+def _is_under_memory_pressure(min_available_ratio: float) -> bool:
+    # Free memory excludes the page cache and is hence always low on Linux, we rely
+    # on the available memory estimated by the kernel instead
+    try:
+        meminfo = _MEMINFO_PATH.read_text()
+    except OSError:
+        return False
+    values = {}
+    for line in meminfo.splitlines():
+        key, _, value = line.partition(":")
+        if key in (_MEM_AVAILABLE, _MEM_TOTAL):
+            values[key] = int(value.split()[0])
+    if len(values) != 2 or not values[_MEM_TOTAL]:
+        return False
+    return values[_MEM_AVAILABLE] / values[_MEM_TOTAL] < min_available_ratio
@@ -13,6 +13,8 @@ from datashare_python.objects import DatashareModel, WorkerPaths
 from icij_common.registrable import RegistrableConfig
 from pydantic import Field
 
+from .batching import AdaptiveBatchSizer
+
 _ALL_LOGGERS = [datashare_python.__name__, __name__, "__main__"]
 
 _DEFAULT_LOGGERS = {
@@ -78,9 +80,39 @@ class PreprocessingWorkerConfig(DatashareModel):
         return self.images.to_image_preprocessing_executor()
 
 
+class AdaptiveBatchingConfig(DatashareModel):
+    min_batch_size: int = 1
+    max_batch_size: int = 64
+    # Number of batches measured for each probed size
+    probe_batches: int = 2
+    min_available_memory_ratio: float = 0.1
+    memory_check_interval_s: float = 1.0
+    # Number of batches without memory pressure before growing back the batch size
+    recover_after_batches: int = 16
+
+    def to_batch_sizer(self) -> AdaptiveBatchSizer:
+        return AdaptiveBatchSizer(
+            min_batch_size=self.min_batch_size,
+            max_batch_size=self.max_batch_size,
+            probe_batches=self.probe_batches,
+            min_available_memory_ratio=self.min_available_memory_ratio,
+            memory_check_interval_s=self.memory_check_interval_s,
+            recover_after_batches=self.recover_after_batches,
+        )
+
+
 class InferenceWorkerConfig(DatashareModel):
     batch_size: int = 32
+    # When set, the detection batch size is adapted to the measured throughput and
+    # the batch_size is ignored
+    adaptive_batching: AdaptiveBatchingConfig | None = None
     batches_per_task: int = 5
+    # Pages are decoded and scaled by a thread pool, up to prefetch_batches ahead of
+    # the detection
+    n_decoding_threads: int = 4
+    prefetch_batches: int = 2
+    # MRZs are read by a separate thread pool while the next batch is detected
+    n_mrz_threads: int = 4
 
 
 class PreprocessingCacheConfig(DatashareModel):
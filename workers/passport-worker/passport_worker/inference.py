@@ -1,12 +1,26 @@
 import asyncio
 import csv
+import gc
 import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterable, Iterable, Sequence
-from functools import cache
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Generator,
+    Iterable,
+    Sequence,
+)
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AsyncExitStack, contextmanager
+from functools import cache, partial
 from pathlib import Path
 from types import TracebackType
 from typing import TYPE_CHECKING, Self
+from uuid import uuid4
 
 from aiofile import async_open
 from datashare_python.objects import (
@@ -18,10 +32,11 @@ from datashare_python.objects import (
 from datashare_python.types_ import AsyncProgressRateHandler, RawAsyncProgressHandler
 from datashare_python.utils import (
     async_read_jsonl_as,
+    async_write_artifact,
+    prefetch,
     read_jsonl_as,
     to_incremental_async_progress,
     to_raw_async_progress,
-    write_artifact,
 )
 from icij_common.iter_utils import async_batches
 from icij_common.registrable import (
@@ -31,8 +46,12 @@ from passport_service import DATA_DIR
 from passport_service.exceptions import InvalidImage
 from passport_service.objects import ObjectDetection, Passport
 
+from passport_worker.batching import AdaptiveBatchSizer
 from passport_worker.objects import (
     FileProcessingError,
+    ONNXExecutionMode,
+    ONNXGraphOptimizationLevel,
+    ONNXSessionConfig,
     PagePassports,
     PartialDetectionResult,
     PassportArtifact,
@@ -48,8 +67,12 @@ from passport_worker.utils import write_batches
 if TYPE_CHECKING:
     import numpy as np
     from cv2.typing import MatLike
+    from onnxruntime import InferenceSession, SessionOptions
 
 DetectionInputs = tuple["MatLike", float]
+BatchDetections = tuple[
+    tuple[ProcessedFile, ...], tuple["np.ndarray", ...], list[list[ObjectDetection]]
+]
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +151,11 @@ async def detect_passports_act(  # noqa: PLR0917
     args: PassportDetectionArgs,
     batch_size: int = 16,
     progress: AsyncProgressRateHandler | None = None,
+    *,
+    n_decoding_threads: int = 4,
+    n_mrz_threads: int = 4,
+    prefetch_batches: int = 2,
+    batch_sizer: AdaptiveBatchSizer | None = None,
 ) -> PartialDetectionResult:
     n_pages = await _count_pages(batch)
     if progress is not None:
@@ -135,31 +163,80 @@ async def detect_passports_act(  # noqa: PLR0917
             to_raw_async_progress(progress, n_pages)
         )
     read_errors = []
-    im_batches = async_batches(
-        _read_images(batch, passport_detector, paths, read_errors), batch_size
-    )
     read_mrz = args.config.inference.passport_detector.read_mrz
-    detection_outs = (
-        await _detect_passport_pages(
-            b, passport_detector, read_mrz=read_mrz, progress=progress
-        )
-        async for b in im_batches
+    decoding_pool = ThreadPoolExecutor(
+        n_decoding_threads, thread_name_prefix="passport-decoding"
     )
-    detection_outs = [
-        p async for batch_passports in detection_outs for p in batch_passports
-    ]
+    mrz_pool = ThreadPoolExecutor(n_mrz_threads, thread_name_prefix="passport-mrz")
+    try:
+        async with AsyncExitStack() as stages:
+            # Each stage is closed when the stage downstream fails, so that producers
+            # running ahead are stopped rather than left pending
+            def staged[T](it: AsyncGenerator[T, None]) -> AsyncGenerator[T, None]:
+                stages.push_async_callback(it.aclose)
+                return it
+
+            # Pages are decoded and scaled ahead of the detection, the MRZs of a
+            # batch are read while the next one is detected, this way the detector
+            # never waits for the disk or the OCR
+            if batch_sizer is not None:
+                batch_size = batch_sizer.max_batch_size
+            ims = staged(
+                _read_images(
+                    batch,
+                    passport_detector,
+                    paths,
+                    read_errors,
+                    executor=decoding_pool,
+                    max_in_flight=prefetch_batches * batch_size,
+                )
+            )
+            if batch_sizer is not None:
+                im_batches = _sized_batches(ims, lambda: batch_sizer.batch_size)
+            else:
+                im_batches = async_batches(ims, batch_size)
+            im_batches = staged(im_batches)
+            im_batches = staged(prefetch(im_batches, max_buffered=prefetch_batches))
+            detections = staged(
+                await _detect_passport_pages(
+                    b, passport_detector, batch_sizer=batch_sizer
+                )
+                async for b in im_batches
+            )
+            detections = staged(prefetch(detections))
+            detection_outs = staged(
+                await _read_mrzs(
+                    d,
+                    passport_detector,
+                    read_mrz=read_mrz,
+                    executor=mrz_pool,
+                    progress=progress,
+                )
+                async for d in detections
+            )
+            detection_outs = staged(
+                p async for batch_passports in detection_outs for p in batch_passports
+            )
+            # Pages are sorted by doc, each doc artifact is written as soon as its
+            # last page is processed instead of holding the whole task results in
+            # memory
+            n_success = 0
+            n_success_pages = 0
+            with_artifacts = set()
+            doc_artifacts = staged(
+                _aggregate_doc_passports(detection_outs, read_errors, args)
+            )
+            async for passport_artifact, n_doc_success_pages in doc_artifacts:
+                await async_write_artifact(paths.artifacts, passport_artifact)
+                status = passport_artifact.manifest_entry.status
+                if status is ManifestEntryStatus.COMPLETE:
+                    n_success += 1
+                with_artifacts.add(passport_artifact.doc_id)
+                n_success_pages += n_doc_success_pages
+    finally:
+        decoding_pool.shutdown(wait=False, cancel_futures=True)
+        mrz_pool.shutdown(wait=False, cancel_futures=True)
     incomplete = {e.file.id for e in read_errors}
-    n_success = 0
-    n_success_pages = 0
-    with_artifacts = set()
-    for passport_artifact, n_doc_success_pages in _aggregate_doc_passports(
-        detection_outs, incomplete, args
-    ):
-        if passport_artifact.manifest_entry.status is ManifestEntryStatus.COMPLETE:
-            n_success += 1
-        with_artifacts.add(passport_artifact.doc_id)
-        write_artifact(paths.artifacts, passport_artifact)
-        n_success_pages += n_doc_success_pages
     n_errors = len(incomplete)
     if progress is not None:
         await progress(n_errors)
@@ -180,50 +257,135 @@ async def _count_pages(batch: Path) -> int:
     return n_pages
 
 
-async def _read_images(
-    batch: Path, passport_detector: PassportDetector, paths: WorkerPaths, errors: list
-) -> AsyncIterable[tuple[ProcessedFile, "np.ndarray", "DetectionInputs"]]:
+async def _read_images(  # noqa: PLR0917
+    batch: Path,
+    passport_detector: PassportDetector,
+    paths: WorkerPaths,
+    errors: list,
+    *,
+    executor: Executor | None = None,
+    max_in_flight: int = 1,
+) -> AsyncGenerator[tuple[ProcessedFile, "np.ndarray", "DetectionInputs"], None]:
+    # Pages are read in the executor, up to max_in_flight pages ahead of the consumer,
+    # and yielded in order
+    loop = asyncio.get_running_loop()
+    read_image = partial(_read_image, passport_detector=passport_detector, paths=paths)
+    in_flight: deque[tuple[ProcessedPage, asyncio.Future]] = deque()
+    try:
+        for page in read_jsonl_as(paths.workdir / batch, ProcessedPage):
+            in_flight.append((page, loop.run_in_executor(executor, read_image, page)))
+            if len(in_flight) < max_in_flight:
+                continue
+            if (read := await _next_image(in_flight, errors)) is not None:
+                yield read
+        while in_flight:
+            if (read := await _next_image(in_flight, errors)) is not None:
+                yield read
+    finally:
+        for _, fut in in_flight:
+            fut.cancel()
+
+
+def _read_image(
+    page: ProcessedPage, *, passport_detector: PassportDetector, paths: WorkerPaths
+) -> "tuple[np.ndarray, MatLike, float]":
     import cv2  # noqa: PLC0415
 
-    for page in read_jsonl_as(paths.workdir / batch, ProcessedPage):
-        page_path = page.locate(paths)
-        try:
-            if not page_path.exists():
-                raise FileNotFoundError(f"{page_path} doesn't exist")
-            im = cv2.imread(str(page_path))
-            if im is None:
-                raise InvalidImage(page_path)
-        except (InvalidImage, FileNotFoundError) as e:
-            logger.error("couldn't read page %s of doc %s!", page_path, page)
-            errors.append(FileProcessingError.from_exception(page, e))
-            continue
-        im, *detection_in = passport_detector.scale_image(im)
-        yield page, im, detection_in
+    page_path = page.locate(paths)
+    if not page_path.exists():
+        raise FileNotFoundError(f"{page_path} doesn't exist")
+    im = cv2.imread(str(page_path))
+    if im is None:
+        raise InvalidImage(page_path)
+    return passport_detector.scale_image(im)
+
+
+async def _next_image(
+    in_flight: deque[tuple[ProcessedPage, asyncio.Future]], errors: list
+) -> tuple[ProcessedFile, "np.ndarray", "DetectionInputs"] | None:
+    page, fut = in_flight.popleft()
+    try:
+        im, *detection_in = await fut
+    except (InvalidImage, FileNotFoundError) as e:
+        logger.error("couldn't read page %s of doc %s!", page.page_number, page.id)
+        errors.append(FileProcessingError.from_exception(page, e))
+        return None
+    return page, im, detection_in
+
+
+async def _sized_batches[T](
+    items: AsyncIterable[T], batch_size: Callable[[], int]
+) -> AsyncGenerator[list[T], None]:
+    # The batch size is read for each batch, and can hence change along the way
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size():
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 async def _detect_passport_pages(
     batch: Iterable[tuple[ProcessedFile, "np.ndarray", "DetectionInputs"]],
     passport_detector: PassportDetector,
     *,
+    batch_sizer: AdaptiveBatchSizer | None = None,
+) -> BatchDetections:
+    batch = list(batch)
+    doc_pages, doc_page_ims, detection_ins = zip(*batch, strict=True)
+    start = time.perf_counter()
+    try:
+        passport_pages = await asyncio.to_thread(
+            passport_detector.detect_passports, detection_ins
+        )
+    except MemoryError:
+        if batch_sizer is None or len(batch) == 1:
+            raise
+        # Shrink future batches and retry this one in halves
+        batch_sizer.shrink(len(batch))
+        half = len(batch) // 2
+        first = await _detect_passport_pages(
+            batch[:half], passport_detector, batch_sizer=batch_sizer
+        )
+        second = await _detect_passport_pages(
+            batch[half:], passport_detector, batch_sizer=batch_sizer
+        )
+        return tuple(f + s for f, s in zip(first, second, strict=True))
+    if batch_sizer is not None:
+        batch_sizer.record(len(batch), time.perf_counter() - start)
+    return doc_pages, doc_page_ims, passport_pages
+
+
+async def _read_mrzs(
+    detections: BatchDetections,
+    passport_detector: PassportDetector,
+    *,
     read_mrz: bool,
+    executor: Executor | None = None,
     progress: RawAsyncProgressHandler | None = None,
 ) -> list[tuple[ProcessedFile, list[Passport]]]:
-    doc_pages, doc_page_ims, detection_ins = zip(*batch, strict=True)
-    passport_pages = await asyncio.to_thread(
-        passport_detector.detect_passports, detection_ins
-    )
+    doc_pages, doc_page_ims, passport_pages = detections
     if read_mrz:
-        passports = [
-            [
-                await asyncio.to_thread(
-                    passport_detector.read_mrz, doc_page_im, passport_page
+        loop = asyncio.get_running_loop()
+        # MRZs of all the batch passports are read in parallel
+        passports = await asyncio.gather(
+            *(
+                asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            executor, passport_detector.read_mrz, page_im, passport
+                        )
+                        for passport in page_passports
+                    )
+                )
+                for page_im, page_passports in zip(
+                    doc_page_ims, passport_pages, strict=True
                 )
-                for passport_page in doc_page_passport_pages
-            ]
-            for doc_page_im, doc_page_passport_pages in zip(
-                doc_page_ims, passport_pages, strict=True
             )
-        ]
+        )
+        passports = [list(page_passports) for page_passports in passports]
     else:
         passports = [
             [
@@ -237,33 +399,38 @@ async def _detect_passport_pages(
     return list(zip(doc_pages, passports, strict=True))
 
 
-def _aggregate_doc_passports(
-    detection_outs: Iterable[tuple[ProcessedPage, list[Passport]]],
-    incomplete: set[str],
+async def _aggregate_doc_passports(
+    detection_outs: AsyncIterable[tuple[ProcessedPage, list[Passport]]],
+    read_errors: list[FileProcessingError],
     args: PassportDetectionArgs,
-) -> Iterable[tuple[PassportArtifact, int]]:
+) -> AsyncGenerator[tuple[PassportArtifact, int], None]:
+    # Pages are read in order, when the page of a new doc is detected, all the pages
+    # of the previous one have already been read and their errors recorded
     current_doc = None
     doc_pages_passports = []
-    for page, page_passports in detection_outs:
+    async for page, page_passports in detection_outs:
         if current_doc is None:
             current_doc = page
         if current_doc.id != page.id:
-            is_complete = current_doc.id not in incomplete
-            n_pages = len(doc_pages_passports)
-            artifact = _passport_artifact_from_passports(
-                current_doc, doc_pages_passports, args, is_complete=is_complete
-            )
-            yield (artifact, n_pages)
+            yield _doc_artifact(current_doc, doc_pages_passports, read_errors, args)
             doc_pages_passports = []
             current_doc = page
         doc_pages_passports.append((page.page_number, page_passports))
     if current_doc:
-        is_complete = current_doc.id not in incomplete
-        n_pages = len(doc_pages_passports)
-        artifact = _passport_artifact_from_passports(
-            current_doc, doc_pages_passports, args, is_complete=is_complete
-        )
-        yield (artifact, n_pages)
+        yield _doc_artifact(current_doc, doc_pages_passports, read_errors, args)
+
+
+def _doc_artifact(
+    doc: ProcessedPage,
+    pages_with_passports: list[tuple[int, list[Passport]]],
+    read_errors: list[FileProcessingError],
+    args: PassportDetectionArgs,
+) -> tuple[PassportArtifact, int]:
+    is_complete = not any(e.file.id == doc.id for e in read_errors)
+    artifact = _passport_artifact_from_passports(
+        doc, pages_with_passports, args, is_complete=is_complete
+    )
+    return artifact, len(pages_with_passports)
 
 
 def _passport_artifact_from_passports(
@@ -302,16 +469,91 @@ def default_country_codes() -> list[str]:
     return countries
 
 
+_ONNX_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+_INTRA_OP_THREAD_AFFINITIES = "session.intra_op_thread_affinities"
+
+
+@contextmanager
+def onnx_session(
+    model_path: Path, config: ONNXSessionConfig
+) -> Generator["InferenceSession", None, None]:
+    import onnxruntime as rt  # noqa: PLC0415
+
+    options = onnx_session_options(config)
+    optimized_path = config.optimized_model_path
+    tmp_optimized_path = None
+    if optimized_path is not None:
+        if optimized_path.exists():
+            # The model was already optimized, there's no need to do it again
+            logger.info("loading optimized model from %s", optimized_path)
+            model_path = optimized_path
+            options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            # The optimized model is written to a temp file and renamed once
+            # complete, other workers hence never load a partially written model.
+            # The suffix is kept since ORT uses it to pick the serialization format
+            optimized_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_optimized_path = optimized_path.with_name(
+                f".{optimized_path.stem}.{uuid4().hex}.tmp{optimized_path.suffix}"
+            )
+            options.optimized_model_filepath = str(tmp_optimized_path)
+    try:
+        sess = rt.InferenceSession(
+            str(model_path), providers=_ONNX_PROVIDERS, sess_options=options
+        )
+        if tmp_optimized_path is not None:
+            os.replace(tmp_optimized_path, optimized_path)
+    finally:
+        if tmp_optimized_path is not None:
+            tmp_optimized_path.unlink(missing_ok=True)
+    try:
+        yield sess
+    finally:
+        del sess
+        gc.collect()
+
+
+def onnx_session_options(config: ONNXSessionConfig) -> "SessionOptions":
+    import onnxruntime as rt  # noqa: PLC0415
+
+    options = rt.SessionOptions()
+    n_intra_threads = config.intra_op_num_threads
+    if config.cpu_affinity:
+        if not n_intra_threads:
+            n_intra_threads = len(config.cpu_affinity)
+        # The first intra op thread is the caller thread, the other ones are pinned
+        # using 1-based logical processor ids
+        cpus = [str(cpu + 1) for cpu in config.cpu_affinity]
+        affinities = ";".join(cpus[i % len(cpus)] for i in range(1, n_intra_threads))
+        if affinities:
+            options.add_session_config_entry(_INTRA_OP_THREAD_AFFINITIES, affinities)
+    options.intra_op_num_threads = n_intra_threads
+    options.inter_op_num_threads = config.inter_op_num_threads
+    match config.execution_mode:
+        case ONNXExecutionMode.SEQUENTIAL:
+            options.execution_mode = rt.ExecutionMode.ORT_SEQUENTIAL
+        case ONNXExecutionMode.PARALLEL:
+            options.execution_mode = rt.ExecutionMode.ORT_PARALLEL
+    match config.graph_optimization_level:
+        case ONNXGraphOptimizationLevel.DISABLE_ALL:
+            level = rt.GraphOptimizationLevel.ORT_DISABLE_ALL
+        case ONNXGraphOptimizationLevel.BASIC:
+            level = rt.GraphOptimizationLevel.ORT_ENABLE_BASIC
+        case ONNXGraphOptimizationLevel.EXTENDED:
+            level = rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        case ONNXGraphOptimizationLevel.ALL:
+            level = rt.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.graph_optimization_level = level
+    options.enable_cpu_mem_arena = config.enable_cpu_mem_arena
+    return options
+
+
 @PassportDetector.register(PassportDetectorType.YOLO)
 class YOLOPassportDetector(PassportDetector):
     def __init__(self, config: YOLOPassportDetectorConfig):
-        from passport_service.core.object_detection import (  # noqa:PLC0415
-            inference_session,
-        )
-
         self._config = config
         self._path = self._config.model_path
-        self._sess_cm = inference_session(self._path)
+        self._sess_cm = onnx_session(self._path, self._config.session)
         self._classes = [self._config.passport_label]
         self._image_size = self._config.image_size
         self._detection_threshold = self._config.detection_threshold
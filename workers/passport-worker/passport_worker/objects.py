@@ -77,6 +77,35 @@ class PassportDetectorConfigBase(DatashareModel, RegistrableConfig):
     mzr_country_codes: list[str] | None = None
 
 
+class ONNXGraphOptimizationLevel(StrEnum):
+    DISABLE_ALL = "disable_all"
+    BASIC = "basic"
+    EXTENDED = "extended"
+    ALL = "all"
+
+
+class ONNXExecutionMode(StrEnum):
+    SEQUENTIAL = "sequential"
+    PARALLEL = "parallel"
+
+
+class ONNXSessionConfig(DatashareModel):
+    # 0 lets the ONNX runtime pick the number of threads
+    intra_op_num_threads: int = 0
+    inter_op_num_threads: int = 0
+    execution_mode: ONNXExecutionMode = ONNXExecutionMode.SEQUENTIAL
+    graph_optimization_level: ONNXGraphOptimizationLevel = (
+        ONNXGraphOptimizationLevel.ALL
+    )
+    enable_cpu_mem_arena: bool = True
+    # The optimized model is saved there on the first load and reused afterwards,
+    # it's specific to the host hardware
+    optimized_model_path: Path | None = None
+    # Logical CPUs the intra op threads are pinned to, to avoid oversubscribing
+    # cores when several workers share a host
+    cpu_affinity: list[int] | None = None
+
+
 class YOLOPassportDetectorConfig(PassportDetectorConfigBase):
     type: ClassVar[PassportDetectorType] = Field(
         frozen=True, default=PassportDetectorType.YOLO
@@ -89,6 +118,7 @@ class YOLOPassportDetectorConfig(PassportDetectorConfigBase):
     nms_score_threshold: float = DEFAULT_NMS_SCORE_THRESHOLD
     nms_eta: float = DEFAULT_NMS_ETA
     image_size: int = 640
+    session: ONNXSessionConfig = Field(default_factory=ONNXSessionConfig)
 
 
 # TODO: use a tagged union here when we have more implem
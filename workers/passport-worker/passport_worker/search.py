@@ -1,9 +1,12 @@
+import asyncio
 from collections.abc import AsyncIterable
+from functools import partial
 from itertools import chain
 from pathlib import Path
 from typing import Any
 
 from datashare_python.objects import Document, WorkerPaths
+from datashare_python.search import sliced_search_pages
 from datashare_python.utils import (
     ext_to_mime_types,
     symlink_embedded_document_to_workdir,
@@ -40,6 +43,7 @@ async def create_preprocessing_batches_act(  # noqa: PLR0917
     *,
     supported_image_exts: set[str] | None = None,
     supported_doc_exts: set[str] | None = None,
+    search_slices: int = 1,
 ) -> PreprocessingBatches:
     if supported_image_exts is None:
         supported_image_exts = pil_supported_extensions()
@@ -48,61 +52,53 @@ async def create_preprocessing_batches_act(  # noqa: PLR0917
     supported_image_exts -= {PDF_EXT}
     supported_doc_exts -= supported_image_exts
     pdf_query = _build_doc_query(docs, {PDF_EXT})
-    pdf_docs = _search_docs(pdf_query, es_client, project, sort=_DOC_SORT)
-    pdf_batches = [
-        b
-        async for b in _write_preprocessing_batches(
-            pdf_docs,
-            paths,
-            target_n_pages_per_batch,
-            output_root,
-            batch_offset=0,
-        )
-    ]
     im_query = _build_doc_query(docs, restrict_image_formats(supported_image_exts))
-    im_docs = _search_docs(im_query, es_client, project, sort=_DOC_SORT)
-    im_batches = [
-        b
-        async for b in _write_preprocessing_batches(
-            im_docs,
-            paths,
-            target_n_pages_per_batch,
-            output_root,
-            batch_offset=len(pdf_batches),
-        )
-    ]
     to_pdf_query = _build_doc_query(
         docs, restrict_to_pdf_file_formats(supported_doc_exts)
     )
-    to_pdf_docs = _search_docs(to_pdf_query, es_client, project, sort=_DOC_SORT)
-    to_pdf_batches = [
-        b
-        async for b in _write_preprocessing_batches(
-            to_pdf_docs,
-            paths,
-            target_n_pages_per_batch,
-            output_root,
-            batch_offset=len(pdf_batches) + len(im_batches),
-        )
-    ]
+    create_batches = partial(
+        _create_preprocessing_batches,
+        es_client=es_client,
+        project=project,
+        paths=paths,
+        target_n_pages_per_batch=target_n_pages_per_batch,
+        output_dir=output_root,
+        search_slices=search_slices,
+    )
+    # Queries are independent and batches of each kind are numbered in their own
+    # namespace, they can hence be searched and written concurrently
+    pdf_batches, im_batches, to_pdf_batches = await asyncio.gather(
+        create_batches(pdf_query, prefix=_PDF_BATCH_PREFIX),
+        create_batches(im_query, prefix=_IMAGE_BATCH_PREFIX),
+        create_batches(to_pdf_query, prefix=_TO_PDF_BATCH_PREFIX),
+    )
     return PreprocessingBatches(
         to_pdf=to_pdf_batches, images=im_batches, pdfs=pdf_batches
     )
 
 
-async def _write_preprocessing_batches(
-    docs: AsyncIterable[Document],
+_PDF_BATCH_PREFIX = "preprocessing_pdf_batch_"
+_IMAGE_BATCH_PREFIX = "preprocessing_image_batch_"
+_TO_PDF_BATCH_PREFIX = "preprocessing_to_pdf_batch_"
+
+
+async def _create_preprocessing_batches(  # noqa: PLR0917
+    query: dict[str, Any],
+    es_client: ESClient,
+    project: str,
     paths: WorkerPaths,
     target_n_pages_per_batch: int,
     output_dir: Path,
-    batch_offset: int,
-) -> AsyncIterable[Path]:
+    *,
+    prefix: str,
+    search_slices: int,
+) -> list[Path]:
+    docs = _search_docs(
+        query, es_client, project, sort=_DOC_SORT, search_slices=search_slices
+    )
     docs = (symlink_embedded_document_to_workdir(d, paths) async for d in docs)
     batches = _batch_by_n_pages(docs, target_n_pages_per_batch=target_n_pages_per_batch)
-    async for p in write_batches(
-        batches, output_dir, batch_offset, prefix="preprocessing_batch_"
-    ):
-        yield p
+    return [p async for p in write_batches(batches, output_dir, prefix=prefix)]
 
 
 def _build_doc_query(
@@ -136,11 +132,18 @@ _DOC_CONTENT_SOURCES = [DOC_PATH, DOC_ROOT_ID, DOC_LANGUAGE, DOC_METADATA]
 
 
 async def _search_docs(
-    query: dict[str, Any], es_client: ESClient, project: str, sort: ESSort = None
+    query: dict[str, Any],
+    es_client: ESClient,
+    project: str,
+    sort: ESSort = None,
+    search_slices: int = 1,
 ) -> AsyncIterable[ProcessedFile]:
-    async for page in es_client.poll_search_pages(
+    # With several slices, docs are only sorted inside each slice
+    async for page in sliced_search_pages(
+        es_client,
         index=project,
         body=query,
+        n_slices=search_slices,
         sort=sort,
         _source_includes=_DOC_CONTENT_SOURCES,
     ):
@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+import pytest
+from passport_worker import batching
+from passport_worker.batching import AdaptiveBatchSizer
+
+
+def _probe(sizer: AdaptiveBatchSizer, throughputs: dict[int, float]) -> None:
+    sizer.record(sizer.batch_size, 1.0)
+    for _ in range(100):
+        if sizer.is_settled:
+            return
+        size = sizer.batch_size
+        sizer.record(size, size / throughputs[size])
+
+
+@pytest.mark.parametrize(
+    ("throughputs", "expected_batch_size"),
+    [
+        # Throughput grows until 8 and then drops
+        ({1: 10.0, 2: 20.0, 4: 40.0, 8: 50.0, 16: 45.0, 32: 60.0}, 8),
+        # Throughput keeps growing, the max size is used
+        ({1: 10.0, 2: 20.0, 4: 40.0, 8: 50.0, 16: 55.0, 32: 60.0}, 32),
+        # Batching doesn't help
+        ({1: 10.0, 2: 10.0, 4: 10.0, 8: 10.0, 16: 10.0, 32: 10.0}, 1),
+    ],
+)
+def test_adaptive_batch_sizer_should_settle_on_fastest_batch_size(
+    throughputs: dict[int, float], expected_batch_size: int
+) -> None:
+    # Given
+    sizer = AdaptiveBatchSizer(min_batch_size=1, max_batch_size=32, probe_batches=2)
+    # When
+    _probe(sizer, throughputs)
+    # Then
+    assert sizer.is_settled
+    assert sizer.batch_size == expected_batch_size
+
+
+def test_adaptive_batch_sizer_should_shrink_under_memory_pressure() -> None:
+    # Given
+    sizer = AdaptiveBatchSizer(
+        min_batch_size=1,
+        max_batch_size=32,
+        probe_batches=1,
+        memory_check_interval_s=0.0,
+    )
+    _probe(sizer, {1: 10.0, 2: 20.0, 4: 40.0, 8: 80.0, 16: 160.0, 32: 320.0})
+    assert sizer.batch_size == 32
+    # When
+    with patch.object(batching, "_is_under_memory_pressure", return_value=True):
+        shrunk = sizer.batch_size
+    # Then
+    assert shrunk == 16
+    assert sizer.batch_size == 16
+
+
+def test_adaptive_batch_sizer_should_not_shrink_below_min_batch_size() -> None:
+    # Given
+    sizer = AdaptiveBatchSizer(min_batch_size=2, max_batch_size=8)
+    # When
+    for _ in range(5):
+        sizer.shrink(sizer.batch_size)
+    # Then
+    assert sizer.batch_size == 2
+
+
+def test_adaptive_batch_sizer_should_sample_memory_at_interval() -> None:
+    # Given
+    sizer = AdaptiveBatchSizer(memory_check_interval_s=60.0)
+    # When
+    with patch.object(
+        batching, "_is_under_memory_pressure", return_value=False
+    ) as under_pressure:
+        for _ in range(10):
+            _ = sizer.batch_size
+    # Then
+    under_pressure.assert_called_once()
+
+
+def test_adaptive_batch_sizer_should_recover_after_shrink() -> None:
+    # Given
+    sizer = AdaptiveBatchSizer(
+        min_batch_size=1,
+        max_batch_size=8,
+        probe_batches=1,
+        memory_check_interval_s=0.0,
+        recover_after_batches=2,
+    )
+    _probe(sizer, {1: 10.0, 2: 20.0, 4: 40.0, 8: 80.0})
+    assert sizer.batch_size == 8
+    sizer.shrink(8)
+    assert sizer.batch_size == 4
+    # When
+    with patch.object(batching, "_is_under_memory_pressure", return_value=False):
+        sizer.record(4, 1.0)
+        not_recovered = sizer.batch_size
+        sizer.record(4, 1.0)
+        recovered = sizer.batch_size
+    # Then
+    assert not_recovered == 4
+    assert recovered == 8
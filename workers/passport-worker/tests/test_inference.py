@@ -1,7 +1,11 @@
+import asyncio
 import json
 import os
+import threading
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
 import cv2
 import numpy as np
@@ -18,12 +22,17 @@ from datashare_python.utils import async_read_jsonl_as, safe_dir
 from icij_common.pydantic_utils import safe_copy
 from icij_common.registrable import FromConfig, RegistrableConfig
 from passport_service.objects import MRZ, ObjectDetection, Passport
+from passport_worker.batching import AdaptiveBatchSizer
 from passport_worker.config import PassportWorkerConfig
 from passport_worker.inference import (
     PassportDetector,
     YOLOPassportDetector,
+    _detect_passport_pages,
+    _read_mrzs,
     create_inference_batches_act,
     detect_passports_act,
+    onnx_session,
+    onnx_session_options,
 )
 from passport_worker.objects import (
     PagePassports,
@@ -31,6 +40,9 @@ from passport_worker.objects import (
     PassportDetectionConfig,
     PassportInferenceConfig,
     PassportManifestEntry,
+    ONNXExecutionMode,
+    ONNXGraphOptimizationLevel,
+    ONNXSessionConfig,
     Passports,
     ProcessingReport,
     YOLOPassportDetectorConfig,
@@ -291,6 +303,206 @@ async def test_detect_passports_act(
         assert passports == expected_passports
 
 
+class _FailingPassportDetector(MockPassportDetector):
+    def detect_passports(
+        self, ins: Sequence[tuple[MatLike, float]]
+    ) -> list[list[ObjectDetection]]:
+        try:
+            return super().detect_passports(ins)
+        except StopIteration as e:
+            raise RuntimeError("detection failed") from e
+
+
+async def test_detect_passports_act_should_write_docs_as_they_are_complete(
+    tmp_path: Path,
+) -> None:
+    # Given
+    worker_paths = WorkerPaths(
+        filesystem=tmp_path / "fs",
+        artifacts=tmp_path / "artifacts",
+        workdir=tmp_path / "workdir",
+    )
+    args = PassportDetectionArgs(
+        project=TEST_PROJECT,
+        docs=None,
+        config=PassportDetectionConfig(
+            inference=PassportInferenceConfig(
+                passport_detector=YOLOPassportDetectorConfig(model_path=Path("unused"))
+            )
+        ),
+    )
+    batch = [_DOC_6_PAGE_0, _DOC_7_PAGE_0, _DOC_0_PAGE_0]
+    _mock_pages(batch, worker_paths, errors=[])
+    batch = [b async for b in write_batches([batch], worker_paths.workdir)][0]
+    # Detection fails on doc-0 after doc-7 has been detected
+    passport_detector = _FailingPassportDetector(
+        [[[]], [[_DOC_7_PAGE_0_DETECTION]]], [_DOC_7_PAGE_0_PASSPORT]
+    )
+    # When
+    with pytest.raises(RuntimeError, match="detection failed"):
+        await detect_passports_act(
+            batch, passport_detector, worker_paths, args, batch_size=1
+        )
+    # Then
+    artifacts_root = worker_paths.artifacts / TEST_PROJECT
+    doc_6_manifest = artifacts_root / safe_dir("doc-6") / "doc-6" / "manifest.json"
+    assert doc_6_manifest.exists()
+    doc_0_manifest = artifacts_root / safe_dir("doc-0") / "doc-0" / "manifest.json"
+    assert not doc_0_manifest.exists()
+
+
+async def test_detect_passports_act_should_close_stages_on_failure(
+    tmp_path: Path,
+) -> None:
+    # Given
+    worker_paths = WorkerPaths(
+        filesystem=tmp_path / "fs",
+        artifacts=tmp_path / "artifacts",
+        workdir=tmp_path / "workdir",
+    )
+    args = PassportDetectionArgs(
+        project=TEST_PROJECT,
+        docs=None,
+        config=PassportDetectionConfig(
+            inference=PassportInferenceConfig(
+                passport_detector=YOLOPassportDetectorConfig(model_path=Path("unused"))
+            )
+        ),
+    )
+    batch = [_DOC_6_PAGE_0, _DOC_7_PAGE_0, _DOC_0_PAGE_0]
+    _mock_pages(batch, worker_paths, errors=[])
+    batch = [b async for b in write_batches([batch], worker_paths.workdir)][0]
+    passport_detector = MockPassportDetector([[[]], [[]], [[]]], [])
+    failing_write = AsyncMock(side_effect=OSError("disk full"))
+    # When
+    with (
+        patch("passport_worker.inference.async_write_artifact", failing_write),
+        pytest.raises(OSError, match="disk full"),
+    ):
+        await detect_passports_act(
+            batch, passport_detector, worker_paths, args, batch_size=1
+        )
+    # Then
+    # Upstream stages are closed rather than left running in the background
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+class _OOMPassportDetector(MockPassportDetector):
+    def __init__(self, max_batch_size: int):
+        super().__init__([], [])
+        self._max_batch_size = max_batch_size
+        self.batch_sizes = []
+
+    def detect_passports(
+        self, ins: Sequence[tuple[MatLike, float]]
+    ) -> list[list[ObjectDetection]]:
+        self.batch_sizes.append(len(ins))
+        if len(ins) > self._max_batch_size:
+            raise MemoryError()
+        return [[] for _ in ins]
+
+
+async def test_detect_passport_pages_should_split_batch_on_memory_error() -> None:
+    # Given
+    im = np.zeros((1, 1, 3), np.uint8)
+    pages = [_DOC_6_PAGE_0, _DOC_7_PAGE_0, _DOC_0_PAGE_0, _DOC_0_PAGE_1]
+    batch = [(p, im, (im, 1.0)) for p in pages]
+    passport_detector = _OOMPassportDetector(max_batch_size=2)
+    batch_sizer = AdaptiveBatchSizer(max_batch_size=4)
+    # When
+    doc_pages, _, detections = await _detect_passport_pages(
+        batch, passport_detector, batch_sizer=batch_sizer
+    )
+    # Then
+    assert list(doc_pages) == pages
+    assert detections == [[], [], [], []]
+    assert passport_detector.batch_sizes == [4, 2, 2]
+    assert batch_sizer.batch_size <= 2
+
+
+class _BarrierMRZDetector(MockPassportDetector):
+    def __init__(self, n_parties: int):
+        super().__init__([], [])
+        self._barrier = threading.Barrier(n_parties)
+
+    def read_mrz(
+        self,
+        page: "np.array",  # noqa: ARG002
+        passport: ObjectDetection,
+        country_codes: list[str] | None = None,  # noqa: ARG002
+    ) -> Passport:
+        # Would time out if MRZs were read one at a time
+        self._barrier.wait(timeout=1.0)
+        return Passport.from_detection(passport, None)
+
+
+async def test_read_mrzs_in_parallel() -> None:
+    # Given
+    pages = (_DOC_0_PAGE_0, _DOC_7_PAGE_0)
+    page_ims = (np.zeros((1, 1, 3), np.uint8), np.zeros((1, 1, 3), np.uint8))
+    detections = [
+        [_DOC_0_PAGE_0_DETECTION, _DOC_0_PAGE_0_DETECTION],
+        [_DOC_7_PAGE_0_DETECTION],
+    ]
+    passport_detector = _BarrierMRZDetector(n_parties=3)
+    # When
+    with ThreadPoolExecutor(3) as executor:
+        res = await _read_mrzs(
+            (pages, page_ims, detections),
+            passport_detector,
+            read_mrz=True,
+            executor=executor,
+        )
+    # Then
+    expected = [
+        (
+            _DOC_0_PAGE_0,
+            [Passport.from_detection(_DOC_0_PAGE_0_DETECTION, None)] * 2,
+        ),
+        (_DOC_7_PAGE_0, [_DOC_7_PAGE_0_PASSPORT]),
+    ]
+    assert res == expected
+
+
+def test_onnx_session_options() -> None:
+    # Given
+    import onnxruntime as rt  # noqa: PLC0415
+
+    config = ONNXSessionConfig(
+        inter_op_num_threads=2,
+        execution_mode=ONNXExecutionMode.PARALLEL,
+        graph_optimization_level=ONNXGraphOptimizationLevel.BASIC,
+        enable_cpu_mem_arena=False,
+        cpu_affinity=[0, 2, 4],
+    )
+    # When
+    options = onnx_session_options(config)
+    # Then
+    assert options.intra_op_num_threads == 3
+    assert options.inter_op_num_threads == 2
+    assert options.execution_mode == rt.ExecutionMode.ORT_PARALLEL
+    level = rt.GraphOptimizationLevel.ORT_ENABLE_BASIC
+    assert options.graph_optimization_level == level
+    assert not options.enable_cpu_mem_arena
+    affinities = options.get_session_config_entry("session.intra_op_thread_affinities")
+    assert affinities == "3;5"
+
+
+def test_onnx_session_should_not_leave_partial_optimized_model(
+    tmp_path: Path,
+) -> None:
+    # Given
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"not a model")
+    optimized_path = tmp_path / "optimized" / "model.onnx"
+    config = ONNXSessionConfig(optimized_model_path=optimized_path)
+    # When
+    with pytest.raises(Exception), onnx_session(model_path, config):  # noqa: B017, PT011
+        pass
+    # Then
+    assert not list(optimized_path.parent.iterdir())
+
+
 TESTED_DOCS = sorted(
     f for f in DOCS_PATH.iterdir() if f.is_file() and f.suffix in {".jpg", ".png"}
 )
@@ -1,4 +1,7 @@
+import asyncio
+from collections.abc import AsyncGenerator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from datashare_python.conftest import TEST_PROJECT
@@ -9,6 +12,7 @@ from passport_service.constants import GOTENBERG_SUPPORTED_EXTS
 from passport_service.core.preprocessing import (
     PIL_SUPPORTED_EXTENSIONS,
 )
+from passport_worker import search
 from passport_worker.config import PassportWorkerConfig
 from passport_worker.objects import DocId, DocumentSearchQuery, ProcessedFile
 from passport_worker.search import (
@@ -102,6 +106,36 @@ async def test_create_preprocessing_batches(  # noqa: PLR0917
     assert batches.model_dump() == expected_batches.model_dump()
 
 
+async def test_create_preprocessing_batches_should_search_concurrently(
+    test_worker_config: PassportWorkerConfig, tmpdir: Path
+) -> None:
+    # Given
+    n_searches = 3
+    started = asyncio.Barrier(n_searches)
+    docs = iter([PROCESSED_DOC_1, PROCESSED_DOC_2, PROCESSED_DOC_5])
+
+    async def _search_docs(*args, **kwargs) -> AsyncGenerator[ProcessedFile, None]:  # noqa: ARG001
+        # Searches would wait forever if they were run sequentially
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+        yield next(docs)
+
+    # When
+    with patch.object(search, "_search_docs", _search_docs):
+        batches = await create_preprocessing_batches_act(
+            None,
+            TEST_PROJECT,
+            None,
+            test_worker_config.paths,
+            target_n_pages_per_batch=1,
+            output_root=Path(tmpdir),
+        )
+    # Then
+    paths = batches.pdfs + batches.images + batches.to_pdf
+    assert len(paths) == n_searches
+    assert len(set(paths)) == n_searches
+    assert all(p.name.endswith("_batch_0.jsonl") for p in paths)
+
+
 def test_restrict_image_formats() -> None:
     # When
     restricted = restrict_image_formats(PIL_SUPPORTED_EXTENSIONS)
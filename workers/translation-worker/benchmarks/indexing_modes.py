@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import time
+import uuid
+
+from datashare_python.indexing import BulkIndexer, RefreshPolicy
+from datashare_python.objects import DatashareLanguage, Document, Translation
+from elasticsearch._async.helpers import async_bulk
+from icij_common.es import (
+    DOC_CONTENT,
+    DOC_CONTENT_TRANSLATED,
+    DOC_LANGUAGE,
+    DOC_ROOT_ID,
+    ID_,
+    QUERY,
+    ESClient,
+    has_id,
+)
+from translation_worker.activities import _poll_from_es, _update_docs_translation
+from translation_worker.constants import TRANSLATION_DOC_SOURCES
+from translation_worker.objects import TranslationIndexingMode, TranslationModel
+
+_ENGLISH = DatashareLanguage("ENGLISH")
+_FRENCH = DatashareLanguage("FRENCH")
+_SPANISH = DatashareLanguage("SPANISH")
+
+
+def _translation(target: DatashareLanguage, content: str) -> Translation:
+    return Translation(
+        source_language=_ENGLISH,
+        target_language=target,
+        translator=TranslationModel.ARGOS,
+        content=content,
+    )
+
+
+async def _create_index(es_client: ESClient, index: str, n_docs: int) -> None:
+    existing = _translation(_SPANISH, "hola").model_dump(by_alias=True)
+    actions = (
+        {
+            "_op_type": "index",
+            "_index": index,
+            ID_: f"doc-{i}",
+            "_routing": f"doc-{i}",
+            "_source": {
+                DOC_CONTENT: "hello",
+                DOC_LANGUAGE: _ENGLISH,
+                DOC_ROOT_ID: f"doc-{i}",
+                DOC_CONTENT_TRANSLATED: [existing],
+            },
+        }
+        for i in range(n_docs)
+    )
+    await async_bulk(es_client, actions, raise_on_error=True, refresh=True)
+
+
+async def _bench(
+    es_client: ESClient,
+    index: str,
+    n_docs: int,
+    buffer_size: int,
+    mode: TranslationIndexingMode,
+) -> float:
+    doc_ids = [f"doc-{i}" for i in range(n_docs)]
+    translation = _translation(_FRENCH, "bonjour")
+    start = time.perf_counter()
+    indexer = BulkIndexer(es_client, refresh=RefreshPolicy.NONE)
+    for i in range(0, n_docs, buffer_size):
+        versions = None
+        source_includes = TRANSLATION_DOC_SOURCES
+        if mode is TranslationIndexingMode.PARTIAL_UPDATE:
+            versions = {}
+            source_includes = source_includes + [DOC_CONTENT_TRANSLATED]
+        es_docs = _poll_from_es(
+            es_client,
+            index,
+            body={QUERY: has_id(doc_ids[i : i + buffer_size])},
+            source_includes=source_includes,
+            seq_no_primary_term=versions is not None,
+        )
+        docs = []
+        async for es_doc in es_docs:
+            if versions is not None:
+                versions[es_doc[ID_]] = (es_doc["_seq_no"], es_doc["_primary_term"])
+            docs.append((Document.from_es(es_doc), translation))
+        await _update_docs_translation(indexer, docs, index, versions=versions)
+    return time.perf_counter() - start
+
+
+async def _run(args: argparse.Namespace) -> None:
+    async with ESClient(hosts=[args.es_url], pagination=args.buffer_size) as client:
+        for mode in TranslationIndexingMode:
+            index = f"bench-translation-indexing-{uuid.uuid4().hex}"
+            try:
+                await _create_index(client, index, args.docs)
+                elapsed = await _bench(client, index, args.docs, args.buffer_size, mode)
+            finally:
+                await client.indices.delete(index=index, ignore_unavailable=True)
+            print(f"{mode}: {args.docs / elapsed:.0f} docs/s")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="translation indexing throughput, requires a local ES"
+    )
+    parser.add_argument("--es-url", default="http://localhost:9200")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--buffer-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
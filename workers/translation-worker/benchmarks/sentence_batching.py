@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import AsyncGenerator, Iterable
+from typing import Self
+
+from datashare_python.objects import DatashareLanguage, Document
+from icij_common.registrable import RegistrableConfig
+from translation_worker.activities import _translate_sentences
+from translation_worker.config import ArgosTranslatorConfig
+from translation_worker.objects import TranslationModel
+from translation_worker.processors import Translator
+
+_FRENCH = DatashareLanguage("FRENCH")
+
+
+class _PaddedCostTranslator(Translator):
+    # Simulates a padded batch translation: the cost of a batch is proportional to
+    # the number of sentences times the length of the longest one
+    registered_name = TranslationModel.ARGOS
+
+    def __init__(self, char_cost_s: float):
+        super().__init__(ArgosTranslatorConfig())
+        self._char_cost_s = char_cost_s
+
+    def translate(self, texts: Iterable[str]) -> list[str]:
+        texts = list(texts)
+        time.sleep(len(texts) * max(len(t) for t in texts) * self._char_cost_s)
+        return texts
+
+    @classmethod
+    def _from_config(cls, config: RegistrableConfig, **extras) -> Self: ...  # noqa: ARG003
+
+
+def _synthetic_corpus(n_sentences: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    # Sentence lengths are long-tailed: lots of short boilerplate and a few very
+    # long sentences
+    lengths = (max(1, int(rng.lognormvariate(4.0, 1.0))) for _ in range(n_sentences))
+    return ["x" * min(length, 2000) for length in lengths]
+
+
+async def _doc_sents(
+    corpus: list[str], sents_per_doc: int
+) -> AsyncGenerator[tuple[Document, str], None]:
+    for i, sent in enumerate(corpus):
+        doc = Document(id=f"doc-{i // sents_per_doc}", language=_FRENCH)
+        yield doc, sent
+
+
+async def _bench(
+    corpus: list[str], translator: Translator, batch_size: int, window: int
+) -> float:
+    start = time.perf_counter()
+    translated = _translate_sentences(
+        _doc_sents(corpus, sents_per_doc=20),
+        translator,
+        batch_size=batch_size,
+        bucketing_window=window,
+    )
+    async for _ in translated:
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="sentence batching throughput")
+    parser.add_argument("--sentences", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--windows", type=int, nargs="+", default=[0, 256, 1024])
+    parser.add_argument("--char-cost-s", type=float, default=1e-6)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    corpus = _synthetic_corpus(args.sentences, args.seed)
+    translator = _PaddedCostTranslator(args.char_cost_s)
+    for window in args.windows:
+        elapsed = asyncio.run(_bench(corpus, translator, args.batch_size, window))
+        rate = len(corpus) / elapsed
+        print(f"window={window}: {rate:.0f} sentences/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
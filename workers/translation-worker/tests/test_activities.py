@@ -2,10 +2,12 @@
 
 from collections.abc import AsyncGenerator, Iterable
 from functools import partial
+from pathlib import Path
 from typing import Any, Self, TypeVar
 from unittest.mock import patch
 
 import pytest
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import DatashareLanguage, Document, Language, Translation
 from icij_common.es import (
     DOC_CONTENT,
@@ -21,19 +23,28 @@ from icij_common.registrable import RegistrableConfig
 from translation_worker import activities
 from translation_worker.activities import (
     _get_es_docs_by_language,
+    _poll_batches_from_es,
     _split_sentences,
+    _split_sentences_in_pool,
+    _translate_sentences,
     _update_docs_translation,
     create_translation_batches_act,
     translate_docs_act,
 )
+from translation_worker.cache import TranslationMemory
 from translation_worker.config import (
     ArgosTranslatorConfig,
+    DefaultSentenceSplitterConfig,
     TranslationModel,
     TranslationWorkerConfig,
 )
 from translation_worker.constants import DOC_CONTENT_TEXT_LENGTH
 from translation_worker.objects import untranslated_query
-from translation_worker.processors import SentenceSplitter, Translator
+from translation_worker.processors import (
+    SentenceSplitter,
+    SentenceSplitterPool,
+    Translator,
+)
 
 from tests.conftest import (
     DOC_ID_1,
@@ -190,6 +201,89 @@ async def test__iter_sentences__yields_sentences_with_correct_indices(
     assert doc_sents == expected_doc_sents
 
 
+async def test__split_sentences_in_pool__preserves_docs_order() -> None:
+    # Given
+    es_docs = [FR_DOC_1, FR_DOC_2, ES_DOC_1, ES_DOC_2]
+    config = DefaultSentenceSplitterConfig()
+    # When
+    with SentenceSplitterPool(config, DS_FRENCH, n_processes=2) as pool:
+        doc_sents = _split_sentences_in_pool(_aiter(es_docs), pool, chunk_size=1)
+        doc_sents = await _collect_async(doc_sents)
+    # Then
+    docs = [Document.from_es(d) for d in es_docs]
+    expected = [(doc, doc.content) for doc in docs]
+    assert doc_sents == expected
+
+
+class RecordingTranslator(Translator):
+    registered_name = TranslationModel.ARGOS
+
+    def __init__(self):
+        super().__init__(ArgosTranslatorConfig())
+        self.batches = []
+
+    def translate(self, texts: Iterable[str]) -> list[str]:
+        texts = list(texts)
+        self.batches.append(texts)
+        return [t.upper() for t in texts]
+
+    @classmethod
+    def _from_config(cls, config: RegistrableConfig, **extras) -> Self: ...
+
+
+async def test__translate_sentences__batches_by_length_and_preserves_order() -> None:
+    # Given
+    doc_1 = Document.from_es(FR_DOC_1)
+    doc_2 = Document.from_es(FR_DOC_2)
+    doc_sents = [
+        (doc_1, "a"),
+        (doc_1, "ccc"),
+        (doc_1, "bb"),
+        (doc_2, "dddd"),
+        (doc_2, "e"),
+        (doc_2, "ff"),
+    ]
+    translator = RecordingTranslator()
+    # When
+    translated = _translate_sentences(
+        _aiter(doc_sents), translator, batch_size=2, bucketing_window=6
+    )
+    translated = await _collect_async(translated)
+    # Then
+    assert translator.batches == [["a", "e"], ["bb", "ff"], ["ccc", "dddd"]]
+    expected = [(doc, sent.upper()) for doc, sent in doc_sents]
+    assert translated == expected
+
+
+async def test__translate_sentences__should_translate_repeated_sentences_once(
+    tmp_path: Path,
+) -> None:
+    # Given
+    doc_1 = Document.from_es(FR_DOC_1)
+    doc_2 = Document.from_es(FR_DOC_2)
+    doc_sents = [(doc_1, "a"), (doc_1, "bb"), (doc_2, "a"), (doc_2, "ccc")]
+    translator = RecordingTranslator()
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    with TranslationMemory(db_path, config, source=FRENCH, target=ENGLISH) as memory:
+        memory.put_many({"ccc": "cached"})
+        # When
+        translated = _translate_sentences(
+            _aiter(doc_sents),
+            translator,
+            batch_size=2,
+            bucketing_window=4,
+            translation_memory=memory,
+        )
+        translated = await _collect_async(translated)
+        cached = memory.get_many(["a", "bb"])
+    # Then
+    assert translator.batches == [["a", "bb"]]
+    expected = [(doc_1, "A"), (doc_1, "BB"), (doc_2, "A"), (doc_2, "cached")]
+    assert translated == expected
+    assert cached == {"a": "A", "bb": "BB"}
+
+
 # create_translation_batches
 def _make_batching_doc(
     doc_id: str, language: DatashareLanguage, content_text_length: int = 0
@@ -303,6 +397,44 @@ async def test__create_translation_batches__splits_batch_if_max_text_len_exceede
     assert batches[1] == [doc_id_3]
 
 
+async def test__create_translation_batches__with_sliced_search() -> None:
+    # Given
+    query = untranslated_query(DS_ENGLISH)
+    docs = [
+        _make_batching_doc(DOC_ID_1, DS_FRENCH),
+        _make_batching_doc(DOC_ID_2, DS_SPANISH),
+        _make_batching_doc("doc_id_3", DS_FRENCH),
+    ]
+    client = MockESClient(docs)
+    buckets = [{"key": DS_FRENCH}, {"key": DS_SPANISH}]
+
+    async def _search(**kwargs) -> dict:
+        return {"aggregations": {"languages": {"buckets": buckets}}}
+
+    async def _sliced_search_pages(es_client, *, body: dict, n_slices: int, **kwargs):
+        assert n_slices == 3
+        language = body["query"]["bool"]["must"][-1]["term"][DOC_LANGUAGE]
+        hits = [d for d in docs if d[SOURCE][DOC_LANGUAGE] == language]
+        yield {HITS: {HITS: hits}}
+
+    # When
+    with (
+        patch.object(client, "search", side_effect=_search),
+        patch.object(activities, "sliced_search_pages", _sliced_search_pages),
+    ):
+        result = [
+            b
+            async for b in create_translation_batches_act(
+                project=TEST_PROJECT, query=query, es_client=client, search_slices=3
+            )
+        ]
+    # Then
+    assert result == [
+        (DS_FRENCH, [[DOC_ID_1, "doc_id_3"]]),
+        (DS_SPANISH, [[DOC_ID_2]]),
+    ]
+
+
 # translate_docs_act
 
 
@@ -331,18 +463,20 @@ async def test_translate_docs_act__returns_zero_for_empty_batch(
 
 
 async def _do_nothing_es_update(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     translated_docs: Iterable[tuple[Document, Translation]],
     project: str,
+    versions: dict | None = None,
 ):
     pass
 
 
 async def _capturing_es_update(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     translated_docs: Iterable[tuple[Document, Translation]],
     project: str,
     captured: list[tuple[Document, Translation]],
+    versions: dict | None = None,
 ):
     captured.extend(translated_docs)
 
@@ -462,8 +596,10 @@ async def test__update_docs() -> None:
     translated_docs = [(doc_1, t_1), (doc_2, t_2)]
 
     # When
-    with patch("translation_worker.activities.async_bulk") as mocked:
-        await _update_docs_translation(MockESClient([]), translated_docs, TEST_PROJECT)
+    with patch("datashare_python.indexing.async_bulk") as mocked:
+        mocked.return_value = (2, [])
+        indexer = BulkIndexer(MockESClient([]))
+        await _update_docs_translation(indexer, translated_docs, TEST_PROJECT)
 
     # Then
     calls = mocked.mock_calls
@@ -495,6 +631,113 @@ async def test__update_docs() -> None:
     assert actions == expected_actions
 
 
+def _make_translation(target: str, content: str) -> Translation:
+    return Translation(
+        source_language=DS_ENGLISH,
+        target_language=DatashareLanguage(target),
+        translator=TranslationModel.ARGOS,
+        content=content,
+    )
+
+
+async def test__update_docs__with_partial_updates() -> None:
+    # Given
+    es_translation = _make_translation(SPANISH, "uno")
+    doc_1 = Document(
+        id="doc_1",
+        language=DS_ENGLISH,
+        root_document=ROOT_DOCUMENT_1,
+        content_translated=[es_translation],
+    )
+    t_1 = _make_translation(FRENCH, "un")
+    t_2 = _make_translation(FRENCH, "deux")
+    doc_2 = Document(
+        id="doc_2",
+        language=DS_ENGLISH,
+        root_document=ROOT_DOCUMENT_2,
+        content_translated=[t_2],
+    )
+    translated_docs = [(doc_1, t_1), (doc_2, t_2)]
+    versions = {"doc_1": (1, 2), "doc_2": (3, 4)}
+
+    # When
+    with patch("datashare_python.indexing.async_bulk") as mocked:
+        mocked.return_value = (1, [])
+        indexer = BulkIndexer(MockESClient([]))
+        await _update_docs_translation(
+            indexer, translated_docs, TEST_PROJECT, versions=versions
+        )
+
+    # Then
+    calls = mocked.mock_calls
+    assert len(calls) == 1
+    actions = list(calls[0].args[1])
+    # doc_2 already has the translation, it's left untouched
+    expected_actions = [
+        {
+            "_id": "doc_1",
+            "_index": "test-project",
+            "_op_type": "update",
+            "_routing": "root_document_1",
+            "if_seq_no": 1,
+            "if_primary_term": 2,
+            "doc": {
+                "content_translated": [
+                    es_translation.model_dump(by_alias=True),
+                    t_1.model_dump(by_alias=True),
+                ]
+            },
+        },
+    ]
+    assert actions == expected_actions
+    assert not versions
+
+
+async def test__update_docs__should_fallback_to_script_on_conflicts() -> None:
+    # Given
+    doc_1 = Document(id="doc_1", language=DS_ENGLISH, root_document=ROOT_DOCUMENT_1)
+    t_1 = _make_translation(FRENCH, "un")
+    doc_2 = Document(id="doc_2", language=DS_ENGLISH, root_document=ROOT_DOCUMENT_2)
+    t_2 = _make_translation(FRENCH, "deux")
+    translated_docs = [(doc_1, t_1), (doc_2, t_2)]
+    versions = {"doc_1": (1, 2), "doc_2": (3, 4)}
+    conflict = {"update": {"_id": "doc_2", "status": 409}}
+
+    # When
+    with patch("datashare_python.indexing.async_bulk") as mocked:
+        mocked.side_effect = [(1, [conflict]), (1, [])]
+        indexer = BulkIndexer(MockESClient([]))
+        await _update_docs_translation(
+            indexer, translated_docs, TEST_PROJECT, versions=versions
+        )
+
+    # Then
+    calls = mocked.mock_calls
+    assert len(calls) == 2
+    retried = list(calls[1].args[1])
+    assert [a["_id"] for a in retried] == ["doc_2"]
+    assert "script" in retried[0]
+
+
+async def test__poll_batches_from_es__should_record_versions() -> None:
+    # Given
+    doc = dict(FR_DOC_1)
+    doc["_seq_no"] = 1
+    doc["_primary_term"] = 2
+    es_client = MockESClient([doc])
+    versions = {}
+
+    # When
+    docs = _poll_batches_from_es(
+        es_client, TEST_PROJECT, [[DOC_ID_1]], versions=versions
+    )
+    docs = await _collect_async(docs)
+
+    # Then
+    assert docs == [doc]
+    assert versions == {DOC_ID_1: (1, 2)}
+
+
 # _get_es_docs
 
 
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+from translation_worker.cache import TranslationMemory
+from translation_worker.config import ArgosTranslatorConfig
+
+from tests.conftest import ENGLISH, FRENCH, SPANISH
+
+
+def test_translation_memory_get_many(tmp_path: Path) -> None:
+    # Given
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    with TranslationMemory(db_path, config, source=FRENCH, target=ENGLISH) as memory:
+        memory.put_many({"bonjour": "hello"})
+    # When
+    with TranslationMemory(db_path, config, source=FRENCH, target=ENGLISH) as memory:
+        found = memory.get_many(["bonjour", "au revoir"])
+    # Then
+    assert found == {"bonjour": "hello"}
+    assert memory.n_hits == 1
+    assert memory.n_misses == 1
+
+
+def test_translation_memory_should_be_keyed_by_config_and_languages(
+    tmp_path: Path,
+) -> None:
+    # Given
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    other_config = ArgosTranslatorConfig(beam_size=4)
+    with TranslationMemory(db_path, config, source=FRENCH, target=ENGLISH) as memory:
+        memory.put_many({"bonjour": "hello"})
+    # When
+    with TranslationMemory(
+        db_path, other_config, source=FRENCH, target=ENGLISH
+    ) as memory:
+        other_config_found = memory.get_many(["bonjour"])
+    with TranslationMemory(db_path, config, source=FRENCH, target=SPANISH) as memory:
+        other_target_found = memory.get_many(["bonjour"])
+    # Then
+    assert not other_config_found
+    assert not other_target_found
+
+
+def test_translation_memory_should_evict_least_recently_used(tmp_path: Path) -> None:
+    # Given
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    with TranslationMemory(
+        db_path, config, source=FRENCH, target=ENGLISH, max_rows=3
+    ) as memory:
+        memory.put_many({"bonjour": "hello"})
+        memory.put_many({"au revoir": "goodbye"})
+        memory.put_many({"salut": "hi"})
+        memory.get_many(["bonjour"])
+        # When
+        memory.put_many({"merci": "thanks"})
+        found = memory.get_many(["bonjour", "au revoir", "salut", "merci"])
+    # Then
+    assert found == {"bonjour": "hello", "merci": "thanks"}
+
+
+def test_translation_memory_should_only_count_rows_above_max_rows(
+    tmp_path: Path,
+) -> None:
+    # Given
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    statements = []
+    with TranslationMemory(
+        db_path, config, source=FRENCH, target=ENGLISH, max_rows=3
+    ) as memory:
+        memory._conn.set_trace_callback(statements.append)  # noqa: SLF001
+        # When
+        memory.put_many({"bonjour": "hello", "au revoir": "goodbye"})
+        memory.put_many({"bonjour": "hello", "salut": "hi"})
+    # Then
+    n_counts = sum("COUNT(*)" in s for s in statements)
+    assert n_counts == 1
+
+
+def test_translation_memory_get_many_should_support_large_batches(
+    tmp_path: Path,
+) -> None:
+    # Given
+    db_path = tmp_path / "memory.sqlite"
+    config = ArgosTranslatorConfig()
+    translations = {f"phrase {i}": f"sentence {i}" for i in range(2000)}
+    with TranslationMemory(db_path, config, source=FRENCH, target=ENGLISH) as memory:
+        memory.put_many(translations)
+        # When
+        found = memory.get_many([*translations, "missing"])
+    # Then
+    assert found == translations
+    assert memory.n_misses == 1
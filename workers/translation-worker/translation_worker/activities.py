@@ -1,22 +1,30 @@
 import asyncio
 import logging
-from collections.abc import AsyncGenerator, AsyncIterator, Iterable
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Iterable
+from contextlib import ExitStack
+from copy import deepcopy
 from enum import StrEnum
 from functools import partial
+from pathlib import Path
 from typing import Any, cast
 
 from aiostream.stream import chain
 from datashare_python.dependencies import lifespan_es_client, lifespan_worker_config
+from datashare_python.indexing import BulkIndexer
 from datashare_python.objects import DatashareLanguage, Document, Language, Translation
+from datashare_python.search import sliced_search_pages
 from datashare_python.types_ import AsyncProgressRateHandler
 from datashare_python.utils import (
     ActivityWithProgress,
+    BytesBoundedQueue,
     activity_defn,
     config_cache_key,
+    prefetch,
     publish_and_consume,
     to_raw_async_progress,
 )
-from elasticsearch._async.helpers import async_bulk
+from elasticsearch.helpers import BulkIndexError
 from icij_common.es import (
     DOC_CONTENT_TRANSLATED,
     DOC_LANGUAGE,
@@ -24,16 +32,18 @@ from icij_common.es import (
     HITS,
     ID_,
     QUERY,
+    SIZE,
     SOURCE,
     ESClient,
     and_query,
     has_id,
     has_type,
 )
-from icij_common.iter_utils import async_batches, before_and_after, once
+from icij_common.iter_utils import async_batches, batches, before_and_after, once
 
 from translation_worker.constants import DOC_CONTENT_TEXT_LENGTH
 
+from .cache import TranslationMemory
 from .config import (
     SentenceSplitterConfig,
     TranslationConfig,
@@ -42,12 +52,30 @@ from .config import (
 )
 from .constants import BATCHING_DOC_SOURCES, TRANSLATION_DOC_SOURCES
 from .dependencies import lifespan_sentence_splitter_cache, lifespan_translator_cache
-from .processors import SentenceSplitter, Translator
+from .objects import TranslationIndexingMode
+from .processors import SentenceSplitter, SentenceSplitterPool, Translator
 
 logger = logging.getLogger(__name__)
 
 DocId = str
 Batch = list[DocId]
+DocVersion = tuple[int, int]
+
+_CONFLICT_STATUS = 409
+_SEQ_NO = "_seq_no"
+_PRIMARY_TERM = "_primary_term"
+
+_TRANSLATION_MEMORY_PATH = Path("cache", "translation-memory.sqlite")
+
+_AGGS = "aggs"
+_AGGREGATIONS = "aggregations"
+_BUCKETS = "buckets"
+_FIELD = "field"
+_KEY = "key"
+_LANGUAGES = "languages"
+_MAX_LANGUAGES = 1000
+_TERM = "term"
+_TERMS = "terms"
 
 
 class Activity(StrEnum):
@@ -78,6 +106,7 @@ class TranslationActivities(ActivityWithProgress):
                 query,
                 batch_text_length=batch_text_length,
                 es_client=es_client,
+                search_slices=worker_config.elasticsearch.search_slices,
             )
         ]
         logger.info("translation batches created !")
@@ -116,21 +145,44 @@ class TranslationActivities(ActivityWithProgress):
             _load_splitter_from_config, config=config.sentence_splitter, language=source
         )
         splitter_key = config_cache_key(config.sentence_splitter)
+        splitting_config = worker_config.sentence_splitting
+        if splitting_config.n_processes:
+            splitter_factory = partial(
+                splitting_config.to_sentence_splitter_pool,
+                config.sentence_splitter,
+                source,
+            )
+            splitter_key = f"{splitter_key}-{source}-pool"
         splitter_cache = lifespan_sentence_splitter_cache()
         sentence_splitter = splitter_cache.get_or_cache_resource(
             splitter_key, splitter_factory
         )
-        logger.info("translating %s batches...", len(batches))
-        n_translated = await translate_docs_act(
-            batches,
-            project=project,
-            es_client=es_client,
-            progress=progress,
-            worker_config=worker_config,
-            translator=translator,
-            sentence_splitter=sentence_splitter,
-        )
+        memory_config = worker_config.cache.translation_memory
+        translation_memory = None
+        with ExitStack() as stack:
+            if memory_config.enabled:
+                db_path = worker_config.paths.workdir / _TRANSLATION_MEMORY_PATH
+                translation_memory = memory_config.to_translation_memory(
+                    db_path, config.translator, source=source, target=target
+                )
+                stack.enter_context(translation_memory)
+            logger.info("translating %s batches...", len(batches))
+            n_translated = await translate_docs_act(
+                batches,
+                project=project,
+                es_client=es_client,
+                progress=progress,
+                worker_config=worker_config,
+                translator=translator,
+                sentence_splitter=sentence_splitter,
+                translation_memory=translation_memory,
+            )
         logger.info("done translating !")
+        if translation_memory is not None:
+            n_hits = translation_memory.n_hits
+            n_lookups = n_hits + translation_memory.n_misses
+            msg = "found %s/%s sentences in translation memory"
+            logger.info(msg, n_hits, n_lookups)
         return n_translated
 
 
@@ -158,12 +210,22 @@ async def create_translation_batches_act(
     query: dict[str, Any],
     batch_text_length: int = 1000000,
     es_client: ESClient | None = None,
+    search_slices: int = 1,
 ) -> AsyncGenerator[tuple[DatashareLanguage, list[Batch]], None]:
     # Retrieve unprocessed docs.
     query = _with_doc_type(query)
-    es_docs = _get_es_docs_by_language(
-        es_client, project, query, source_includes=BATCHING_DOC_SOURCES
-    )
+    if search_slices > 1:
+        es_docs = _get_es_docs_by_language_sliced(
+            es_client,
+            project,
+            query,
+            source_includes=BATCHING_DOC_SOURCES,
+            n_slices=search_slices,
+        )
+    else:
+        es_docs = _get_es_docs_by_language(
+            es_client, project, query, source_includes=BATCHING_DOC_SOURCES
+        )
     async for language_docs in es_docs:
         language_batches: list[Batch] = []
         current_batch = []
@@ -197,13 +259,22 @@ async def translate_docs_act(
     *,
     project: str,
     translator: Translator,
-    sentence_splitter: SentenceSplitter,
+    sentence_splitter: SentenceSplitter | SentenceSplitterPool,
     worker_config: TranslationWorkerConfig,
     es_client: ESClient,
     progress: AsyncProgressRateHandler | None = None,  # noqa: F821
+    translation_memory: TranslationMemory | None = None,
 ) -> int:
-    # TODO: this should not happen
-    es_queue = asyncio.Queue()
+    # Bound the translated docs waiting to be written, to apply back-pressure on the
+    # translation when ES is slower than the translator
+    es_queue = BytesBoundedQueue(
+        worker_config.es_queue_max_bytes, size_fn=_translated_docs_size
+    )
+    # In partial update mode, the versions of the fetched docs are recorded by the
+    # publisher and consumed by the ES writer
+    versions = None
+    if worker_config.indexing_mode is TranslationIndexingMode.PARTIAL_UPDATE:
+        versions = {}
     publisher = _translate_and_queue(
         batches,
         es_queue,
@@ -213,29 +284,52 @@ async def translate_docs_act(
         worker_config,
         es_client,
         progress,
+        translation_memory,
+        versions,
     )
-    publisher = asyncio.create_task(publisher)
-    publisher_callback = lambda: es_queue.put_nowait(None)  # noqa: E731
-    consumer = asyncio.create_task(
-        _write_translations_to_es(es_client, queue=es_queue, project=project)
-    )
-    n_docs, _ = await publish_and_consume(
-        publisher, publisher_callback, consumer=consumer
+    async with worker_config.to_bulk_indexer(es_client) as indexer:
+        publisher = asyncio.create_task(publisher)
+        publisher_callback = lambda: es_queue.put(None)  # noqa: E731
+        consumers = [
+            asyncio.create_task(
+                _write_translations_to_es(
+                    indexer, queue=es_queue, project=project, versions=versions
+                )
+            )
+            for _ in range(es_client.max_concurrency)
+        ]
+        n_docs, _ = await publish_and_consume(
+            publisher, publisher_callback, consumers=consumers
+        )
+    logger.info(
+        "ES write queue max depth: %s buffers (%s bytes), translation blocked %s"
+        " times for %.1fs",
+        es_queue.max_depth,
+        es_queue.max_size_bytes_reached,
+        es_queue.n_blocked_puts,
+        es_queue.blocked_s,
     )
     return n_docs
 
 
+def _translated_docs_size(translated_docs: list[tuple[Document, Translation]]) -> int:
+    # Character counts are used as a cheap proxy for the memory size
+    return sum(len(d.content or "") + len(t.content) for d, t in translated_docs)
+
+
 # TODO: avoid all the args by passing a poller object that returns docs given batch of
 #  ids (rather than passing the client + project)
 async def _translate_and_queue(  # noqa: PLR0917
     batches: list[Batch],
-    queue: asyncio.Queue,
+    queue: BytesBoundedQueue,
     project: str,
     translator: Translator,
-    sentence_splitter: SentenceSplitter,
+    sentence_splitter: SentenceSplitter | SentenceSplitterPool,
     worker_config: TranslationWorkerConfig,
     es_client: ESClient,
     progress: AsyncProgressRateHandler | None = None,  # noqa: F821
+    translation_memory: TranslationMemory | None = None,
+    versions: dict[DocId, DocVersion] | None = None,
 ) -> int:
     n_docs = sum(len(b) for b in batches)
     if not n_docs:
@@ -245,6 +339,7 @@ async def _translate_and_queue(  # noqa: PLR0917
     source = translator.source
     target = translator.target
     model = translator.registered_name
+    batch_size = worker_config.batch_size
     translation_factory = partial(
         Translation, source_language=source, target_language=target, translator=model
     )
@@ -252,61 +347,131 @@ async def _translate_and_queue(  # noqa: PLR0917
     buffer = []
     current_doc = None
     current_doc_translation = []
+    # Fetch, split and translate run as a pipeline, docs are fetched and split
+    # while the translator is busy with the previous sentences
+    docs = _poll_batches_from_es(es_client, project, batches, versions=versions)
+    prefetch_depth = worker_config.prefetch_depth
+    if prefetch_depth:
+        docs = prefetch(docs, max_buffered=prefetch_depth)
+    if isinstance(sentence_splitter, SentenceSplitterPool):
+        chunk_size = worker_config.sentence_splitting.chunk_size
+        doc_sents = _split_sentences_in_pool(
+            docs, sentence_splitter, chunk_size=chunk_size
+        )
+    else:
+        doc_sents = _split_sentences(docs, sentence_splitter)
+    if prefetch_depth:
+        window_size = max(worker_config.sentence_bucketing_window, batch_size)
+        doc_sents = prefetch(doc_sents, max_buffered=window_size)
+    translated = _translate_sentences(
+        doc_sents,
+        translator,
+        batch_size=batch_size,
+        bucketing_window=worker_config.sentence_bucketing_window,
+        translation_memory=translation_memory,
+    )
+    async for doc, translated_sent in translated:
+        if current_doc is not None and doc.id != current_doc.id:
+            translation = translation_factory(content=current_doc_translation)
+            buffer.append((current_doc, translation))
+            if len(buffer) >= worker_config.es_buffer_size:
+                await queue.put(buffer)
+                buffer = []
+            seen += 1
+            if progress is not None:
+                await progress(seen)
+            current_doc_translation = []
+        current_doc = doc
+        current_doc_translation.append(translated_sent)
+    # Empty the buffer
+    if current_doc_translation:
+        translation = translation_factory(content=current_doc_translation)
+        buffer.append((current_doc, translation))
+        await queue.put(buffer)
+    return n_docs
+
+
+async def _poll_batches_from_es(
+    es_client: ESClient,
+    project: str,
+    batches: list[Batch],
+    *,
+    versions: dict[DocId, DocVersion] | None = None,
+) -> AsyncGenerator[dict, None]:
+    source_includes = TRANSLATION_DOC_SOURCES
+    if versions is not None:
+        # Existing translations are needed to merge the new ones in Python
+        source_includes = source_includes + [DOC_CONTENT_TRANSLATED]
     n_batches = len(batches)
     for batch_i, doc_ids in enumerate(batches):
-        logger.debug("translating batch %s / %s", batch_i, n_batches)
+        logger.debug("fetching batch %s / %s", batch_i, n_batches)
         docs = _poll_from_es(
             es_client,
             project,
             body={QUERY: has_id(doc_ids)},
-            source_includes=TRANSLATION_DOC_SOURCES,
+            source_includes=source_includes,
+            seq_no_primary_term=versions is not None,
         )
-        doc_sents = _split_sentences(docs, sentence_splitter)
-        # TODO: ideally we should aim at having almost constant size batches,
-        #  by using some sort of binarization / binning. That will also improve add
-        #  context to translate short sentences. A split strategy
-        #  like adding min and max batch_item length should help
-        doc_sent_batches = async_batches(doc_sents, batch_size=worker_config.batch_size)
-        async for batch in doc_sent_batches:
-            batch_docs, sents = zip(*batch, strict=False)
+        async for doc in docs:
+            if versions is not None:
+                versions[doc[ID_]] = (doc[_SEQ_NO], doc[_PRIMARY_TERM])
+            yield doc
+
+
+async def _translate_sentences(
+    doc_sents: AsyncIterable[tuple[Document, str]],
+    translator: Translator,
+    *,
+    batch_size: int,
+    bucketing_window: int,
+    translation_memory: TranslationMemory | None = None,
+) -> AsyncGenerator[tuple[Document, str], None]:
+    # Padding makes the cost of a batch proportional to its longest sentence. We
+    # buffer a window of sentences and group them by length so that batches have
+    # almost constant size sentences, then yield translations in the original order
+    window_size = max(bucketing_window, batch_size)
+    async for window in async_batches(doc_sents, batch_size=window_size):
+        window = list(window)  # noqa: PLW2901
+        # Boilerplate sentences are frequent, translate each of them only once
+        unique_sents = list(dict.fromkeys(sent for _, sent in window))
+        translations = {}
+        if translation_memory is not None:
+            translations = await asyncio.to_thread(
+                translation_memory.get_many, unique_sents
+            )
+        to_translate = sorted(
+            (s for s in unique_sents if s not in translations), key=len
+        )
+        for batch in batches(to_translate, batch_size=batch_size):
+            sents = list(batch)
             # Run translation 1 batch at the time, parallelization is controlled
             # via the batch_size
             translated_sents = await asyncio.to_thread(translator.translate, sents)
-            for doc, translated_sent in zip(batch_docs, translated_sents, strict=True):
-                if current_doc is not None and doc.id != current_doc.id:
-                    translation = translation_factory(content=current_doc_translation)
-                    buffer.append((current_doc, translation))
-                    if len(buffer) >= worker_config.es_buffer_size:
-                        queue.put_nowait(buffer)
-                        buffer = []
-                    seen += 1
-                    if progress is not None:
-                        await progress(seen)
-                    current_doc_translation = []
-                current_doc = doc
-                current_doc_translation.append(translated_sent)
-        logger.debug("batch %s / %s translated !", batch_i, n_batches)
-    # Empty the buffer
-    if current_doc_translation:
-        translation = translation_factory(content=current_doc_translation)
-        buffer.append((current_doc, translation))
-        queue.put_nowait(buffer)
-    return n_docs
+            translated = dict(zip(sents, translated_sents, strict=True))
+            if translation_memory is not None:
+                await asyncio.to_thread(translation_memory.put_many, translated)
+            translations.update(translated)
+        for doc, sent in window:
+            yield doc, translations[sent]
 
 
 async def _write_translations_to_es(
-    es_client: ESClient, queue: asyncio.Queue, project: str
+    indexer: BulkIndexer,
+    queue: BytesBoundedQueue,
+    project: str,
+    *,
+    versions: dict[DocId, DocVersion] | None = None,
 ) -> None:
     while True:
         translated_docs = await queue.get()
         if translated_docs is None:
             logger.debug("popped poison pill from the queue, exiting !")
-            queue.task_done()
             return
         logger.debug("writing translations to the index..")
-        await _update_docs_translation(es_client, translated_docs, project=project)
+        await _update_docs_translation(
+            indexer, translated_docs, project=project, versions=versions
+        )
         logger.debug("translation written !")
-        queue.task_done()
 
 
 async def _split_sentences(
@@ -321,6 +486,42 @@ async def _split_sentences(
             yield es_doc, sentence
 
 
+async def _split_sentences_in_pool(
+    doc_iter: AsyncIterable[dict],
+    pool: SentenceSplitterPool,
+    *,
+    chunk_size: int,
+) -> AsyncGenerator[tuple[Document, str], None]:
+    # Keep all processes busy by submitting chunks of docs ahead, while yielding
+    # sentences in the docs order
+    in_flight = deque()
+    try:
+        async for chunk in async_batches(doc_iter, batch_size=chunk_size):
+            docs = [Document.from_es(d) for d in chunk]
+            split = pool.split_sentences_batch([d.content for d in docs])
+            in_flight.append((docs, split))
+            if len(in_flight) <= pool.n_processes:
+                continue
+            docs, split = in_flight.popleft()
+            for doc_sent in _zip_doc_sentences(docs, await split):
+                yield doc_sent
+        while in_flight:
+            docs, split = in_flight.popleft()
+            for doc_sent in _zip_doc_sentences(docs, await split):
+                yield doc_sent
+    finally:
+        for _, split in in_flight:
+            split.cancel()
+
+
+def _zip_doc_sentences(
+    docs: list[Document], sentences: list[list[str]]
+) -> Iterable[tuple[Document, str]]:
+    for doc, doc_sentences in zip(docs, sentences, strict=True):
+        for sentence in doc_sentences:
+            yield doc, sentence
+
+
 async def _get_es_docs_by_language(
     es_client: ESClient,
     project: str,
@@ -349,6 +550,34 @@ async def _get_es_docs_by_language(
         yield aiter(grouped_docs)
 
 
+async def _get_es_docs_by_language_sliced(
+    es_client: ESClient,
+    project: str,
+    query: dict[str, Any],
+    source_includes: list[str],
+    n_slices: int,
+) -> AsyncGenerator[AsyncIterator[dict], None]:
+    # Instead of sorting all docs by language, list languages and search the docs of
+    # each language with concurrent slices
+    agg_body = deepcopy(query)
+    agg_body[_AGGS] = {
+        _LANGUAGES: {_TERMS: {_FIELD: DOC_LANGUAGE, SIZE: _MAX_LANGUAGES}}
+    }
+    res = await es_client.search(index=project, body=agg_body, size=0)
+    for bucket in res[_AGGREGATIONS][_LANGUAGES][_BUCKETS]:
+        language_query = and_query(
+            deepcopy(query), {_TERM: {DOC_LANGUAGE: bucket[_KEY]}}
+        )
+        pages = sliced_search_pages(
+            es_client,
+            index=project,
+            body=language_query,
+            n_slices=n_slices,
+            _source_includes=source_includes,
+        )
+        yield aiter(hit async for page in pages for hit in page[HITS][HITS])
+
+
 _SCRIPT_SOURCES = f"""
 if (ctx._source.{DOC_CONTENT_TRANSLATED} == null) {{
     ctx._source.{DOC_CONTENT_TRANSLATED} = [params.translation];
@@ -371,25 +600,91 @@ if (ctx._source.{DOC_CONTENT_TRANSLATED} == null) {{
 
 
 async def _update_docs_translation(
-    es_client: ESClient,
+    indexer: BulkIndexer,
     translated_docs: Iterable[tuple[Document, Translation]],
     project: str,
+    *,
+    versions: dict[DocId, DocVersion] | None = None,
 ) -> None:
-    actions = (
-        {
-            "_op_type": "update",
-            "_index": project,
-            "_routing": doc.root_document,
-            ID_: doc.id,
-            "script": {
-                "source": _SCRIPT_SOURCES,
-                "lang": "painless",
-                "params": {"translation": translation.model_dump(by_alias=True)},
-            },
-        }
-        for doc, translation in translated_docs
-    )
-    await async_bulk(es_client, actions, raise_on_error=True, refresh="wait_for")
+    if versions is None:
+        actions = (
+            _script_update_action(doc, translation, project)
+            for doc, translation in translated_docs
+        )
+        await indexer.bulk(actions)
+        return
+    # Merging in Python is a read-modify-write, updates are conditioned on the docs
+    # version and docs updated concurrently fall back to the script update
+    translated_docs = {doc.id: (doc, t) for doc, t in translated_docs}
+    actions = []
+    for doc, translation in translated_docs.values():
+        version = versions.pop(doc.id)
+        merged = _merge_translation(doc.content_translated, translation)
+        if merged is None:
+            continue
+        actions.append(_partial_update_action(doc, merged, project, version))
+    _, errors = await indexer.bulk(actions, raise_on_error=False)
+    conflicts = []
+    for error in errors:
+        error = next(iter(error.values()))  # noqa: PLW2901
+        if error["status"] != _CONFLICT_STATUS:
+            msg = f"{len(errors)} document(s) failed to index."
+            raise BulkIndexError(msg, errors)
+        conflicts.append(translated_docs[error[ID_]])
+    if conflicts:
+        msg = "%s docs were updated concurrently, updating them with a script"
+        logger.debug(msg, len(conflicts))
+        await _update_docs_translation(indexer, conflicts, project)
+
+
+def _script_update_action(
+    doc: Document, translation: Translation, project: str
+) -> dict[str, Any]:
+    return {
+        "_op_type": "update",
+        "_index": project,
+        "_routing": doc.root_document,
+        ID_: doc.id,
+        "script": {
+            "source": _SCRIPT_SOURCES,
+            "lang": "painless",
+            "params": {"translation": translation.model_dump(by_alias=True)},
+        },
+    }
+
+
+def _partial_update_action(
+    doc: Document, translations: list[Translation], project: str, version: DocVersion
+) -> dict[str, Any]:
+    seq_no, primary_term = version
+    content_translated = [t.model_dump(by_alias=True) for t in translations]
+    return {
+        "_op_type": "update",
+        "_index": project,
+        "_routing": doc.root_document,
+        ID_: doc.id,
+        "if_seq_no": seq_no,
+        "if_primary_term": primary_term,
+        "doc": {DOC_CONTENT_TRANSLATED: content_translated},
+    }
+
+
+def _merge_translation(
+    existing: list[Translation] | None, translation: Translation
+) -> list[Translation] | None:
+    # Same as _SCRIPT_SOURCES, returns None when the doc is left untouched
+    merged = list(existing or [])
+    for i, t in enumerate(merged):
+        if (
+            t.source_language == translation.source_language
+            and t.target_language == translation.target_language
+        ):
+            if t.content == translation.content:
+                return None
+            merged[i] = translation
+            return merged
+    merged.append(translation)
+    return merged
 
 
 async def _poll_from_es(
@@ -399,9 +694,14 @@ async def _poll_from_es(
     body: dict,
     source_includes: list[str] = None,
     sort: list[str] = None,
+    seq_no_primary_term: bool | None = None,
 ) -> AsyncGenerator[dict, None]:
     async for res in es_client.poll_search_pages(
-        index=project, body=body, _source_includes=source_includes, sort=sort
+        index=project,
+        body=body,
+        _source_includes=source_includes,
+        sort=sort,
+        seq_no_primary_term=seq_no_primary_term,
     ):
         for hit in res[HITS][HITS]:
             yield hit
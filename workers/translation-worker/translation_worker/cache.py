@@ -0,0 +1,146 @@
+import logging
+import sqlite3
+import threading
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Self
+
+from datashare_python.objects import Language
+from datashare_python.utils import persistent_config_cache_key
+from icij_common.iter_utils import batches
+
+from .config import TranslatorConfig
+
+logger = logging.getLogger(__name__)
+
+_DB_TIMEOUT_S = 30.0
+# Stay well below SQLite's max number of query variables
+_MAX_QUERY_VARIABLES = 500
+# Rows are evicted down to this fraction of the max number of rows, so that the
+# table isn't counted again on each insert once it's full
+_EVICTION_LOW_WATERMARK = 0.9
+
+
+class TranslationMemory:
+    def __init__(
+        self,
+        db_path: Path,
+        config: TranslatorConfig,
+        *,
+        source: Language,
+        target: Language,
+        max_rows: int = 1_000_000,
+    ) -> None:
+        self._db_path = db_path
+        self._max_rows = max_rows
+        key = f"{persistent_config_cache_key(config)}/{source}/{target}"
+        self._config_key = sha256(key.encode()).hexdigest()
+        self._conn: sqlite3.Connection | None = None
+        self._n_rows = 0
+        self._lock = threading.Lock()
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def __enter__(self) -> Self:
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # The memory is accessed from the activity's worker threads, access is
+        # serialized with the lock
+        self._conn = sqlite3.connect(
+            self._db_path, timeout=_DB_TIMEOUT_S, check_same_thread=False
+        )
+        # WAL lets several worker processes read while another one is writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "config_key TEXT NOT NULL, "
+            "sentence TEXT NOT NULL, "
+            "translation TEXT NOT NULL, "
+            "last_access REAL NOT NULL, "
+            "PRIMARY KEY (config_key, sentence))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_access "
+            "ON translations (last_access)"
+        )
+        self._conn.commit()
+        self._n_rows = self._count_rows()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_many(self, sentences: list[str]) -> dict[str, str]:
+        found = {}
+        with self._lock:
+            for batch in batches(sentences, _MAX_QUERY_VARIABLES):
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._connection.execute(
+                    "SELECT sentence, translation FROM translations "
+                    f"WHERE config_key = ? AND sentence IN ({placeholders})",  # noqa: S608
+                    (self._config_key, *batch),
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._touch(list(found))
+                self._connection.commit()
+        self.n_hits += len(found)
+        self.n_misses += len(sentences) - len(found)
+        return found
+
+    def put_many(self, translations: dict[str, str]) -> None:
+        now = time.time()
+        rows = ((self._config_key, s, t, now) for s, t in translations.items())
+        with self._lock:
+            cursor = self._connection.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(config_key, sentence, translation, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            # Replaced rows are counted too, the count is hence an upper bound
+            self._n_rows += cursor.rowcount
+            if self._n_rows > self._max_rows:
+                self._evict()
+            self._connection.commit()
+
+    def _touch(self, sentences: list[str]) -> None:
+        # Keep track of the last access for LRU eviction
+        now = time.time()
+        for batch in batches(sentences, _MAX_QUERY_VARIABLES):
+            placeholders = ", ".join("?" * len(batch))
+            self._connection.execute(
+                "UPDATE translations SET last_access = ? "
+                f"WHERE config_key = ? AND sentence IN ({placeholders})",  # noqa: S608
+                (now, self._config_key, *batch),
+            )
+
+    def _evict(self) -> None:
+        # The in-memory count misses rows inserted by other workers and overcounts
+        # replaced ones, the table is counted before evicting. The bound is shared
+        # by all configs and languages stored in the DB
+        self._n_rows = self._count_rows()
+        if self._n_rows <= self._max_rows:
+            return
+        n_evicted = self._n_rows - int(self._max_rows * _EVICTION_LOW_WATERMARK)
+        logger.debug("evicting %s translations from memory", n_evicted)
+        cursor = self._connection.execute(
+            "DELETE FROM translations WHERE rowid IN ("
+            "SELECT rowid FROM translations ORDER BY last_access LIMIT ?)",
+            (n_evicted,),
+        )
+        self._n_rows -= cursor.rowcount
+
+    def _count_rows(self) -> int:
+        (n_rows,) = self._connection.execute(
+            "SELECT COUNT(*) FROM translations"
+        ).fetchone()
+        return n_rows
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise ValueError("translation memory must be used as a context manager")
+        return self._conn
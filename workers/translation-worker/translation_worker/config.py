@@ -1,7 +1,8 @@
+from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
 from datashare_python.config import ResourceCacheConfig, WorkerConfig
-from datashare_python.objects import BaseModel, DatashareModel, WorkerPaths
+from datashare_python.objects import BaseModel, DatashareModel, Language, WorkerPaths
 from icij_common.pydantic_utils import make_enum_discriminator, tagged_union
 from icij_common.registrable import RegistrableConfig
 from pydantic import Discriminator, Field
@@ -10,11 +11,17 @@ from .objects import (
     ArgosSentencizer,
     SentenceSplitterModel,
     TorchDevice,
+    TranslationIndexingMode,
     TranslationModel,
 )
 
 if TYPE_CHECKING:
-    from translation_worker.processors import SentenceSplitter, Translator
+    from translation_worker.cache import TranslationMemory
+    from translation_worker.processors import (
+        SentenceSplitter,
+        SentenceSplitterPool,
+        Translator,
+    )
 
 DEFAULT_HUNYUAN_MODEL_REF = "tencent/Hunyuan-MT-Chimera-7B"
 
@@ -22,6 +29,26 @@ DEFAULT_HUNYUAN_MODEL_REF = "tencent/Hunyuan-MT-Chimera-7B"
 class _BaseProcessorConfig(DatashareModel, RegistrableConfig): ...
 
 
+class TranslationMemoryConfig(BaseModel):
+    enabled: bool = True
+    # Least recently used translations are evicted past this number of sentences
+    max_rows: int = 1_000_000
+
+    def to_translation_memory(
+        self,
+        db_path: Path,
+        config: "TranslatorConfig",
+        *,
+        source: Language,
+        target: Language,
+    ) -> "TranslationMemory":
+        from .cache import TranslationMemory  # noqa: PLC0415
+
+        return TranslationMemory(
+            db_path, config, source=source, target=target, max_rows=self.max_rows
+        )
+
+
 class TranslationCache(BaseModel):
     sentence_splitter: ResourceCacheConfig = ResourceCacheConfig(
         size=1, exit_context_managers=True
@@ -29,6 +56,23 @@ class TranslationCache(BaseModel):
     translator: ResourceCacheConfig = ResourceCacheConfig(
         size=1, exit_context_managers=True
     )
+    translation_memory: TranslationMemoryConfig = Field(
+        default_factory=TranslationMemoryConfig
+    )
+
+
+class SentenceSplittingWorkerConfig(DatashareModel):
+    # When > 0, sentences are split by batches of docs in a pool of processes, when
+    # 0 they are split doc by doc in a thread
+    n_processes: int = 0
+    chunk_size: int = 8
+
+    def to_sentence_splitter_pool(
+        self, config: "SentenceSplitterConfig", language: Language
+    ) -> "SentenceSplitterPool":
+        from .processors import SentenceSplitterPool  # noqa: PLC0415
+
+        return SentenceSplitterPool(config, language, n_processes=self.n_processes)
 
 
 class C2TranslateConfig(DatashareModel):
@@ -42,12 +86,24 @@ class TranslationWorkerConfig(WorkerConfig):
     device: TorchDevice = Field(default=TorchDevice.CPU, frozen=True)
 
     batch_size: int = 16
+    # Number of sentences buffered to group them into batches of similar length
+    sentence_bucketing_window: int = 256
+    # Number of documents fetched and split ahead of translation, 0 disables the
+    # pipelining
+    prefetch_depth: int = 32
     batch_text_length: int = 10000
     batches_per_worker: int = 10
     es_buffer_size: int = 10
+    # Max size of the translated docs waiting to be written to ES
+    es_queue_max_bytes: int = 64 * 1024**2
+    indexing_mode: TranslationIndexingMode = TranslationIndexingMode.SCRIPT
 
     cache: TranslationCache = Field(default_factory=TranslationCache)
 
+    sentence_splitting: SentenceSplittingWorkerConfig = Field(
+        default_factory=SentenceSplittingWorkerConfig
+    )
+
     c2_translate: C2TranslateConfig = Field(default_factory=C2TranslateConfig)
 
     paths: WorkerPaths
@@ -37,6 +37,14 @@ class TranslationModel(StrEnum):
     HUNYUAN = "HUNYUAN"
 
 
+class TranslationIndexingMode(StrEnum):
+    # Merge translations on the cluster using a painless script
+    SCRIPT = "script"
+    # Merge translations in Python and send partial doc updates, guarded by the
+    # docs sequence numbers
+    PARTIAL_UPDATE = "partial_update"
+
+
 class ArgosSentencizer(StrEnum):
     SPACY_SMALL = "spacy_small"
     MINI_SBD = "mini_sbd"
@@ -1,7 +1,10 @@
+import asyncio
 import logging
+import multiprocessing
 import sys
 from abc import abstractmethod
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Self, final
 
@@ -10,11 +13,13 @@ from icij_common.registrable import RegistrableFromConfig
 from .config import TranslationWorkerConfig
 
 if TYPE_CHECKING:
-    from .config import BaseTranslatorConfig
+    from .config import BaseTranslatorConfig, SentenceSplitterConfig
     from .objects import Language
 
 logger = logging.getLogger(__name__)
 
+_START_METHOD = "forkserver"
+
 
 class SentenceSplitter(RegistrableFromConfig):
     @abstractmethod
@@ -42,6 +47,59 @@ class SentenceSplitter(RegistrableFromConfig):
     def __exit__(self, exc_type, exc_val, exc_tb): ...  # noqa: ANN001
 
 
+# Splitter loaded once in each of the pool's processes
+_PROCESS_SENTENCE_SPLITTER: SentenceSplitter | None = None
+
+
+def _load_process_sentence_splitter(
+    config: "SentenceSplitterConfig", language: "Language"
+) -> None:
+    global _PROCESS_SENTENCE_SPLITTER  # noqa: PLW0603
+    splitter = SentenceSplitter.from_config(config)
+    splitter.load(language)
+    _PROCESS_SENTENCE_SPLITTER = splitter
+
+
+def _split_sentences_batch_in_process(batch: list[str]) -> list[list[str]]:
+    return _PROCESS_SENTENCE_SPLITTER.split_sentences_batch(batch)
+
+
+class SentenceSplitterPool:
+    # Sentence splitting is pure Python CPU work holding the GIL, splitting in
+    # threads doesn't parallelize, this pool splits batches of texts in processes
+    def __init__(
+        self,
+        config: "SentenceSplitterConfig",
+        language: "Language",
+        *,
+        n_processes: int,
+    ):
+        self._n_processes = n_processes
+        # Forking the multithreaded worker process can deadlock children on locks
+        # held by other threads, processes are started from a fork server instead.
+        # The splitter model is loaded by each process in the initializer
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_processes,
+            mp_context=multiprocessing.get_context(_START_METHOD),
+            initializer=_load_process_sentence_splitter,
+            initargs=(config, language),
+        )
+
+    @property
+    def n_processes(self) -> int:
+        return self._n_processes
+
+    def split_sentences_batch(self, batch: list[str]) -> asyncio.Future:
+        future = self._executor.submit(_split_sentences_batch_in_process, batch)
+        return asyncio.wrap_future(future)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        self._executor.shutdown(cancel_futures=True)
+
+
 class Translator(RegistrableFromConfig):
     def __init__(self, config: "BaseTranslatorConfig"):
         self._config = config